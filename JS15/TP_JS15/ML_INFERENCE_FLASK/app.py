@@ -1,45 +1,162 @@
-
-
-from flask import Flask, render_template, request
-import os
-import traceback
-from ml_logic.model_loader import ModelLoader
-from ml_logic.predictor import Predictor
-
-app = Flask(__name__)
-
-MODEL_DIR = os.path.join(os.path.dirname(__file__), 'models_ews')
-model_loader = ModelLoader(MODEL_DIR)
-predictor = None
-try:
-    model_loader.load_models()
-    predictor = Predictor(model_loader)
-except Exception as e:
-    print(f"❌ Error loading models: {e}")
-    traceback.print_exc()
-
-@app.route('/', methods=['GET'])
-def home():
-    return render_template('home.html')
-
-@app.route('/predict', methods=['POST'])
-def predict():
-    if predictor is None:
-        return render_template('result.html', error='Model belum siap. Hubungi admin.')
-    try:
-        tanggal = request.form['tanggal']
-        nominal = int(request.form['nominal'])
-        target_type = request.form['target_type']
-        rt_number = request.form.get('rt_number') or None
-        result = predictor.predict(tanggal, nominal, target_type, rt_number)
-        # Tambahkan input ke result agar bisa ditampilkan di template
-        result['tanggal'] = tanggal
-        result['nominal'] = nominal
-        result['target_type'] = target_type
-        result['rt_number'] = rt_number
-        return render_template('result.html', result=result)
-    except Exception as e:
-        return render_template('result.html', error=f'Error: {e}')
-
-if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=7860)
+
+
+from flask import Flask, render_template, request, send_file, abort, redirect, url_for
+import os
+import time
+import uuid
+import tempfile
+import traceback
+import pandas as pd
+from ml_logic.model_loader import ModelLoader
+from ml_logic.predictor import Predictor, RISK_CATEGORIES
+
+app = Flask(__name__)
+app.config['MAX_CONTENT_LENGTH'] = int(os.environ.get('MAX_UPLOAD_MB', 10)) * 1024 * 1024
+
+MODEL_DIR = os.path.join(os.path.dirname(__file__), 'models_ews')
+# Hasil upload CSV disimpan di disk agar bisa dibuka dari worker mana pun
+BATCH_RESULT_DIR = os.environ.get('BATCH_RESULT_DIR', os.path.join(tempfile.gettempdir(), 'ews_batch_results'))
+BATCH_RESULT_TTL = 24 * 60 * 60  # detik
+PAGE_SIZE = 50
+# Nilai target_type yang sama dengan pilihan di form prediksi tunggal
+TARGET_TYPES = ('broadcast', 'rt_tertentu')
+
+# Model di-load sekali saat import; dengan gunicorn preload_app import ini terjadi
+# di master process sebelum fork, sehingga semua worker berbagi memori model
+model_loader = ModelLoader(MODEL_DIR)
+predictor = None
+try:
+    model_loader.load_models()
+    predictor = Predictor(model_loader)
+except Exception as e:
+    print(f"❌ Error loading models: {e}")
+    traceback.print_exc()
+
+@app.route('/', methods=['GET'])
+def home():
+    return render_template('home.html')
+
+@app.route('/predict', methods=['POST'])
+def predict():
+    if predictor is None:
+        return render_template('result.html', error='Model belum siap. Hubungi admin.')
+    try:
+        tanggal = request.form['tanggal']
+        nominal = int(request.form['nominal'])
+        target_type = request.form['target_type']
+        rt_number = request.form.get('rt_number') or None
+        result = predictor.predict(tanggal, nominal, target_type, rt_number)
+        # Tambahkan input ke result agar bisa ditampilkan di template
+        result['tanggal'] = tanggal
+        result['nominal'] = nominal
+        result['target_type'] = target_type
+        result['rt_number'] = rt_number
+        return render_template('result.html', result=result)
+    except Exception as e:
+        return render_template('result.html', error=f'Error: {e}')
+
+def read_upload_csv(file):
+    # Validasi CSV upload: wajib kolom tanggal & nominal, target_type & rt_number opsional.
+    # Semua kolom dibaca sebagai teks; nama kolom dinormalisasi dulu baru di-cast, agar
+    # header seperti " RT_Number" tidak kehilangan nol di depan nomor RT
+    df = pd.read_csv(file, dtype=str, keep_default_na=False)
+    df.columns = [c.strip().lower() for c in df.columns]
+    missing = {'tanggal', 'nominal'} - set(df.columns)
+    if missing:
+        raise ValueError(f"Kolom wajib tidak ada: {', '.join(sorted(missing))}")
+    if df.empty:
+        raise ValueError("File CSV kosong")
+    if 'target_type' not in df.columns:
+        df['target_type'] = 'broadcast'
+    if 'rt_number' not in df.columns:
+        df['rt_number'] = ''
+    df = df[['tanggal', 'nominal', 'target_type', 'rt_number']].apply(lambda s: s.str.strip())
+    df['target_type'] = df['target_type'].str.lower().replace('', 'broadcast')
+
+    nominal = pd.to_numeric(df['nominal'], errors='coerce')
+    tanggal = pd.to_datetime(df['tanggal'], format='%Y-%m-%d', errors='coerce')
+    checks = [
+        (tanggal.isna(), "tanggal harus berformat YYYY-MM-DD"),
+        (~(nominal > 0), "nominal harus angka lebih dari 0"),
+        (~df['target_type'].isin(TARGET_TYPES), f"target_type harus salah satu dari {', '.join(TARGET_TYPES)}"),
+        ((df['target_type'] == 'rt_tertentu') & (df['rt_number'] == ''), "rt_number wajib diisi untuk target_type rt_tertentu"),
+    ]
+    # Laporkan baris pertama yang tidak valid (baris 1 = header)
+    errors = [(int(mask.to_numpy().argmax()), message) for mask, message in checks if mask.any()]
+    if errors:
+        row, message = min(errors)
+        raise ValueError(f"Baris {row + 2}: {message}")
+    df['nominal'] = nominal
+    return df
+
+def cleanup_batch_results():
+    # Hapus hasil batch yang lebih tua dari BATCH_RESULT_TTL
+    now = time.time()
+    for name in os.listdir(BATCH_RESULT_DIR):
+        path = os.path.join(BATCH_RESULT_DIR, name)
+        try:
+            if now - os.path.getmtime(path) > BATCH_RESULT_TTL:
+                os.remove(path)
+        except FileNotFoundError:
+            # Sudah dihapus worker lain yang menjalankan cleanup bersamaan
+            pass
+
+def batch_result_path(token):
+    # Token berupa uuid hex; cegah path traversal
+    if len(token) != 32 or any(c not in '0123456789abcdef' for c in token):
+        abort(404)
+    path = os.path.join(BATCH_RESULT_DIR, f'{token}.csv')
+    if not os.path.exists(path):
+        abort(404)
+    return path
+
+@app.route('/predict/csv', methods=['POST'])
+def predict_csv():
+    if predictor is None:
+        return render_template('batch_result.html', error='Model belum siap. Hubungi admin.')
+    try:
+        file = request.files.get('file')
+        if file is None or file.filename == '':
+            raise ValueError("Pilih file CSV terlebih dahulu")
+        df = read_upload_csv(file)
+        scores = predictor.predict_batch(df['tanggal'].tolist(), df['nominal'].to_numpy())
+        statuses = [c['status'] for c in RISK_CATEGORIES]
+        df['risk_score'] = scores['risk_score']
+        df['status'] = pd.Categorical.from_codes(scores['category_index'], statuses)
+
+        os.makedirs(BATCH_RESULT_DIR, exist_ok=True)
+        cleanup_batch_results()
+        token = uuid.uuid4().hex
+        df.to_csv(os.path.join(BATCH_RESULT_DIR, f'{token}.csv'), index=False)
+        return redirect(url_for('batch_result', token=token))
+    except Exception as e:
+        return render_template('batch_result.html', error=f'Error: {e}')
+
+@app.route('/predict/csv/<token>', methods=['GET'])
+def batch_result(token):
+    df = pd.read_csv(batch_result_path(token), dtype={'tanggal': str, 'rt_number': str}, keep_default_na=False)
+    total_pages = max(1, -(-len(df) // PAGE_SIZE))
+    page = min(max(request.args.get('page', 1, type=int), 1), total_pages)
+    rows = df.iloc[(page - 1) * PAGE_SIZE:page * PAGE_SIZE].to_dict('records')
+    counts = df['status'].value_counts()
+    summary = [
+        {**category, 'count': int(counts.get(category['status'], 0))}
+        for category in RISK_CATEGORIES
+    ]
+    return render_template(
+        'batch_result.html',
+        token=token,
+        rows=rows,
+        summary=summary,
+        total=len(df),
+        page=page,
+        total_pages=total_pages,
+        offset=(page - 1) * PAGE_SIZE,
+    )
+
+@app.route('/predict/csv/<token>/download', methods=['GET'])
+def batch_result_download(token):
+    return send_file(batch_result_path(token), mimetype='text/csv', as_attachment=True, download_name=f'hasil_prediksi_{token}.csv')
+
+if __name__ == '__main__':
+    app.run(host='0.0.0.0', port=7860)
@@ -0,0 +1,17 @@
+# Konfigurasi gunicorn untuk deployment (Hugging Face Spaces / Docker)
+import gc
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 7860)}"
+workers = int(os.environ.get('WEB_CONCURRENCY', min(4, multiprocessing.cpu_count())))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+
+# Load app (dan model) sekali di master process sebelum fork; worker berbagi
+# memori model secara copy-on-write, bukan load ulang per worker
+preload_app = True
+
+def when_ready(server):
+    # Pindahkan objek hasil preload ke generasi permanen GC agar garbage collector
+    # di worker tidak menyentuh (dan meng-copy) page memori model
+    gc.freeze()
@@ -1,16 +1,31 @@
-import numpy as np
-from datetime import datetime
-
-def build_base_features(tanggal, nominal):
-    # Contoh: ekstrak fitur dari tanggal dan nominal
-    dt = datetime.strptime(tanggal, "%Y-%m-%d")
-    features = {
-        "Bulan": dt.month,
-        "Hari": dt.day,
-        "Nominal": nominal
-    }
-    return features
-
-def prepare_features(base_dict, feature_columns):
-    # Urutkan fitur sesuai urutan yang diharapkan model
-    return np.array([[base_dict.get(col, 0) for col in feature_columns]])
+import numpy as np
+import pandas as pd
+from datetime import datetime
+
+def build_base_features(tanggal, nominal):
+    # Contoh: ekstrak fitur dari tanggal dan nominal
+    dt = datetime.strptime(tanggal, "%Y-%m-%d")
+    features = {
+        "Bulan": dt.month,
+        "Hari": dt.day,
+        "Nominal": nominal
+    }
+    return features
+
+def prepare_features(base_dict, feature_columns):
+    # Urutkan fitur sesuai urutan yang diharapkan model
+    return np.array([[base_dict.get(col, 0) for col in feature_columns]])
+
+def build_feature_matrix(tanggal_list, nominal_list, feature_columns):
+    # Versi batch dari build_base_features + prepare_features: satu matrix (n, n_fitur)
+    dates = pd.to_datetime(pd.Series(tanggal_list, dtype=str), format="%Y-%m-%d")
+    base = {
+        "Bulan": dates.dt.month.to_numpy(),
+        "Hari": dates.dt.day.to_numpy(),
+        "Nominal": np.asarray(nominal_list),
+    }
+    X = np.zeros((len(dates), len(feature_columns)))
+    for j, col in enumerate(feature_columns):
+        if col in base:
+            X[:, j] = base[col]
+    return X
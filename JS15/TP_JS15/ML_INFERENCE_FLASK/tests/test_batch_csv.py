@@ -0,0 +1,95 @@
+"""
+Test batch CSV: validasi upload per baris dan alur /predict/csv sampai download
+"""
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import app as flask_app
+from app import read_upload_csv
+from ml_logic.predictor import categorize_scores
+
+
+def upload(text):
+    return io.BytesIO(text.encode())
+
+
+def test_headers_normalized_before_cast_keeps_leading_zeros():
+    df = read_upload_csv(upload(
+        " Tanggal ,NOMINAL, Target_Type , RT_Number\n"
+        "2025-01-15,500000,broadcast,\n"
+        "2025-02-01,75000,RT_Tertentu,007\n"
+    ))
+    assert list(df.columns) == ['tanggal', 'nominal', 'target_type', 'rt_number']
+    assert df['rt_number'].tolist() == ['', '007']
+    assert df['target_type'].tolist() == ['broadcast', 'rt_tertentu']
+    assert df['nominal'].tolist() == [500000, 75000]
+
+
+def test_optional_columns_default_to_broadcast():
+    df = read_upload_csv(upload("tanggal,nominal\n2025-01-15,1000\n"))
+    assert df[['target_type', 'rt_number']].values.tolist() == [['broadcast', '']]
+
+
+@pytest.mark.parametrize("rows,expected", [
+    ("2025-01-15,1000,broadcast,\n2025-13-40,1000,broadcast,\n", "Baris 3: tanggal"),
+    ("2025-01-15,-5,broadcast,\n", "Baris 2: nominal"),
+    ("2025-01-15,abc,broadcast,\n", "Baris 2: nominal"),
+    ("2025-01-15,1000,broadcast,\n2025-01-15,1000,semua_rt,\n", "Baris 3: target_type"),
+    ("2025-01-15,1000,rt_tertentu,\n", "Baris 2: rt_number"),
+    # Error yang lebih awal dilaporkan walaupun jenis pengecekannya berbeda
+    ("2025-01-15,1000,xx,\n2025-99-01,1000,broadcast,\n", "Baris 2: target_type"),
+])
+def test_invalid_rows_report_line_number(rows, expected):
+    with pytest.raises(ValueError, match=expected):
+        read_upload_csv(upload("tanggal,nominal,target_type,rt_number\n" + rows))
+
+
+def test_missing_columns_and_empty_file():
+    with pytest.raises(ValueError, match="Kolom wajib tidak ada: nominal"):
+        read_upload_csv(upload("tanggal\n2025-01-15\n"))
+    with pytest.raises(ValueError, match="kosong"):
+        read_upload_csv(upload("tanggal,nominal\n"))
+
+
+class FakePredictor:
+    """Score = nominal / 10000, tanpa model asli"""
+
+    def predict_batch(self, tanggal_list, nominal_list):
+        scores = np.asarray(nominal_list, dtype=float) / 10000
+        return {"risk_score": scores, "category_index": categorize_scores(scores)}
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(flask_app, "predictor", FakePredictor())
+    monkeypatch.setattr(flask_app, "BATCH_RESULT_DIR", str(tmp_path))
+    return flask_app.app.test_client()
+
+
+def test_batch_upload_result_and_download(client):
+    csv_text = "tanggal,nominal,target_type,rt_number\n2025-01-15,100000,broadcast,\n2025-01-16,800000,rt_tertentu,003\n"
+    response = client.post("/predict/csv", data={"file": (upload(csv_text), "batch.csv")})
+    assert response.status_code == 302
+    location = response.headers["Location"]
+
+    page = client.get(location)
+    assert page.status_code == 200
+    assert "SANGAT TINGGI" in page.get_data(as_text=True)
+
+    download = client.get(location + "/download")
+    result = pd.read_csv(io.BytesIO(download.data), dtype={"rt_number": str}, keep_default_na=False)
+    assert result["risk_score"].tolist() == [10.0, 80.0]
+    assert result["status"].tolist() == ["RENDAH", "SANGAT TINGGI"]
+    assert result["rt_number"].tolist() == ["", "003"]
+
+
+def test_invalid_upload_shows_error_and_stores_nothing(client, tmp_path):
+    csv_text = "tanggal,nominal,target_type\n2025-01-15,1000,lainnya\n"
+    response = client.post("/predict/csv", data={"file": (upload(csv_text), "batch.csv")})
+    assert response.status_code == 200
+    assert "Baris 2: target_type" in response.get_data(as_text=True)
+    assert list(tmp_path.iterdir()) == []
+    assert client.get("/predict/csv/" + "0" * 32).status_code == 404
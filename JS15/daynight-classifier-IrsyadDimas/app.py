@@ -1,82 +1,297 @@
-import os
-import numpy as np
-import cv2
-import pickle
-import tensorflow as tf
-
-from flask import Flask, request, render_template
-from skimage.feature import hog
-import keras
-
-app = Flask(__name__)
-
-# Load Model & Scaler
-MODEL_PATH = 'day_night_model.h5'
-SCALER_PATH = 'scaler.pkl'
-
-try:
-    model = keras.models.load_model(MODEL_PATH)
-    with open(SCALER_PATH, 'rb') as f:
-        scaler = pickle.load(f)
-    print("✅ System Loaded Successfully")
-except Exception as e:
-    print(f"❌ Error loading system: {e}")
-    model = None
-    scaler = None
-
-def preprocess_image(image_bytes):
-    """Preprocess image untuk prediksi"""
-    # Decode gambar
-    nparr = np.frombuffer(image_bytes, np.uint8)
-    img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-    if img is None:
-        raise ValueError("Gambar tidak valid atau gagal dibaca.")
-    
-    # Preprocessing (Harus sama persis dengan Training)
-    img = cv2.resize(img, (256, 256))
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-    hog_feat = hog(gray, orientations=9, pixels_per_cell=(8,8),
-                   cells_per_block=(2,2), block_norm='L2-Hys',
-                   visualize=False, feature_vector=True)
-    if scaler is None:
-        raise ValueError("Scaler gagal dimuat. Silakan cek file scaler.pkl.")
-    return scaler.transform(hog_feat.reshape(1, -1))
-
-@app.route('/', methods=['GET'])
-def home():
-    """Halaman utama"""
-    return render_template('home.html')
-
-@app.route('/predict', methods=['POST'])
-def predict():
-    """Endpoint untuk prediksi"""
-    try:
-        if model is None:
-            return "Error: Model gagal dimuat. Silakan cek file model."
-        
-        # Ambil file dari request
-        file = request.files['file']
-        
-        # Preprocess gambar
-        data = preprocess_image(file.read())
-        
-        # Prediksi
-        prediction = model.predict(data)[0][0]
-        
-        # Tentukan label dan confidence
-        if prediction > 0.5:
-            label = "Day (Siang)"
-            confidence = round(prediction * 100, 1)  # Confidence untuk Day
-        else:
-            label = "Night (Malam)"
-            confidence = round((1 - prediction) * 100, 1)  # Confidence untuk Night
-        
-        # Kirim ke template dengan label dan confidence
-        return render_template('result.html', label=label, confidence=confidence)
-    
-    except Exception as e:
-        return f"Error: {e}"
-
-if __name__ == '__main__':
-    # Port 7860 wajib untuk Hugging Face Spaces
-    app.run(host='0.0.0.0', port=7860, debug=True)
\ No newline at end of file
+import os
+import io
+import zipfile
+import numpy as np
+import pickle
+import threading
+
+from flask import Flask, request, render_template, jsonify
+from werkzeug.exceptions import RequestEntityTooLarge
+
+from preprocessing import extract_features, extract_features_batch, load_gray, compute_hog, IMAGE_EXTENSIONS
+from numpy_model import NumpyModel
+from result_cache import ResultCache, content_hash, dhash
+from micro_batcher import MicroBatcher
+
+app = Flask(__name__)
+
+# Batas ukuran request upload: request dengan Content-Length lebih besar langsung
+# ditolak (413) sebelum body dibaca; body multipart di-spool ke disk oleh werkzeug
+MAX_UPLOAD_MB = int(os.environ.get('MAX_UPLOAD_MB', 50))
+app.config['MAX_CONTENT_LENGTH'] = MAX_UPLOAD_MB * 1024 * 1024
+# Batas ukuran satu file gambar (juga berlaku untuk tiap entry di dalam zip)
+MAX_IMAGE_BYTES = int(os.environ.get('MAX_IMAGE_MB', 20)) * 1024 * 1024
+READ_CHUNK_SIZE = 256 * 1024
+
+# Load Model & Scaler
+MODEL_PATH = 'day_night_model.h5'
+NUMPY_MODEL_PATH = 'day_night_model.npz'
+FOLDED_MODEL_PATH = 'day_night_model_folded'
+SCALER_PATH = 'scaler.pkl'
+
+# "auto": pakai artifact NumPy (folded > npz) jika ada, selain itu Keras;
+# bisa dipaksa "folded" / "numpy" / "keras"
+MODEL_RUNTIME = os.environ.get('MODEL_RUNTIME', 'auto')
+
+# Batas jumlah gambar per request batch dan total ukuran isi zip setelah diekstrak
+MAX_BATCH_IMAGES = int(os.environ.get('MAX_BATCH_IMAGES', 256))
+MAX_ZIP_UNCOMPRESSED = int(os.environ.get('MAX_ZIP_UNCOMPRESSED_MB', 200)) * 1024 * 1024
+
+# Cache hasil prediksi per proses: RESULT_CACHE_SIZE entry (0 = mati).
+# PHASH_MAX_DISTANCE >= 0 mengaktifkan pencocokan near-duplicate via dHash
+# (jarak Hamming dari 64 bit); default -1 = hanya exact match isi file
+RESULT_CACHE_SIZE = int(os.environ.get('RESULT_CACHE_SIZE', 1024))
+PHASH_MAX_DISTANCE = int(os.environ.get('PHASH_MAX_DISTANCE', -1))
+result_cache = ResultCache(RESULT_CACHE_SIZE, PHASH_MAX_DISTANCE)
+
+# Micro-batching /predict: request yang berjalan bersamaan di satu worker digabung
+# menjadi satu model.predict (MICRO_BATCH=0 untuk mematikan). MICRO_BATCH_WAIT_MS
+# > 0 menahan batch sebentar menunggu request lain; default 0 = tanpa jeda
+MICRO_BATCH = os.environ.get('MICRO_BATCH', '1') == '1'
+MICRO_BATCH_SIZE = int(os.environ.get('MICRO_BATCH_SIZE', 32))
+MICRO_BATCH_WAIT_MS = float(os.environ.get('MICRO_BATCH_WAIT_MS', 0))
+
+def resolve_runtime():
+    """Runtime yang dipakai ("folded" / "numpy" / "keras") sesuai MODEL_RUNTIME dan artifact yang ada"""
+    if MODEL_RUNTIME != 'auto':
+        return MODEL_RUNTIME
+    if os.path.isdir(FOLDED_MODEL_PATH):
+        return 'folded'
+    if os.path.exists(NUMPY_MODEL_PATH):
+        return 'numpy'
+    return 'keras'
+
+def load_model():
+    """Load model: forward pass NumPy jika artifact tersedia, fallback ke Keras"""
+    runtime = resolve_runtime()
+    if runtime == 'folded':
+        # Scaler sudah dilipat ke layer pertama, bobot di-memory-map
+        print(f"Model runtime: NumPy folded ({FOLDED_MODEL_PATH})")
+        return NumpyModel.load(FOLDED_MODEL_PATH)
+    if runtime == 'numpy':
+        print(f"Model runtime: NumPy ({NUMPY_MODEL_PATH})")
+        return NumpyModel.load(NUMPY_MODEL_PATH)
+    # TensorFlow hanya di-import jika model Keras memang dipakai
+    import keras
+    import tensorflow as tf
+    # Jumlah thread diatur eksplisit (gunicorn.conf.py mengisinya sesuai core per worker);
+    # 0 = default TensorFlow (semua core, boros jika ada beberapa worker)
+    tf.config.threading.set_intra_op_parallelism_threads(int(os.environ.get('TF_NUM_INTRAOP_THREADS', 0)))
+    tf.config.threading.set_inter_op_parallelism_threads(int(os.environ.get('TF_NUM_INTEROP_THREADS', 0)))
+    print(f"Model runtime: Keras ({MODEL_PATH})")
+    return keras.models.load_model(MODEL_PATH)
+
+def init_model():
+    """Load model & scaler ke variabel global model / scaler"""
+    global model, scaler
+    try:
+        model = load_model()
+        scaler = None
+        if not getattr(model, 'includes_scaler', False):
+            with open(SCALER_PATH, 'rb') as f:
+                scaler = pickle.load(f)
+        print("✅ System Loaded Successfully")
+    except Exception as e:
+        print(f"❌ Error loading system: {e}")
+        model = None
+        scaler = None
+
+model = None
+scaler = None
+# gunicorn.conf.py mengisi MODEL_LOAD_ON_IMPORT=0 jika preload mati; model lalu
+# di-load di hook post_fork (di dalam worker, bukan di master)
+if os.environ.get('MODEL_LOAD_ON_IMPORT', '1') == '1':
+    init_model()
+
+def scale_features(features):
+    """Standarisasi fitur HOG, kecuali scaler sudah dilipat ke model"""
+    if getattr(model, 'includes_scaler', False):
+        return features
+    if scaler is None:
+        raise ValueError("Scaler gagal dimuat. Silakan cek file scaler.pkl.")
+    return scaler.transform(features)
+
+# model.predict Keras tidak aman dipanggil dari beberapa thread sekaligus (thread
+# micro-batcher dan thread request /predict/batch di worker gthread), jadi
+# dijalankan bergantian. NumpyModel hanya membaca bobot sehingga tidak perlu lock
+keras_predict_lock = threading.Lock()
+
+def predict_features(features):
+    """Scaler + model untuk matrix fitur HOG mentah; probabilitas Day per baris"""
+    X = scale_features(features)
+    if isinstance(model, NumpyModel):
+        return model.predict(X, batch_size=len(X), verbose=0).ravel()
+    with keras_predict_lock:
+        return model.predict(X, batch_size=len(X), verbose=0).ravel()
+
+batcher = MicroBatcher(predict_features, MICRO_BATCH_SIZE, MICRO_BATCH_WAIT_MS)
+
+def preprocess_image(image_bytes):
+    """Preprocess image untuk prediksi"""
+    hog_feat = extract_features(image_bytes)
+    return scale_features(hog_feat.reshape(1, -1))
+
+def to_label(prediction):
+    """Tentukan label dan confidence dari output sigmoid model"""
+    prediction = float(prediction)
+    if prediction > 0.5:
+        return "Day (Siang)", round(prediction * 100, 1)  # Confidence untuk Day
+    return "Night (Malam)", round((1 - prediction) * 100, 1)  # Confidence untuk Night
+
+def classify_image(image_bytes):
+    """Label dan confidence satu gambar, lewat result cache"""
+    key = content_hash(image_bytes)
+    result = result_cache.get(key)
+    if result is not None:
+        return result  # gambar identik: decode, HOG, dan model dilewati
+
+    gray = load_gray(image_bytes)
+    phash = dhash(gray) if result_cache.perceptual_enabled else None
+    if phash is not None:
+        result = result_cache.get_similar(phash)
+    if result is None:
+        hog_feat = compute_hog(gray)
+        if MICRO_BATCH:
+            prediction = batcher.submit(hog_feat)
+        else:
+            prediction = predict_features(hog_feat.reshape(1, -1))[0]
+        result = to_label(prediction)
+    result_cache.put(key, result, phash)
+    return result
+
+def read_limited(stream, max_bytes, name='file'):
+    """Baca stream per chunk dan hentikan begitu ukurannya melewati max_bytes"""
+    buffer = io.BytesIO()
+    while True:
+        chunk = stream.read(READ_CHUNK_SIZE)
+        if not chunk:
+            break
+        if buffer.tell() + len(chunk) > max_bytes:
+            raise ValueError(f"Ukuran {name} melebihi batas {max_bytes // (1024 * 1024)} MB.")
+        buffer.write(chunk)
+    return buffer.getvalue()
+
+def read_batch_uploads(files):
+    """Kumpulkan (nama, bytes) dari upload multi-file dan/atau arsip zip"""
+    images = []
+    for file in files:
+        is_zip = file.filename.lower().endswith('.zip') or zipfile.is_zipfile(file.stream)
+        file.stream.seek(0)
+        if is_zip:
+            # Arsip dibuka langsung dari file upload (spool) tanpa disalin ke memori
+            with zipfile.ZipFile(file.stream) as archive:
+                entries = [
+                    info for info in archive.infolist()
+                    if not info.is_dir()
+                    and not info.filename.startswith('__MACOSX/')
+                    and info.filename.lower().endswith(IMAGE_EXTENSIONS)
+                ]
+                if sum(info.file_size for info in entries) > MAX_ZIP_UNCOMPRESSED:
+                    raise ValueError("Isi arsip zip terlalu besar.")
+                for info in entries:
+                    # file_size di header zip bisa dipalsukan, jadi tetap dibaca dengan batas
+                    with archive.open(info) as entry:
+                        images.append((info.filename, read_limited(entry, MAX_IMAGE_BYTES, info.filename)))
+        else:
+            images.append((file.filename, read_limited(file.stream, MAX_IMAGE_BYTES, file.filename)))
+        if len(images) > MAX_BATCH_IMAGES:
+            raise ValueError(f"Maksimal {MAX_BATCH_IMAGES} gambar per request.")
+    return images
+
+@app.route('/', methods=['GET'])
+def home():
+    """Halaman utama"""
+    return render_template('home.html')
+
+@app.route('/predict', methods=['POST'])
+def predict():
+    """Endpoint untuk prediksi"""
+    try:
+        if model is None:
+            return "Error: Model gagal dimuat. Silakan cek file model."
+        
+        # Ambil file dari request
+        file = request.files['file']
+        
+        # Upload dibaca per chunk dengan batas ukuran
+        image_bytes = read_limited(file.stream, MAX_IMAGE_BYTES, file.filename)
+        
+        # Preprocess + prediksi (atau hasil dari cache), lalu label dan confidence
+        label, confidence = classify_image(image_bytes)
+        
+        # Kirim ke template dengan label dan confidence
+        return render_template('result.html', label=label, confidence=confidence)
+        
+    except RequestEntityTooLarge:
+        raise
+    except Exception as e:
+        return f"Error: {e}"
+
+@app.route('/predict/batch', methods=['POST'])
+def predict_batch():
+    """Endpoint prediksi banyak gambar (multi-file atau zip) dalam satu panggilan model"""
+    want_json = request.args.get('format') == 'json'
+    try:
+        if model is None:
+            raise ValueError("Model gagal dimuat. Silakan cek file model.")
+
+        images = read_batch_uploads(request.files.getlist('files'))
+        if not images:
+            raise ValueError("Tidak ada gambar yang diupload.")
+
+        # Gambar yang isinya sudah pernah diprediksi diambil dari cache (exact match)
+        keys = [content_hash(data) for _, data in images]
+        cached = [result_cache.get(key) for key in keys]
+        pending = [i for i, result in enumerate(cached) if result is None]
+
+        # HOG paralel, lalu satu scaler.transform dan satu model.predict untuk sisanya
+        features, errors = extract_features_batch([images[i][1] for i in pending])
+        predictions = iter(predict_features(features) if len(features) else [])
+        for i, error in zip(pending, errors):
+            if error is None:
+                cached[i] = to_label(next(predictions))
+                result_cache.put(keys[i], cached[i])
+            else:
+                cached[i] = error
+
+        results = []
+        for (filename, _), result in zip(images, cached):
+            if isinstance(result, str):
+                results.append({"filename": filename, "error": result})
+                continue
+            label, confidence = result
+            results.append({"filename": filename, "label": label, "confidence": confidence})
+
+        if want_json:
+            return jsonify({"success": True, "count": len(results), "results": results})
+        return render_template('batch_result.html', results=results)
+
+    except RequestEntityTooLarge:
+        raise
+    except Exception as e:
+        if want_json:
+            return jsonify({"success": False, "error": str(e)}), 400
+        return f"Error: {e}"
+
+@app.route('/cache/stats', methods=['GET'])
+def cache_stats():
+    """Statistik result cache (hit rate, eviction) untuk proses ini"""
+    return jsonify({"success": True, "data": result_cache.stats()})
+
+@app.route('/batcher/stats', methods=['GET'])
+def batcher_stats():
+    """Statistik micro-batcher (jumlah batch, rata-rata ukuran batch) untuk proses ini"""
+    return jsonify({"success": True, "data": {"enabled": MICRO_BATCH, **batcher.stats()}})
+
+@app.errorhandler(RequestEntityTooLarge)
+def request_too_large(e):
+    """Request melebihi MAX_CONTENT_LENGTH"""
+    message = f"Ukuran upload melebihi batas {MAX_UPLOAD_MB} MB."
+    if request.args.get('format') == 'json':
+        return jsonify({"success": False, "error": message}), 413
+    return f"Error: {message}", 413
+
+if __name__ == '__main__':
+    # Server development; production memakai gunicorn (lihat gunicorn.conf.py)
+    # Port 7860 wajib untuk Hugging Face Spaces
+    app.run(host='0.0.0.0', port=7860, debug=os.environ.get('FLASK_DEBUG', '0') == '1')
\ No newline at end of file
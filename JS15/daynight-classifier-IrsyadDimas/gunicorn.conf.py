@@ -0,0 +1,80 @@
+# Konfigurasi gunicorn untuk production (Hugging Face Spaces / Docker)
+import gc
+import os
+
+def available_cpus():
+    """Jumlah core yang boleh dipakai proses: CPU affinity dibatasi kuota cgroup container"""
+    if hasattr(os, 'sched_getaffinity'):
+        cpus = len(os.sched_getaffinity(0))
+    else:
+        cpus = os.cpu_count() or 1
+
+    quota = None
+    try:
+        # cgroup v2: "<quota> <period>" atau "max <period>"
+        with open('/sys/fs/cgroup/cpu.max') as f:
+            value, period = f.read().split()
+        if value != 'max':
+            quota = int(value) / int(period)
+    except (OSError, ValueError):
+        try:
+            # cgroup v1
+            with open('/sys/fs/cgroup/cpu/cpu.cfs_quota_us') as f:
+                value = int(f.read())
+            with open('/sys/fs/cgroup/cpu/cpu.cfs_period_us') as f:
+                period = int(f.read())
+            if value > 0:
+                quota = value / period
+        except (OSError, ValueError):
+            pass
+
+    if quota is not None:
+        cpus = min(cpus, max(1, int(quota)))
+    return cpus
+
+CPUS = available_cpus()
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 7860)}"
+# Satu worker (proses) per core
+workers = int(os.environ.get('WEB_CONCURRENCY', CPUS))
+# gthread: beberapa request per worker berjalan bersamaan, sehingga micro-batcher
+# di app.py bisa menggabungkannya ke satu model.predict
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 8))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+
+# Thread pool numerik per worker = core / worker, supaya total thread tidak melebihi
+# core (default BLAS/TensorFlow memakai semua core di setiap worker). Diset di sini
+# karena harus ada di environment sebelum numpy/TensorFlow di-import.
+THREADS_PER_WORKER = max(1, CPUS // workers)
+for var in ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS', 'TF_NUM_INTRAOP_THREADS'):
+    os.environ.setdefault(var, str(THREADS_PER_WORKER))
+os.environ.setdefault('TF_NUM_INTEROP_THREADS', '1')
+
+def uses_keras_runtime():
+    """Aturan yang sama dengan app.resolve_runtime, tanpa meng-import app (dan model)"""
+    runtime = os.environ.get('MODEL_RUNTIME', 'auto')
+    if runtime == 'auto':
+        return not (os.path.isdir('day_night_model_folded') or os.path.exists('day_night_model.npz'))
+    return runtime == 'keras'
+
+# Load app (dan model) sekali di master process sebelum fork; worker berbagi
+# memori model secara copy-on-write. TensorFlow tidak aman di-fork setelah
+# diinisialisasi (worker hang), jadi preload selalu mati untuk runtime Keras.
+# GUNICORN_PRELOAD=0 mematikannya juga untuk runtime NumPy.
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') == '1' and not uses_keras_runtime()
+os.environ['MODEL_LOAD_ON_IMPORT'] = '1' if preload_app else '0'
+
+def when_ready(server):
+    server.log.info(f"CPU tersedia: {CPUS}, workers: {workers}, threads/worker: {threads}, "
+                    f"thread numerik/worker: {THREADS_PER_WORKER}")
+    # Pindahkan objek hasil preload ke generasi permanen GC agar garbage collector
+    # di worker tidak menyentuh (dan meng-copy) page memori model
+    gc.freeze()
+
+def post_fork(server, worker):
+    if preload_app:
+        return
+    # Tanpa preload, model (dan TensorFlow) diinisialisasi di worker setelah fork
+    import app
+    app.init_model()
@@ -0,0 +1,87 @@
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+class MicroBatcher:
+    """
+    Gabungkan request /predict yang datang bersamaan menjadi satu panggilan model.
+
+    Setiap thread request memanggil submit(fitur) dan menunggu hasilnya. Satu
+    thread latar mengambil semua fitur yang sudah mengantre (maksimal
+    max_batch_size), menjalankan predict_fn sekali untuk seluruh matrix, lalu
+    membagikan hasil per baris. Dengan max_wait_ms = 0 tidak ada jeda tambahan:
+    batch terbentuk dari request yang menumpuk selama model sedang sibuk.
+
+    Thread latar dibuat saat submit pertama di proses tersebut, sehingga aman
+    dipakai bersama gunicorn preload_app (thread tidak ikut ter-fork).
+    """
+
+    def __init__(self, predict_fn, max_batch_size=32, max_wait_ms=0.0):
+        self.predict_fn = predict_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._pid = None
+        self.batches = 0
+        self.items = 0
+
+    def _ensure_started(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                # Proses baru (atau hasil fork): antrean dan thread milik parent tidak dipakai
+                self._queue = queue.Queue()
+                threading.Thread(target=self._run, args=(self._queue,), daemon=True).start()
+                self._pid = os.getpid()
+
+    def submit(self, features):
+        """Prediksi satu vektor fitur; blocking sampai batch-nya selesai"""
+        self._ensure_started()
+        future = Future()
+        self._queue.put((features, future))
+        return future.result()
+
+    def _collect(self, pending):
+        """Tunggu item pertama, lalu ambil item lain sampai antrean kosong/batch penuh/max_wait"""
+        batch = [pending.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            try:
+                remaining = deadline - time.monotonic()
+                if remaining > 0:
+                    batch.append(pending.get(timeout=remaining))
+                else:
+                    batch.append(pending.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self, pending):
+        while True:
+            batch = self._collect(pending)
+            futures = [future for _, future in batch]
+            try:
+                outputs = self.predict_fn(np.stack([features for features, _ in batch]))
+            except Exception as e:
+                for future in futures:
+                    future.set_exception(e)
+                continue
+            self.batches += 1
+            self.items += len(batch)
+            for future, output in zip(futures, outputs):
+                future.set_result(output)
+
+    def stats(self):
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+        }
@@ -0,0 +1,172 @@
+import os
+import json
+import shutil
+import tempfile
+import numpy as np
+
+# Versi format artifact hasil tools/export_numpy_model.py
+FORMAT_VERSION = 1
+
+MANIFEST_FILE = 'manifest.json'
+
+def _sigmoid(x):
+    # Bentuk stabil dari 1 / (1 + exp(-x)) tanpa overflow untuk x sangat negatif
+    return np.exp(-np.logaddexp(0, -x))
+
+def _softmax(x):
+    e = np.exp(x - x.max(axis=-1, keepdims=True))
+    return e / e.sum(axis=-1, keepdims=True)
+
+ACTIVATIONS = {
+    'linear': lambda x: x,
+    'relu': lambda x: np.maximum(x, 0),
+    'sigmoid': _sigmoid,
+    'tanh': np.tanh,
+    'softmax': _softmax,
+}
+
+class NumpyModel:
+    """
+    Forward pass jaringan dense (hasil export Keras) hanya dengan NumPy.
+
+    Layer yang didukung: dense (W, b, aktivasi), affine (BatchNormalization
+    yang sudah dilipat menjadi x * scale + shift), activation, dan flatten.
+    Dropout tidak berpengaruh saat inference sehingga tidak diekspor.
+
+    Jika includes_scaler True, StandardScaler sudah dilipat ke layer dense
+    pertama sehingga input adalah fitur HOG mentah (tanpa scaler.transform).
+    """
+
+    def __init__(self, layers, includes_scaler=False):
+        self.layers = layers
+        self.includes_scaler = includes_scaler
+
+    @classmethod
+    def load(cls, path):
+        """Load artifact .npz hasil export, atau directory artifact (array di-memory-map)"""
+        if os.path.isdir(path):
+            return cls._load_dir(path)
+        with np.load(path) as data:
+            spec = json.loads(str(data['spec']))
+            if spec['version'] != FORMAT_VERSION:
+                raise ValueError(f"Versi format model tidak didukung: {spec['version']}")
+            layers = []
+            for i, layer in enumerate(spec['layers']):
+                layer = dict(layer)
+                for name in layer.pop('arrays', []):
+                    layer[name] = data[f'layer{i}_{name}']
+                layers.append(layer)
+        return cls(layers)
+
+    @classmethod
+    def _load_dir(cls, path):
+        # mmap_mode='r': page bobot dibaca langsung dari file dan dipakai bersama
+        # oleh semua worker yang membuka file yang sama
+        with open(os.path.join(path, MANIFEST_FILE)) as f:
+            manifest = json.load(f)
+        if manifest['version'] != FORMAT_VERSION:
+            raise ValueError(f"Versi format model tidak didukung: {manifest['version']}")
+        layers = []
+        for layer in manifest['layers']:
+            layer = dict(layer)
+            for name, filename in layer.pop('arrays', {}).items():
+                layer[name] = np.load(os.path.join(path, filename), mmap_mode='r')
+            layers.append(layer)
+        return cls(layers, includes_scaler=manifest.get('includes_scaler', False))
+
+    def save_dir(self, path):
+        """
+        Simpan sebagai directory berisi satu file .npy per array + manifest.json.
+
+        Artifact ditulis ke directory sementara di sebelah path lalu dipasang
+        dengan os.replace, sehingga file .npy yang sedang di-memory-map worker
+        tidak pernah ditimpa di tempat. Directory lama dipindah dulu lalu
+        dihapus (rename directory tidak bisa menimpa directory yang berisi),
+        jadi hanya ada jeda sesaat ketika path belum ada, tidak pernah
+        campuran file lama dan baru.
+        """
+        path = os.path.abspath(path)
+        parent, name = os.path.split(path)
+        tmp = tempfile.mkdtemp(prefix=f'.{name}.tmp-', dir=parent)
+        try:
+            os.chmod(tmp, 0o755)
+            self._write_dir(tmp)
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+
+        old = None
+        if os.path.exists(path):
+            old = tempfile.mkdtemp(prefix=f'.{name}.old-', dir=parent)
+            os.replace(path, os.path.join(old, name))
+        os.replace(tmp, path)
+        if old is not None:
+            # File lama yang masih di-mmap worker tetap valid setelah di-unlink
+            shutil.rmtree(old, ignore_errors=True)
+
+    def _write_dir(self, path):
+        layers = []
+        for i, layer in enumerate(self.layers):
+            entry, arrays = {}, {}
+            for key, value in layer.items():
+                if isinstance(value, np.ndarray):
+                    filename = f'layer{i}_{key}.npy'
+                    np.save(os.path.join(path, filename), np.ascontiguousarray(value, dtype=np.float32))
+                    arrays[key] = filename
+                else:
+                    entry[key] = value
+            if arrays:
+                entry['arrays'] = arrays
+            layers.append(entry)
+        manifest = {'version': FORMAT_VERSION, 'includes_scaler': self.includes_scaler, 'layers': layers}
+        # Manifest ditulis terakhir: directory tanpa manifest dianggap belum lengkap
+        with open(os.path.join(path, MANIFEST_FILE), 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+    def fold_scaler(self, mean, scale):
+        """
+        Lipat StandardScaler ((x - mean) / scale) ke layer dense pertama.
+
+        ((x - mean) / scale) @ W + b == x @ (W / scale[:, None]) + (b - (mean / scale) @ W)
+
+        Returns:
+            NumpyModel baru yang menerima fitur mentah
+        """
+        if self.includes_scaler:
+            raise ValueError("Scaler sudah dilipat ke model ini")
+        first = next(i for i, layer in enumerate(self.layers) if layer['type'] != 'flatten')
+        layer = self.layers[first]
+        if layer['type'] != 'dense':
+            raise ValueError(f"Layer pertama harus dense untuk melipat scaler, dapat {layer['type']}")
+
+        W = np.asarray(layer['W'], dtype=np.float64)
+        b = np.asarray(layer.get('b', 0.0), dtype=np.float64)
+        mean = np.zeros(W.shape[0]) if mean is None else np.asarray(mean, dtype=np.float64)
+        scale = np.ones(W.shape[0]) if scale is None else np.asarray(scale, dtype=np.float64)
+
+        folded = dict(layer)
+        folded['W'] = (W / scale[:, None]).astype(np.float32)
+        folded['b'] = (b - (mean / scale) @ W).astype(np.float32)
+        layers = list(self.layers)
+        layers[first] = folded
+        return NumpyModel(layers, includes_scaler=True)
+
+    def predict(self, X, batch_size=None, verbose=0):
+        """Prediksi untuk matrix fitur (n, n_fitur); signature kompatibel dengan keras Model.predict"""
+        x = np.asarray(X, dtype=np.float32)
+        for layer in self.layers:
+            kind = layer['type']
+            if kind == 'dense':
+                x = x @ layer['W']
+                if 'b' in layer:
+                    x += layer['b']
+                x = ACTIVATIONS[layer['activation']](x)
+            elif kind == 'affine':
+                x = x * layer['scale'] + layer['shift']
+            elif kind == 'activation':
+                x = ACTIVATIONS[layer['activation']](x)
+            elif kind == 'flatten':
+                x = x.reshape(len(x), -1)
+            else:
+                raise ValueError(f"Layer tidak didukung: {kind}")
+        return x
@@ -0,0 +1,146 @@
+import os
+import struct
+import numpy as np
+import cv2
+from concurrent.futures import ThreadPoolExecutor
+
+from skimage.feature import hog
+from hog_fast import hog_fast
+
+# Parameter preprocessing (Harus sama persis dengan Training)
+IMAGE_SIZE = (256, 256)
+HOG_PARAMS = dict(orientations=9, pixels_per_cell=(8, 8),
+                  cells_per_block=(2, 2), block_norm='L2-Hys')
+
+# Implementasi HOG dipilih saat startup: "skimage" (referensi training) atau
+# "numpy" (hog_fast, tervektorisasi, selisih < 1e-6 terhadap skimage)
+HOG_IMPL = os.environ.get('HOG_IMPL', 'skimage')
+
+def hog_skimage(gray):
+    """HOG referensi dari scikit-image"""
+    return hog(gray, visualize=False, feature_vector=True, **HOG_PARAMS)
+
+def hog_numpy(gray):
+    """HOG tervektorisasi (hog_fast) dengan parameter yang sama"""
+    return hog_fast(gray, orientations=HOG_PARAMS['orientations'],
+                    pixels_per_cell=HOG_PARAMS['pixels_per_cell'],
+                    cells_per_block=HOG_PARAMS['cells_per_block'])
+
+HOG_IMPLEMENTATIONS = {'skimage': hog_skimage, 'numpy': hog_numpy}
+if HOG_IMPL not in HOG_IMPLEMENTATIONS:
+    raise ValueError(f"HOG_IMPL tidak dikenal: {HOG_IMPL} (pilihan: {', '.join(HOG_IMPLEMENTATIONS)})")
+compute_hog = HOG_IMPLEMENTATIONS[HOG_IMPL]
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.webp')
+
+# JPEG di-decode langsung pada resolusi 1/2, 1/4, atau 1/8 (DCT scaling libjpeg)
+# selama kedua sisi hasil decode tetap >= IMAGE_SIZE. Default mati: pixel hasilnya
+# berbeda dari decode penuh yang dipakai saat training. Aktifkan (REDUCED_DECODE=1)
+# hanya setelah tools/benchmark_decode.py --images <folder> menunjukkan label sama
+REDUCED_DECODE = os.environ.get('REDUCED_DECODE', '0') == '1'
+REDUCED_DECODE_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
+# Gambar dengan jumlah pixel (menurut header) di atas batas ini ditolak sebelum di-decode
+MAX_IMAGE_PIXELS = int(os.environ.get('MAX_IMAGE_PIXELS', 40_000_000))
+
+# Marker SOF (start of frame) JPEG yang berisi ukuran gambar
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+def jpeg_size(data):
+    """Baca (width, height) dari header SOF JPEG tanpa decode, atau None"""
+    if data[:2] != b'\xff\xd8':
+        return None
+    pos = 2
+    while pos + 4 <= len(data):
+        if data[pos] != 0xFF:
+            return None
+        marker = data[pos + 1]
+        if marker == 0xFF:  # padding antar marker
+            pos += 1
+            continue
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:  # marker tanpa payload
+            pos += 2
+            continue
+        length = struct.unpack('>H', data[pos + 2:pos + 4])[0]
+        if marker in JPEG_SOF_MARKERS:
+            if pos + 9 > len(data):
+                return None
+            height, width = struct.unpack('>HH', data[pos + 5:pos + 9])
+            return width, height
+        pos += 2 + length
+    return None
+
+def png_size(data):
+    """Baca (width, height) dari chunk IHDR PNG tanpa decode, atau None"""
+    if data[:8] != b'\x89PNG\r\n\x1a\n' or len(data) < 24:
+        return None
+    return struct.unpack('>II', data[16:24])
+
+def reduced_decode_flag(width, height):
+    """Flag reduced decode terbesar yang hasilnya masih >= IMAGE_SIZE (IMREAD_COLOR jika tidak ada)"""
+    for factor, flag in REDUCED_DECODE_FLAGS:
+        if width // factor >= IMAGE_SIZE[0] and height // factor >= IMAGE_SIZE[1]:
+            return flag
+    return cv2.IMREAD_COLOR
+
+def choose_decode_flag(image_bytes):
+    """Pilih flag imdecode: reduced decode untuk JPEG besar (jika aktif), IMREAD_COLOR selain itu"""
+    size = jpeg_size(image_bytes)
+    is_jpeg = size is not None
+    if size is None:
+        size = png_size(image_bytes)
+    if size is not None and size[0] * size[1] > MAX_IMAGE_PIXELS:
+        raise ValueError(f"Resolusi gambar terlalu besar ({size[0]}x{size[1]}).")
+    if is_jpeg and REDUCED_DECODE:
+        return reduced_decode_flag(*size)
+    return cv2.IMREAD_COLOR
+
+def decode_image(image_bytes):
+    """Decode bytes gambar menjadi array BGR"""
+    nparr = np.frombuffer(image_bytes, np.uint8)
+    img = cv2.imdecode(nparr, choose_decode_flag(image_bytes))
+    if img is None:
+        raise ValueError("Gambar tidak valid atau gagal dibaca.")
+    return img
+
+def load_gray(image_bytes):
+    """Decode + resize + grayscale (input HOG)"""
+    img = decode_image(image_bytes)
+    img = cv2.resize(img, IMAGE_SIZE)
+    return cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+
+def extract_features(image_bytes):
+    """Decode + resize + grayscale + HOG untuk satu gambar (vektor 1D)"""
+    return compute_hog(load_gray(image_bytes))
+
+def _safe_extract(image_bytes):
+    try:
+        return extract_features(image_bytes), None
+    except Exception as e:
+        return None, str(e)
+
+def extract_features_batch(images, max_workers=None):
+    """
+    Ekstraksi HOG untuk banyak gambar secara paralel.
+
+    Memakai thread, bukan process: cv2 dan kernel numpy melepas GIL, dan
+    worker tidak perlu fork proses yang sudah memuat TensorFlow.
+
+    Returns:
+        (features, errors): matrix (n_valid, n_fitur) dan list error per gambar
+        (None jika gambar berhasil diproses), urutan sesuai input
+    """
+    max_workers = max_workers or min(len(images), os.cpu_count() or 1)
+    if max_workers <= 1:
+        results = [_safe_extract(b) for b in images]
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_safe_extract, images))
+
+    errors = [error for _, error in results]
+    valid = [feat for feat, _ in results if feat is not None]
+    features = np.stack(valid) if valid else np.empty((0, 0))
+    return features, errors
@@ -0,0 +1,136 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+# Jumlah bit 1 untuk setiap nilai byte (popcount tanpa np.bitwise_count,
+# yang baru ada di NumPy 2.0)
+_POPCOUNT8 = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+def content_hash(image_bytes):
+    """Hash isi file (exact match)"""
+    return hashlib.blake2b(image_bytes, digest_size=16).digest()
+
+def dhash(gray, hash_size=8):
+    """
+    Difference hash 64-bit dari gambar grayscale.
+
+    Gambar diperkecil ke (hash_size + 1) x hash_size, lalu setiap bit menyatakan
+    apakah pixel lebih terang dari tetangga kanannya. Re-encode JPEG, resize, atau
+    noise kecil hanya mengubah sedikit bit.
+    """
+    small = cv2.resize(gray, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).ravel()
+    return np.uint64(int(np.packbits(bits).view('>u8')[0]))
+
+def hamming_distances(hashes, value):
+    """Jarak Hamming antara setiap elemen array uint64 dan satu hash"""
+    xor = np.bitwise_xor(hashes, np.uint64(value))
+    return _POPCOUNT8[xor.view(np.uint8)].reshape(-1, 8).sum(axis=1)
+
+class ResultCache:
+    """
+    Cache LRU (label, confidence) hasil prediksi.
+
+    Key utama adalah hash isi file: hit berarti decode, HOG, dan model dilewati
+    sepenuhnya. Jika max_distance >= 0, setiap entry juga menyimpan dHash
+    gambar sehingga gambar hampir sama (jarak Hamming <= max_distance) memakai
+    hasil yang sudah ada dan hanya membayar decode + resize.
+
+    Hash perceptual disimpan di array uint64 dengan slot tetap sehingga pencarian
+    near-duplicate adalah satu XOR + popcount ter-vektorisasi atas semua entry.
+    """
+
+    def __init__(self, max_entries=1024, max_distance=-1):
+        self.max_entries = max_entries
+        self.max_distance = max_distance
+        self._entries = OrderedDict()  # key -> (result, slot)
+        capacity = max(max_entries, 0)
+        self._hashes = np.zeros(capacity, dtype=np.uint64)
+        self._slot_used = np.zeros(capacity, dtype=bool)
+        self._slot_keys = [None] * capacity
+        self._free_slots = list(range(capacity - 1, -1, -1))
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.exact_hits = 0
+        self.perceptual_hits = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0
+
+    @property
+    def perceptual_enabled(self):
+        return self.enabled and self.max_distance >= 0
+
+    def get(self, key):
+        """Cari hasil berdasarkan hash isi file; None jika tidak ada"""
+        with self._lock:
+            self.lookups += 1
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            self.exact_hits += 1
+            return entry[0]
+
+    def get_similar(self, phash):
+        """
+        Cari hasil gambar dengan dHash terdekat dalam max_distance; None jika tidak ada.
+        Dipanggil setelah get(key) gagal, sehingga tidak menambah hitungan lookup.
+        """
+        with self._lock:
+            used = np.flatnonzero(self._slot_used)
+            if not len(used):
+                return None
+            distances = hamming_distances(self._hashes[used], phash)
+            best = int(np.argmin(distances))
+            if distances[best] > self.max_distance:
+                return None
+            key = self._slot_keys[used[best]]
+            self._entries.move_to_end(key)
+            self.perceptual_hits += 1
+            return self._entries[key][0]
+
+    def put(self, key, result, phash=None):
+        """Simpan hasil; entry yang paling lama tidak dipakai dikeluarkan jika penuh"""
+        if not self.enabled:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return
+            if len(self._entries) >= self.max_entries:
+                _, (_, old_slot) = self._entries.popitem(last=False)
+                if old_slot is not None:
+                    self._slot_used[old_slot] = False
+                    self._slot_keys[old_slot] = None
+                    self._free_slots.append(old_slot)
+                self.evictions += 1
+            slot = None
+            if phash is not None and self.perceptual_enabled:
+                slot = self._free_slots.pop()
+                self._hashes[slot] = phash
+                self._slot_used[slot] = True
+                self._slot_keys[slot] = key
+            self._entries[key] = (result, slot)
+
+    def stats(self):
+        """Statistik hit/miss/eviction sejak proses dimulai"""
+        with self._lock:
+            hits = self.exact_hits + self.perceptual_hits
+            return {
+                "enabled": self.enabled,
+                "perceptual_enabled": self.perceptual_enabled,
+                "max_entries": self.max_entries,
+                "max_distance": self.max_distance,
+                "size": len(self._entries),
+                "exact_hits": self.exact_hits,
+                "perceptual_hits": self.perceptual_hits,
+                "misses": self.lookups - hits,
+                "evictions": self.evictions,
+                "hit_rate": round(hits / self.lookups, 4) if self.lookups else 0.0,
+            }
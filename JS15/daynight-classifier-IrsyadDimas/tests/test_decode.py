@@ -0,0 +1,108 @@
+"""
+Test decode & batas upload: parsing header JPEG/PNG (termasuk input rusak) dan penolakan file terlalu besar
+"""
+import io
+import os
+import struct
+
+import cv2
+import numpy as np
+import pytest
+
+import preprocessing
+from preprocessing import choose_decode_flag, decode_image, jpeg_size, png_size
+
+# app.py tidak perlu me-load model untuk test read_limited
+os.environ.setdefault('MODEL_LOAD_ON_IMPORT', '0')
+from app import read_limited  # noqa: E402
+
+
+def encoded(ext, width, height, *params):
+    img = np.random.default_rng(0).integers(0, 256, (height, width, 3), dtype=np.uint8)
+    return cv2.imencode(ext, img, list(params))[1].tobytes()
+
+
+@pytest.mark.parametrize("params", [[], [cv2.IMWRITE_JPEG_PROGRESSIVE, 1]])
+def test_jpeg_size_baseline_and_progressive(params):
+    assert jpeg_size(encoded('.jpg', 321, 123, *params)) == (321, 123)
+
+
+def test_jpeg_size_skips_padding_and_app_segments():
+    data = encoded('.jpg', 64, 48)
+    # Segment APP1 tambahan + byte padding 0xFF sebelum marker berikutnya
+    app1 = b'\xff\xe1' + struct.pack('>H', 6) + b'abcd'
+    assert jpeg_size(data[:2] + app1 + b'\xff' + data[2:]) == (64, 48)
+
+
+def test_png_size():
+    assert png_size(encoded('.png', 70, 30)) == (70, 30)
+    assert png_size(encoded('.jpg', 70, 30)) is None
+
+
+@pytest.mark.parametrize("ext,parse", [('.jpg', jpeg_size), ('.png', png_size)])
+def test_truncated_headers_return_none_or_exact_size(ext, parse):
+    data = encoded(ext, 40, 20)
+    for end in range(len(data[:700])):
+        assert parse(data[:end]) in (None, (40, 20)), end
+
+
+def test_corrupt_jpeg_headers_return_none():
+    assert jpeg_size(b'') is None
+    assert jpeg_size(b'\xff\xd8') is None
+    # Byte setelah SOI bukan marker
+    assert jpeg_size(b'\xff\xd8\x00\x10' + b'\x00' * 20) is None
+    # Panjang segment menunjuk jauh melewati akhir data
+    assert jpeg_size(b'\xff\xd8\xff\xe0\xff\xff' + b'\x00' * 20) is None
+    # SOF terpotong sebelum ukuran gambar
+    assert jpeg_size(b'\xff\xd8\xff\xc0\x00\x11\x08\x00') is None
+    rng = np.random.default_rng(1)
+    for _ in range(200):
+        junk = b'\xff\xd8' + rng.integers(0, 256, int(rng.integers(0, 64)), dtype=np.uint8).tobytes()
+        size = jpeg_size(junk)
+        assert size is None or (len(size) == 2 and all(isinstance(v, int) for v in size))
+
+
+def test_oversize_rejected_from_header_before_decode(monkeypatch):
+    monkeypatch.setattr(preprocessing, 'MAX_IMAGE_PIXELS', 100 * 100)
+    with pytest.raises(ValueError, match="101x100"):
+        choose_decode_flag(encoded('.jpg', 101, 100))
+    # Header PNG saja (tanpa data pixel) sudah cukup untuk ditolak
+    header = b'\x89PNG\r\n\x1a\n' + struct.pack('>I', 13) + b'IHDR' + struct.pack('>II', 50000, 50000)
+    with pytest.raises(ValueError, match="terlalu besar"):
+        decode_image(header)
+    assert choose_decode_flag(encoded('.jpg', 100, 100)) == cv2.IMREAD_COLOR
+
+
+def test_reduced_decode_is_off_by_default_and_opt_in(monkeypatch):
+    big = encoded('.jpg', 2100, 1100)
+    assert preprocessing.REDUCED_DECODE is (os.environ.get('REDUCED_DECODE', '0') == '1')
+    monkeypatch.setattr(preprocessing, 'REDUCED_DECODE', False)
+    assert choose_decode_flag(big) == cv2.IMREAD_COLOR
+    monkeypatch.setattr(preprocessing, 'REDUCED_DECODE', True)
+    # 2100 / 8 < 256, 2100 / 4 dan 1100 / 4 >= 256
+    assert choose_decode_flag(big) == cv2.IMREAD_REDUCED_COLOR_4
+    assert choose_decode_flag(encoded('.png', 2100, 1100)) == cv2.IMREAD_COLOR
+    assert decode_image(big).shape == (275, 525, 3)
+
+
+def test_corrupt_image_raises_value_error():
+    with pytest.raises(ValueError, match="tidak valid"):
+        decode_image(encoded('.jpg', 64, 48)[:40])
+
+
+def test_read_limited_stops_at_byte_cap():
+    data = b'x' * (3 * 256 * 1024 + 5)
+    assert read_limited(io.BytesIO(data), len(data)) == data
+
+    class CountingStream(io.BytesIO):
+        reads = 0
+
+        def read(self, size=-1):
+            self.reads += 1
+            return super().read(size)
+
+    stream = CountingStream(data * 10)
+    with pytest.raises(ValueError, match="foto.jpg melebihi batas"):
+        read_limited(stream, len(data), 'foto.jpg')
+    # Berhenti begitu batas terlewati, tidak membaca seluruh stream
+    assert stream.reads <= len(data) // (256 * 1024) + 2
@@ -0,0 +1,53 @@
+"""
+Test hog_fast: fitur harus sama dengan skimage.feature.hog (referensi training)
+"""
+import numpy as np
+import pytest
+from skimage.feature import hog
+
+from hog_fast import hog_fast
+from preprocessing import HOG_PARAMS, hog_numpy, hog_skimage
+
+
+def synthetic_images(seed=0):
+    rng = np.random.default_rng(seed)
+    yy, xx = np.mgrid[0:256, 0:256]
+    return {
+        "noise": rng.integers(0, 256, (256, 256), dtype=np.uint8),
+        "gradient": ((xx + 2 * yy) % 256).astype(np.uint8),
+        "konstan": np.full((256, 256), 128, dtype=np.uint8),
+        # Garis dengan sudut tepat di batas bin orientasi (kelipatan 20 derajat)
+        "batas_bin": (np.sin(np.deg2rad(40)) * xx + np.cos(np.deg2rad(40)) * yy > 128).astype(np.uint8) * 255,
+        "checkerboard": (((xx // 8) + (yy // 8)) % 2 * 255).astype(np.uint8),
+    }
+
+
+@pytest.mark.parametrize("name,image", synthetic_images().items())
+def test_matches_skimage_on_training_size(name, image):
+    expected = hog(image, feature_vector=True, **HOG_PARAMS)
+    actual = hog_fast(image, orientations=9, pixels_per_cell=(8, 8), cells_per_block=(2, 2))
+    assert actual.shape == expected.shape
+    np.testing.assert_allclose(actual, expected, atol=1e-6)
+
+
+@pytest.mark.parametrize("shape,ppc,cpb,orientations", [
+    ((203, 157), (8, 8), (2, 2), 9),   # bukan kelipatan ukuran cell
+    ((64, 96), (6, 4), (3, 2), 12),
+    ((48, 48), (16, 16), (1, 1), 6),
+])
+def test_matches_skimage_with_other_parameters(shape, ppc, cpb, orientations):
+    image = np.random.default_rng(1).random(shape)
+    expected = hog(image, orientations=orientations, pixels_per_cell=ppc,
+                   cells_per_block=cpb, block_norm='L2-Hys', feature_vector=True)
+    actual = hog_fast(image, orientations=orientations, pixels_per_cell=ppc, cells_per_block=cpb)
+    np.testing.assert_allclose(actual, expected, atol=1e-6)
+
+
+def test_preprocessing_wrappers_agree():
+    image = synthetic_images(2)["noise"]
+    np.testing.assert_allclose(hog_numpy(image), hog_skimage(image), atol=1e-6)
+
+
+def test_image_smaller_than_block_is_rejected():
+    with pytest.raises(ValueError):
+        hog_fast(np.zeros((12, 12)), pixels_per_cell=(8, 8), cells_per_block=(2, 2))
@@ -0,0 +1,97 @@
+"""
+Test micro_batcher: hasil request yang digabung harus sama dengan prediksi satu per satu
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from micro_batcher import MicroBatcher
+from numpy_model import NumpyModel
+
+
+@pytest.fixture(scope="module")
+def model():
+    rng = np.random.default_rng(0)
+    return NumpyModel([
+        {"type": "dense", "activation": "relu",
+         "W": rng.normal(size=(32, 16)).astype(np.float32), "b": rng.normal(size=16).astype(np.float32)},
+        {"type": "dense", "activation": "sigmoid",
+         "W": rng.normal(size=(16, 1)).astype(np.float32), "b": np.zeros(1, np.float32)},
+    ])
+
+
+def test_batched_results_equal_single_predictions(model):
+    predict = lambda X: model.predict(X).ravel()  # noqa: E731
+    batcher = MicroBatcher(predict, max_batch_size=8, max_wait_ms=20)
+    features = np.random.default_rng(1).normal(size=(50, 32)).astype(np.float32)
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        outputs = list(pool.map(batcher.submit, features))
+
+    expected = [predict(row.reshape(1, -1))[0] for row in features]
+    np.testing.assert_allclose(outputs, expected, rtol=1e-6, atol=1e-7)
+    stats = batcher.stats()
+    assert stats["items"] == 50
+    # Request yang datang bersamaan benar-benar digabung, tidak melebihi batas batch
+    assert stats["batches"] < 50
+    assert stats["avg_batch_size"] <= 8
+
+
+def test_error_is_raised_in_every_waiting_request():
+    started = threading.Event()
+
+    def failing_predict(X):
+        started.set()
+        raise ValueError("model belum dimuat")
+
+    batcher = MicroBatcher(failing_predict, max_batch_size=4, max_wait_ms=20)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futures = [pool.submit(batcher.submit, np.zeros(3)) for _ in range(4)]
+        for future in futures:
+            with pytest.raises(ValueError, match="belum dimuat"):
+                future.result(timeout=5)
+    assert started.is_set() and batcher.stats()["batches"] == 0
+
+    # Batch berikutnya tetap diproses setelah error
+    batcher.predict_fn = lambda X: X.sum(axis=1)
+    assert batcher.submit(np.ones(3)) == 3.0
+
+
+class NotThreadSafeModel:
+    """Model palsu seperti Keras: mencatat jika predict dipanggil dari dua thread sekaligus"""
+    includes_scaler = True
+
+    def __init__(self):
+        self.active = 0
+        self.overlaps = 0
+        self.lock = threading.Lock()
+
+    def predict(self, X, batch_size=None, verbose=0):
+        with self.lock:
+            self.active += 1
+            self.overlaps += self.active > 1
+        time.sleep(0.002)
+        with self.lock:
+            self.active -= 1
+        return X.sum(axis=1, keepdims=True)
+
+
+def test_keras_predict_is_serialized_between_batcher_and_batch_route(monkeypatch):
+    monkeypatch.setenv("MODEL_LOAD_ON_IMPORT", "0")
+    import app
+
+    fake = NotThreadSafeModel()
+    monkeypatch.setattr(app, "model", fake)
+    batcher = MicroBatcher(app.predict_features, max_batch_size=4, max_wait_ms=1)
+    features = np.random.default_rng(2).normal(size=(40, 8))
+
+    # Thread micro-batcher (/predict) dan thread request /predict/batch berjalan bersamaan
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        singles = pool.map(batcher.submit, features)
+        batches = [pool.submit(app.predict_features, features[i:i + 5]) for i in range(0, 40, 5)]
+        np.testing.assert_allclose(list(singles), features.sum(axis=1))
+        np.testing.assert_allclose(np.concatenate([f.result() for f in batches]), features.sum(axis=1))
+    assert fake.overlaps == 0
@@ -0,0 +1,120 @@
+"""
+Test numpy_model: forward pass NumPy harus setara model Keras hasil export
+"""
+import json
+
+import numpy as np
+import pytest
+
+from numpy_model import FORMAT_VERSION, NumpyModel, _sigmoid
+
+
+def save_npz(path, spec, arrays):
+    np.savez(path, spec=np.array(json.dumps(spec)), **arrays)
+    return path
+
+
+@pytest.fixture(scope="module")
+def keras_model():
+    keras = pytest.importorskip("keras")
+    keras.utils.set_random_seed(0)
+    model = keras.Sequential([
+        keras.Input(shape=(24,)),
+        keras.layers.Dense(16, activation="relu"),
+        keras.layers.BatchNormalization(),
+        keras.layers.Dropout(0.5),
+        keras.layers.Dense(8, use_bias=False),
+        keras.layers.Activation("tanh"),
+        keras.layers.Dense(1, activation="sigmoid"),
+    ])
+    # Statistik BatchNormalization dibuat tidak trivial agar lipatan affine ikut teruji
+    bn = model.layers[1]
+    gamma, beta, mean, var = bn.get_weights()
+    rng = np.random.default_rng(0)
+    bn.set_weights([gamma * 1.5, beta + 0.2, rng.normal(size=mean.shape), rng.uniform(0.5, 2, size=var.shape)])
+    return model
+
+
+def test_predictions_match_keras(keras_model, tmp_path):
+    from export_numpy_model import export_layers
+
+    spec, arrays = export_layers(keras_model)
+    assert [layer["type"] for layer in spec["layers"]] == ["dense", "affine", "dense", "activation", "dense"]
+    model = NumpyModel.load(save_npz(tmp_path / "model.npz", spec, arrays))
+
+    X = np.random.default_rng(1).normal(size=(64, 24)).astype(np.float32) * 3
+    expected = keras_model.predict(X, verbose=0)
+    np.testing.assert_allclose(model.predict(X), expected, atol=1e-5)
+
+
+def test_rejects_unknown_format_version(tmp_path):
+    spec = {"version": FORMAT_VERSION + 1, "input_dim": 2, "layers": []}
+    path = save_npz(tmp_path / "model.npz", spec, {})
+    with pytest.raises(ValueError, match="Versi format"):
+        NumpyModel.load(path)
+
+
+def test_sigmoid_is_stable_for_extreme_logits():
+    x = np.array([-1000.0, -50.0, 0.0, 50.0, 1000.0], dtype=np.float32)
+    with np.errstate(over="raise"):
+        y = _sigmoid(x)
+    np.testing.assert_allclose(y, 1 / (1 + np.exp(-x.astype(np.float64).clip(-700, 700))), atol=1e-7)
+    assert y[0] == 0.0 and y[-1] == 1.0
+
+
+def random_model(n_in=24, seed=0):
+    rng = np.random.default_rng(seed)
+    return NumpyModel([
+        {"type": "dense", "activation": "relu",
+         "W": rng.normal(size=(n_in, 16)).astype(np.float32), "b": rng.normal(size=16).astype(np.float32)},
+        {"type": "affine", "scale": rng.uniform(0.5, 2, 16).astype(np.float32),
+         "shift": rng.normal(size=16).astype(np.float32)},
+        {"type": "dense", "activation": "sigmoid",
+         "W": rng.normal(size=(16, 1)).astype(np.float32), "b": np.zeros(1, np.float32)},
+    ])
+
+
+def test_folded_scaler_matches_transform_then_predict(tmp_path):
+    rng = np.random.default_rng(2)
+    model = random_model()
+    mean = rng.normal(size=24) * 5
+    scale = rng.uniform(0.1, 3, 24)
+    X = rng.normal(size=(64, 24)) * scale + mean
+
+    folded = model.fold_scaler(mean, scale)
+    folded.save_dir(tmp_path / "folded")
+    restored = NumpyModel.load(str(tmp_path / "folded"))
+
+    assert restored.includes_scaler
+    expected = model.predict((X - mean) / scale)
+    np.testing.assert_allclose(restored.predict(X), expected, atol=1e-5)
+    with pytest.raises(ValueError):
+        folded.fold_scaler(mean, scale)
+
+
+def test_save_dir_replaces_artifact_without_touching_mapped_files(tmp_path):
+    path = tmp_path / "folded"
+    random_model(seed=0).save_dir(path)
+    old = NumpyModel.load(str(path))
+    old_W = np.array(old.layers[0]["W"])
+
+    new_model = random_model(seed=1)
+    new_model.save_dir(path)
+
+    # Array lama yang di-memory-map tidak berubah, load baru melihat bobot baru
+    np.testing.assert_array_equal(old.layers[0]["W"], old_W)
+    np.testing.assert_array_equal(NumpyModel.load(str(path)).layers[0]["W"], new_model.layers[0]["W"])
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["folded"]
+
+
+def test_failed_save_keeps_previous_artifact(tmp_path):
+    path = tmp_path / "folded"
+    model = random_model()
+    model.save_dir(path)
+
+    broken = NumpyModel(model.layers + [{"type": "dense", "W": np.zeros((1, 1)), "activation": object()}])
+    with pytest.raises(TypeError):
+        broken.save_dir(path)
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["folded"]
+    np.testing.assert_array_equal(NumpyModel.load(str(path)).layers[0]["W"], model.layers[0]["W"])
@@ -0,0 +1,69 @@
+"""
+Test result_cache: exact hit, eviction LRU, dan near-duplicate lewat jarak dHash
+"""
+import cv2
+import numpy as np
+
+from result_cache import ResultCache, content_hash, dhash, hamming_distances
+
+
+def gradient_image(size=128):
+    yy, xx = np.mgrid[0:size, 0:size]
+    return ((np.sin(xx / 9.0) + np.cos(yy / 13.0)) * 60 + 128).astype(np.uint8)
+
+
+def test_exact_hit_and_lru_eviction():
+    cache = ResultCache(max_entries=2)
+    a, b, c = (content_hash(data) for data in (b"a", b"b", b"c"))
+    cache.put(a, ("Day", 0.9))
+    cache.put(b, ("Night", 0.8))
+
+    assert cache.get(a) == ("Day", 0.9)  # a jadi paling baru dipakai
+    cache.put(c, ("Day", 0.7))           # b yang dikeluarkan
+
+    assert cache.get(b) is None
+    assert cache.get(a) == ("Day", 0.9)
+    assert cache.get(c) == ("Day", 0.7)
+    stats = cache.stats()
+    assert (stats["size"], stats["evictions"]) == (2, 1)
+    assert (stats["exact_hits"], stats["misses"], stats["hit_rate"]) == (3, 1, 0.75)
+
+
+def test_disabled_cache_stores_nothing():
+    cache = ResultCache(max_entries=0)
+    cache.put(content_hash(b"a"), ("Day", 0.9))
+    assert cache.get(content_hash(b"a")) is None
+    assert not cache.enabled and cache.stats()["size"] == 0
+
+
+def test_dhash_is_robust_to_jpeg_reencode_and_resize():
+    image = gradient_image()
+    reencoded = cv2.imdecode(cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, 60])[1], 0)
+    resized = cv2.resize(image, (96, 96), interpolation=cv2.INTER_AREA)
+    other = gradient_image().T.copy()
+
+    h = dhash(image)
+    hashes = np.array([dhash(reencoded), dhash(resized), dhash(other)], dtype=np.uint64)
+    distances = hamming_distances(hashes, h)
+    assert distances[0] <= 4 and distances[1] <= 4
+    assert distances[2] > 10
+    # Popcount harus sama dengan hitungan bit biasa
+    assert distances.tolist() == [bin(int(x) ^ int(h)).count("1") for x in hashes]
+
+
+def test_near_duplicate_hit_within_max_distance():
+    cache = ResultCache(max_entries=2, max_distance=4)
+    image = gradient_image()
+    cache.put(content_hash(b"asli"), ("Day", 0.9), dhash(image))
+
+    jpeg = cv2.imdecode(cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, 50])[1], 0)
+    assert cache.get(content_hash(b"jpeg")) is None
+    assert cache.get_similar(dhash(jpeg)) == ("Day", 0.9)
+    assert cache.get_similar(dhash(gradient_image().T.copy())) is None
+
+    # Slot hash entry yang dikeluarkan tidak boleh lagi menghasilkan hit
+    cache.put(content_hash(b"b"), ("Night", 0.6), np.uint64(0))
+    cache.put(content_hash(b"c"), ("Night", 0.6), np.uint64(0))
+    assert cache.get_similar(dhash(jpeg)) is None
+    stats = cache.stats()
+    assert (stats["perceptual_hits"], stats["evictions"], stats["size"]) == (1, 1, 2)
@@ -0,0 +1,207 @@
+"""
+Benchmark per tahap pipeline prediksi: decode, resize, grayscale, HOG, scaler, predict
+
+Jalankan dari folder aplikasi (tanpa network, gambar sintetis dibuat di memori):
+    python tools/bench_pipeline.py --repeat 20 --output bench_results.json
+    python tools/bench_pipeline.py --output bench_new.json --baseline bench_results.json
+
+Model dan scaler di-load lewat app.py, sehingga MODEL_RUNTIME, HOG_IMPL, dan
+REDUCED_DECODE berlaku sama seperti saat serving. Untuk setiap format dan
+resolusi dicatat persentil waktu setiap tahap (single image), throughput, dan
+peak memori (tracemalloc, satu pass terpisah agar tidak memengaruhi timing).
+Tahap scaler + predict juga diukur untuk beberapa ukuran batch. Dengan
+--baseline, p50 setiap tahap dibandingkan dengan file hasil sebelumnya.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+RESOLUTIONS = ((320, 240), (640, 480), (1920, 1080), (4000, 3000))
+FORMATS = ('jpg', 'png')
+BATCH_SIZES = (1, 8, 32, 128)
+STAGES = ('decode', 'resize', 'gray', 'hog', 'scaler', 'predict')
+
+
+def synthetic_image(width, height, fmt, seed=0):
+    """Foto sintetis (noise yang di-blur + gradient) dalam bentuk bytes terenkode"""
+    rng = np.random.default_rng(seed)
+    small = cv2.GaussianBlur(rng.integers(0, 256, (120, 160, 3), dtype=np.uint8), (5, 5), 2)
+    img = cv2.resize(small, (width, height), interpolation=cv2.INTER_CUBIC)
+    ramp = np.linspace(0, 60, width, dtype=np.float32)[None, :, None]
+    img = np.clip(img + ramp, 0, 255).astype(np.uint8)
+    return cv2.imencode(f'.{fmt}', img)[1].tobytes()
+
+
+def run_stages(app, image_bytes, timings=None):
+    """Satu pass pipeline seperti preprocess_image + model.predict, dengan waktu per tahap"""
+    from preprocessing import IMAGE_SIZE, compute_hog, decode_image
+
+    marks = [time.perf_counter()]
+    img = decode_image(image_bytes)
+    marks.append(time.perf_counter())
+    img = cv2.resize(img, IMAGE_SIZE)
+    marks.append(time.perf_counter())
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    marks.append(time.perf_counter())
+    features = compute_hog(gray).reshape(1, -1)
+    marks.append(time.perf_counter())
+    X = app.scale_features(features)
+    marks.append(time.perf_counter())
+    app.model.predict(X, batch_size=1, verbose=0)
+    marks.append(time.perf_counter())
+
+    if timings is not None:
+        for stage, start, end in zip(STAGES, marks, marks[1:]):
+            timings[stage].append((end - start) * 1000)
+
+
+def percentiles(values):
+    values = np.asarray(values)
+    return {
+        "p50": float(np.percentile(values, 50)),
+        "p90": float(np.percentile(values, 90)),
+        "p99": float(np.percentile(values, 99)),
+        "mean": float(values.mean()),
+    }
+
+
+def bench_single(app, image_bytes, repeat):
+    run_stages(app, image_bytes)  # warm-up
+    timings = {stage: [] for stage in STAGES}
+    for _ in range(repeat):
+        run_stages(app, image_bytes, timings)
+    totals = np.sum([timings[stage] for stage in STAGES], axis=0)
+
+    tracemalloc.start()
+    run_stages(app, image_bytes)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "bytes": len(image_bytes),
+        "stages_ms": {stage: percentiles(timings[stage]) for stage in STAGES},
+        "total_ms": percentiles(totals),
+        "throughput_ips": float(1000 / np.median(totals)),
+        "peak_traced_mb": peak / (1024 * 1024),
+    }
+
+
+def bench_batch(app, features, batch_size, repeat):
+    """scaler + predict untuk matrix fitur (batch_size, n_fitur)"""
+    X_raw = np.repeat(features, batch_size, axis=0)
+    app.model.predict(app.scale_features(X_raw), batch_size=batch_size, verbose=0)  # warm-up
+    scaler_ms, predict_ms = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        X = app.scale_features(X_raw)
+        mid = time.perf_counter()
+        app.model.predict(X, batch_size=batch_size, verbose=0)
+        end = time.perf_counter()
+        scaler_ms.append((mid - start) * 1000)
+        predict_ms.append((end - mid) * 1000)
+    totals = np.add(scaler_ms, predict_ms)
+    return {
+        "stages_ms": {"scaler": percentiles(scaler_ms), "predict": percentiles(predict_ms)},
+        "total_ms": percentiles(totals),
+        "throughput_ips": float(batch_size * 1000 / np.median(totals)),
+    }
+
+
+def compare(results, baseline):
+    """Cetak p50 per tahap terhadap baseline (rasio < 1 berarti lebih cepat)"""
+    print(f"\nPerbandingan p50 dengan baseline ({baseline['meta'].get('created', '?')}):")
+    print(f"{'case':<16} {'stage':<8} {'baseline ms':>12} {'sekarang ms':>12} {'rasio':>7}")
+    for case, current in results['single'].items():
+        previous = baseline.get('single', {}).get(case)
+        if previous is None:
+            continue
+        for stage in (*STAGES, 'total'):
+            now = current['total_ms'] if stage == 'total' else current['stages_ms'][stage]
+            old = previous['total_ms'] if stage == 'total' else previous['stages_ms'].get(stage)
+            if old is None:
+                continue
+            ratio = now['p50'] / old['p50'] if old['p50'] else float('nan')
+            print(f"{case:<16} {stage:<8} {old['p50']:>12.3f} {now['p50']:>12.3f} {ratio:>6.2f}x")
+    for size, current in results['batch'].items():
+        previous = baseline.get('batch', {}).get(size)
+        if previous is None:
+            continue
+        old, now = previous['throughput_ips'], current['throughput_ips']
+        print(f"{'batch ' + size:<16} {'ips':<8} {old:>12.1f} {now:>12.1f} {now / old:>6.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per tahap pipeline day/night")
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--formats', nargs='+', default=list(FORMATS), choices=FORMATS)
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--baseline', help="File hasil sebelumnya untuk dibandingkan")
+    args = parser.parse_args()
+
+    os.chdir(APP_DIR)  # app.py me-load artifact model dengan path relatif
+    import app
+    import preprocessing
+    if app.model is None:
+        print("❌ Model gagal dimuat, benchmark tidak bisa dijalankan")
+        sys.exit(1)
+
+    results = {
+        "meta": {
+            "created": time.strftime('%Y-%m-%d %H:%M:%S'),
+            "model_runtime": type(app.model).__name__,
+            "includes_scaler": getattr(app.model, 'includes_scaler', False),
+            "hog_impl": preprocessing.HOG_IMPL,
+            "reduced_decode": preprocessing.REDUCED_DECODE,
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "opencv": cv2.__version__,
+            "cpus": os.cpu_count(),
+            "repeat": args.repeat,
+        },
+        "single": {},
+        "batch": {},
+    }
+
+    print(f"{'case':<16} {'KB':>7} " + ' '.join(f'{stage:>8}' for stage in STAGES)
+          + f" {'total':>8} {'p99':>8} {'img/s':>7} {'peak MB':>8}")
+    for fmt in args.formats:
+        for width, height in RESOLUTIONS:
+            case = f'{fmt}_{width}x{height}'
+            stats = bench_single(app, synthetic_image(width, height, fmt), args.repeat)
+            results['single'][case] = stats
+            print(f"{case:<16} {stats['bytes'] / 1024:>7.0f} "
+                  + ' '.join(f"{stats['stages_ms'][stage]['p50']:>8.3f}" for stage in STAGES)
+                  + f" {stats['total_ms']['p50']:>8.3f} {stats['total_ms']['p99']:>8.3f}"
+                  f" {stats['throughput_ips']:>7.1f} {stats['peak_traced_mb']:>8.1f}")
+
+    features = preprocessing.extract_features(synthetic_image(640, 480, 'jpg')).reshape(1, -1)
+    print(f"\n{'batch':>6} {'scaler ms':>10} {'predict ms':>11} {'img/s':>9}")
+    for batch_size in BATCH_SIZES:
+        stats = bench_batch(app, features, batch_size, args.repeat)
+        results['batch'][str(batch_size)] = stats
+        print(f"{batch_size:>6} {stats['stages_ms']['scaler']['p50']:>10.3f} "
+              f"{stats['stages_ms']['predict']['p50']:>11.3f} {stats['throughput_ips']:>9.1f}")
+
+    results['meta']['peak_rss_mb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nHasil disimpan ke {args.output} (peak RSS {results['meta']['peak_rss_mb']:.1f} MB)")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+"""
+Benchmark decode JPEG: full decode + resize vs reduced decode (DCT scaling) + resize
+
+Jalankan dari folder aplikasi:
+    python tools/benchmark_decode.py --repeat 10 --images /path/ke/foto_jpeg
+
+JPEG sintetis dibuat di memori pada beberapa resolusi. Untuk tiap resolusi
+diukur median waktu decode + resize ke IMAGE_SIZE, peak memori (tracemalloc,
+mencakup buffer NumPy hasil decode), dan selisih fitur HOG antara kedua mode.
+
+Reduced decode mengubah pixel dibanding pipeline training, jadi script juga
+memprediksi setiap JPEG (sintetis + --images) dengan model yang di-load lewat
+app.py dari hasil decode penuh dan reduced decode. Script keluar dengan status
+1 jika ada label day/night yang berbeda; REDUCED_DECODE=1 hanya diaktifkan
+jika pemeriksaan ini lolos pada sampel foto asli.
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from preprocessing import IMAGE_SIZE, compute_hog, jpeg_size, reduced_decode_flag  # noqa: E402
+
+RESOLUTIONS = ((640, 480), (1920, 1080), (4000, 3000))
+
+FLAG_NAMES = {
+    cv2.IMREAD_COLOR: 'full',
+    cv2.IMREAD_REDUCED_COLOR_2: '1/2',
+    cv2.IMREAD_REDUCED_COLOR_4: '1/4',
+    cv2.IMREAD_REDUCED_COLOR_8: '1/8',
+}
+
+
+def synthetic_jpeg(width, height, seed=0):
+    """Foto sintetis (gradient + noise yang di-blur) dalam bentuk bytes JPEG"""
+    rng = np.random.default_rng(seed)
+    small = cv2.GaussianBlur(rng.integers(0, 256, (120, 160, 3), dtype=np.uint8), (5, 5), 2)
+    img = cv2.resize(small, (width, height), interpolation=cv2.INTER_CUBIC)
+    ramp = np.linspace(0, 60, width, dtype=np.float32)[None, :, None]
+    img = np.clip(img + ramp, 0, 255).astype(np.uint8)
+    return cv2.imencode('.jpg', img, [cv2.IMWRITE_JPEG_QUALITY, 90])[1].tobytes()
+
+
+def decode_resize(image_bytes, flag):
+    img = cv2.imdecode(np.frombuffer(image_bytes, np.uint8), flag)
+    return cv2.resize(img, IMAGE_SIZE)
+
+
+def median_ms(image_bytes, flag, repeat):
+    decode_resize(image_bytes, flag)  # warm-up
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        decode_resize(image_bytes, flag)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings) * 1000)
+
+
+def peak_mb(image_bytes, flag):
+    tracemalloc.start()
+    decode_resize(image_bytes, flag)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / (1024 * 1024)
+
+
+def hog_of(img):
+    return compute_hog(cv2.cvtColor(img, cv2.COLOR_BGR2GRAY))
+
+
+def label_agreement(samples):
+    """Probabilitas Day dari decode penuh vs reduced decode untuk setiap JPEG besar"""
+    import app
+    if app.model is None:
+        print("❌ Model gagal dimuat, label tidak bisa dibandingkan")
+        sys.exit(1)
+    rows = []
+    for name, image_bytes in samples:
+        size = jpeg_size(image_bytes)
+        flag = reduced_decode_flag(*size) if size else cv2.IMREAD_COLOR
+        if flag == cv2.IMREAD_COLOR:
+            continue  # gambar kecil: reduced decode tidak dipakai
+        features = np.stack([hog_of(decode_resize(image_bytes, f)) for f in (cv2.IMREAD_COLOR, flag)])
+        full, reduced = app.predict_features(features)
+        rows.append((name, float(full), float(reduced)))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark full vs reduced JPEG decode")
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--images', help="Folder foto JPEG asli untuk cek kesamaan label")
+    args = parser.parse_args()
+
+    print(f"{'resolusi':<11} {'mode':>5} {'full ms':>8} {'reduced ms':>11} {'speedup':>8} "
+          f"{'full MB':>8} {'reduced MB':>11} {'HOG max diff':>13} {'HOG mean diff':>14}")
+    samples = []
+    for width, height in RESOLUTIONS:
+        image_bytes = synthetic_jpeg(width, height)
+        samples.append((f'sintetis {width}x{height}', image_bytes))
+        reduced_flag = reduced_decode_flag(width, height)
+
+        full_ms = median_ms(image_bytes, cv2.IMREAD_COLOR, args.repeat)
+        reduced_ms = median_ms(image_bytes, reduced_flag, args.repeat)
+        full_peak = peak_mb(image_bytes, cv2.IMREAD_COLOR)
+        reduced_peak = peak_mb(image_bytes, reduced_flag)
+        diff = np.abs(
+            hog_of(decode_resize(image_bytes, cv2.IMREAD_COLOR))
+            - hog_of(decode_resize(image_bytes, reduced_flag))
+        )
+
+        print(f"{f'{width}x{height}':<11} {FLAG_NAMES[reduced_flag]:>5} {full_ms:>8.2f} "
+              f"{reduced_ms:>11.2f} {full_ms / reduced_ms:>7.2f}x {full_peak:>8.1f} "
+              f"{reduced_peak:>11.1f} {diff.max():>13.3e} {diff.mean():>14.3e}")
+
+    if args.images:
+        for path in sorted(glob.glob(os.path.join(args.images, '**', '*'), recursive=True)):
+            if path.lower().endswith(('.jpg', '.jpeg')):
+                with open(path, 'rb') as f:
+                    samples.append((os.path.relpath(path, args.images), f.read()))
+
+    rows = label_agreement(samples)
+    flipped = [(name, full, reduced) for name, full, reduced in rows if (full > 0.5) != (reduced > 0.5)]
+    max_diff = max((abs(full - reduced) for _, full, reduced in rows), default=0.0)
+    print(f"\nLabel dibandingkan: {len(rows)} JPEG, selisih probabilitas maksimum {max_diff:.3e}")
+    for name, full, reduced in flipped:
+        print(f"  {name}: full {full:.3f} vs reduced {reduced:.3f}")
+    if flipped:
+        print(f"❌ {len(flipped)} label berbeda; biarkan REDUCED_DECODE=0")
+        sys.exit(1)
+    print("✅ Semua label sama antara decode penuh dan reduced decode")
+
+
+if __name__ == '__main__':
+    main()
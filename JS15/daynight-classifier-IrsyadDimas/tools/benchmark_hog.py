@@ -0,0 +1,98 @@
+"""
+Benchmark & cek kesetaraan HOG: skimage vs hog_fast (NumPy)
+
+Jalankan dari folder aplikasi:
+    python tools/benchmark_hog.py --images 50 --repeat 5 --tolerance 1e-6
+
+Gambar sintetis (noise, gradient, blur, dan foto JPEG yang di-resize) dibuat di
+memori sehingga tidak perlu dataset. Script keluar dengan status 1 jika selisih
+maksimum fitur melebihi tolerance.
+"""
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from preprocessing import IMAGE_SIZE, hog_skimage, hog_numpy  # noqa: E402
+
+
+def synthetic_grays(n, seed=0):
+    """Buat n gambar grayscale 256x256 dengan karakteristik berbeda"""
+    rng = np.random.default_rng(seed)
+    images = []
+    for i in range(n):
+        kind = i % 4
+        if kind == 0:
+            gray = rng.integers(0, 256, IMAGE_SIZE, dtype=np.uint8)
+        elif kind == 1:
+            ramp = np.linspace(0, 255, IMAGE_SIZE[1])
+            angle = rng.uniform(0, np.pi)
+            yy, xx = np.mgrid[0:IMAGE_SIZE[0], 0:IMAGE_SIZE[1]]
+            gray = ((xx * np.cos(angle) + yy * np.sin(angle)) % 256).astype(np.uint8)
+            gray = np.maximum(gray, ramp.astype(np.uint8)[None, :] // 2)
+        elif kind == 2:
+            noise = rng.integers(0, 256, IMAGE_SIZE, dtype=np.uint8)
+            gray = cv2.GaussianBlur(noise, (9, 9), 3)
+        else:
+            photo = rng.integers(0, 256, (1080, 1920, 3), dtype=np.uint8)
+            photo = cv2.GaussianBlur(photo, (15, 15), 5)
+            encoded = cv2.imencode('.jpg', photo)[1]
+            img = cv2.resize(cv2.imdecode(encoded, cv2.IMREAD_COLOR), IMAGE_SIZE)
+            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        images.append(gray)
+    return images
+
+
+def time_per_image(fn, images, repeat):
+    """Waktu per gambar (ms) untuk setiap pengulangan"""
+    fn(images[0])  # warm-up
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for gray in images:
+            fn(gray)
+        timings.append((time.perf_counter() - start) / len(images) * 1000)
+    return np.array(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HOG skimage vs NumPy")
+    parser.add_argument('--images', type=int, default=40)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--tolerance', type=float, default=1e-6)
+    args = parser.parse_args()
+
+    images = synthetic_grays(args.images)
+
+    max_diff = 0.0
+    for gray in images:
+        reference = hog_skimage(gray)
+        fast = hog_numpy(gray)
+        if reference.shape != fast.shape:
+            print(f"❌ Shape berbeda: {reference.shape} vs {fast.shape}")
+            sys.exit(1)
+        max_diff = max(max_diff, float(np.abs(reference - fast).max()))
+
+    sk_ms = time_per_image(hog_skimage, images, args.repeat)
+    np_ms = time_per_image(hog_numpy, images, args.repeat)
+
+    print(f"Gambar: {args.images} x {IMAGE_SIZE[0]}x{IMAGE_SIZE[1]}, repeat: {args.repeat}")
+    print(f"{'impl':<10} {'median ms':>10} {'min ms':>10}")
+    print(f"{'skimage':<10} {np.median(sk_ms):>10.3f} {sk_ms.min():>10.3f}")
+    print(f"{'numpy':<10} {np.median(np_ms):>10.3f} {np_ms.min():>10.3f}")
+    print(f"Speedup: {np.median(sk_ms) / np.median(np_ms):.2f}x")
+    print(f"Selisih maksimum fitur: {max_diff:.3e} (tolerance {args.tolerance:.0e})")
+
+    if max_diff > args.tolerance:
+        print("❌ Output hog_fast di luar tolerance")
+        sys.exit(1)
+    print("✅ Output hog_fast sesuai skimage")
+
+
+if __name__ == '__main__':
+    main()
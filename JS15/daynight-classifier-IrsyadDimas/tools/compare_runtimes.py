@@ -0,0 +1,93 @@
+"""
+Bandingkan runtime model Keras vs NumPy: waktu startup, RSS, dan latency prediksi
+
+Jalankan dari folder aplikasi (butuh day_night_model.h5, day_night_model.npz,
+dan day_night_model_folded/):
+    python tools/compare_runtimes.py --repeat 3
+
+Setiap pengukuran dijalankan di proses Python baru dengan MODEL_RUNTIME berbeda,
+sehingga waktu import (Flask, TensorFlow) dan memori terhitung seperti saat
+container start.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD_SCRIPT = r"""
+import json, resource, time
+start = time.perf_counter()
+import app
+startup = time.perf_counter() - start
+
+import cv2
+import numpy as np
+img = cv2.GaussianBlur(np.random.default_rng(0).integers(0, 256, (480, 640, 3), dtype=np.uint8), (7, 7), 2)
+image_bytes = cv2.imencode('.jpg', img)[1].tobytes()
+app.model.predict(app.preprocess_image(image_bytes), verbose=0)
+latencies = []
+for _ in range(20):
+    t = time.perf_counter()
+    x = app.preprocess_image(image_bytes)
+    app.model.predict(x, verbose=0)
+    latencies.append(time.perf_counter() - t)
+
+rss_kb = None
+with open('/proc/self/status') as f:
+    for line in f:
+        if line.startswith('VmRSS:'):
+            rss_kb = int(line.split()[1])
+print(json.dumps({
+    "runtime": type(app.model).__name__,
+    "includes_scaler": getattr(app.model, 'includes_scaler', False),
+    "startup_s": startup,
+    "rss_mb": (rss_kb or 0) / 1024,
+    "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "predict_ms": float(np.median(latencies) * 1000),
+}))
+"""
+
+
+def measure(runtime):
+    env = dict(os.environ, MODEL_RUNTIME=runtime, TF_CPP_MIN_LOG_LEVEL='3')
+    proc = subprocess.run(
+        [sys.executable, '-c', CHILD_SCRIPT],
+        cwd=APP_DIR, env=env, capture_output=True, text=True, check=True
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bandingkan runtime Keras vs NumPy")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--runtimes', nargs='+', default=['keras', 'numpy', 'folded'],
+                        choices=['keras', 'numpy', 'folded'])
+    parser.add_argument('--output', help="Simpan hasil ke file JSON (optional)")
+    args = parser.parse_args()
+
+    summary = {}
+    for runtime in args.runtimes:
+        runs = [measure(runtime) for _ in range(args.repeat)]
+        summary[runtime] = {
+            key: float(np.median([run[key] for run in runs]))
+            for key in ('startup_s', 'rss_mb', 'peak_rss_mb', 'predict_ms')
+        }
+
+    # predict ms = preprocess_image (HOG + scaler) + model.predict untuk satu gambar
+    print(f"{'runtime':<8} {'startup s':>10} {'RSS MB':>8} {'peak MB':>8} {'predict ms':>11}")
+    for runtime, stats in summary.items():
+        print(f"{runtime:<8} {stats['startup_s']:>10.2f} {stats['rss_mb']:>8.1f} "
+              f"{stats['peak_rss_mb']:>8.1f} {stats['predict_ms']:>11.3f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""
+Export bobot model Keras (day_night_model.h5) ke artifact NumPy (.npz)
+
+Jalankan dari folder aplikasi (butuh TensorFlow, hanya untuk export):
+    python tools/export_numpy_model.py --model day_night_model.h5 --output day_night_model.npz
+
+Setelah export, output NumpyModel dibandingkan dengan model.predict pada fitur
+HOG dari gambar sintetis (sudah di-scaler) dan input acak. Script keluar
+dengan status 1 jika selisih maksimum melebihi tolerance.
+"""
+import argparse
+import json
+import os
+import pickle
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from numpy_model import FORMAT_VERSION, ACTIVATIONS, NumpyModel  # noqa: E402
+
+
+def _activation_name(layer):
+    name = layer.get_config().get('activation', 'linear')
+    if name not in ACTIVATIONS:
+        raise ValueError(f"Aktivasi '{name}' pada layer {layer.name} belum didukung")
+    return name
+
+
+def export_layers(model):
+    """Konversi layer Keras menjadi (spec, arrays) untuk NumpyModel"""
+    layers, arrays = [], {}
+    for layer in model.layers:
+        kind = type(layer).__name__
+        if kind in ('InputLayer', 'Dropout'):
+            continue
+
+        index = len(layers)
+        if kind == 'Dense':
+            weights = layer.get_weights()
+            arrays[f'layer{index}_W'] = weights[0].astype(np.float32)
+            names = ['W']
+            if layer.get_config().get('use_bias', True):
+                arrays[f'layer{index}_b'] = weights[1].astype(np.float32)
+                names.append('b')
+            layers.append({'type': 'dense', 'activation': _activation_name(layer), 'arrays': names})
+        elif kind == 'BatchNormalization':
+            config = layer.get_config()
+            weights = list(layer.get_weights())
+            gamma = weights.pop(0) if config.get('scale', True) else 1.0
+            beta = weights.pop(0) if config.get('center', True) else 0.0
+            moving_mean, moving_var = weights
+            # Lipat BatchNormalization (mode inference) menjadi x * scale + shift
+            scale = gamma / np.sqrt(moving_var + config['epsilon'])
+            arrays[f'layer{index}_scale'] = scale.astype(np.float32)
+            arrays[f'layer{index}_shift'] = (beta - moving_mean * scale).astype(np.float32)
+            layers.append({'type': 'affine', 'arrays': ['scale', 'shift']})
+        elif kind == 'Activation':
+            layers.append({'type': 'activation', 'activation': _activation_name(layer)})
+        elif kind == 'Flatten':
+            layers.append({'type': 'flatten'})
+        else:
+            raise ValueError(f"Layer {layer.name} ({kind}) belum didukung oleh NumpyModel")
+
+    spec = {'version': FORMAT_VERSION, 'input_dim': int(model.input_shape[-1]), 'layers': layers}
+    return spec, arrays
+
+
+def validation_inputs(scaler_path, n_random, seed=0):
+    """Fitur HOG (sudah di-scaler) dari gambar sintetis + input acak"""
+    import cv2
+    from preprocessing import extract_features
+
+    rng = np.random.default_rng(seed)
+    images = []
+    for i in range(8):
+        img = rng.integers(0, 256, (240 + 40 * i, 320, 3), dtype=np.uint8)
+        img = cv2.GaussianBlur(img, (7, 7), 1 + i)
+        images.append(cv2.imencode('.jpg', img)[1].tobytes())
+    features = np.stack([extract_features(b) for b in images])
+    with open(scaler_path, 'rb') as f:
+        scaler = pickle.load(f)
+    X_real = scaler.transform(features)
+    X_random = rng.normal(size=(n_random, X_real.shape[1]))
+    return np.vstack([X_real, X_random]).astype(np.float32)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export model Keras ke NumPy")
+    parser.add_argument('--model', default='day_night_model.h5')
+    parser.add_argument('--output', default='day_night_model.npz')
+    parser.add_argument('--scaler', default='scaler.pkl')
+    parser.add_argument('--samples', type=int, default=64, help="Jumlah input acak untuk validasi")
+    parser.add_argument('--tolerance', type=float, default=1e-5)
+    args = parser.parse_args()
+
+    import keras
+
+    model = keras.models.load_model(args.model)
+    spec, arrays = export_layers(model)
+    np.savez(args.output, spec=np.array(json.dumps(spec)), **arrays)
+
+    numpy_model = NumpyModel.load(args.output)
+    X = validation_inputs(args.scaler, args.samples)
+    expected = model.predict(X, batch_size=len(X), verbose=0)
+    actual = numpy_model.predict(X)
+    max_diff = float(np.abs(expected - actual).max())
+
+    size_kb = os.path.getsize(args.output) / 1024
+    print(f"Layer: {', '.join(layer['type'] for layer in spec['layers'])}")
+    print(f"Artifact: {args.output} ({size_kb:.1f} KB)")
+    print(f"Selisih maksimum vs model.predict: {max_diff:.3e} (tolerance {args.tolerance:.0e}, {len(X)} sample)")
+    if max_diff > args.tolerance:
+        print("❌ Output NumpyModel di luar tolerance")
+        sys.exit(1)
+    print("✅ Output NumpyModel sesuai model Keras")
+
+
+if __name__ == '__main__':
+    main()
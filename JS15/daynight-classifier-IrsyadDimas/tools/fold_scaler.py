@@ -0,0 +1,75 @@
+"""
+Lipat scaler.pkl ke layer dense pertama dan simpan sebagai artifact memory-mappable
+
+Jalankan dari folder aplikasi (tidak butuh TensorFlow):
+    python tools/fold_scaler.py --model day_night_model.npz --scaler scaler.pkl \
+        --output day_night_model_folded
+
+Hasilnya directory berisi satu file .npy per array dan manifest.json. app.py
+memuatnya dengan mmap_mode='r' dan melewati scaler.transform. Output model
+hasil lipatan dibandingkan dengan model.predict(scaler.transform(x)) pada fitur
+HOG dari gambar sintetis; script keluar dengan status 1 jika selisih melebihi
+tolerance.
+"""
+import argparse
+import os
+import pickle
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from numpy_model import NumpyModel  # noqa: E402
+
+
+def synthetic_features(n, seed=0):
+    """Fitur HOG mentah dari gambar sintetis"""
+    import cv2
+    from preprocessing import extract_features
+
+    rng = np.random.default_rng(seed)
+    features = []
+    for i in range(n):
+        img = rng.integers(0, 256, (240 + 16 * i, 320, 3), dtype=np.uint8)
+        img = cv2.GaussianBlur(img, (7, 7), 1 + i % 5)
+        features.append(extract_features(cv2.imencode('.jpg', img)[1].tobytes()))
+    return np.stack(features)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lipat StandardScaler ke model NumPy")
+    parser.add_argument('--model', default='day_night_model.npz')
+    parser.add_argument('--scaler', default='scaler.pkl')
+    parser.add_argument('--output', default='day_night_model_folded')
+    parser.add_argument('--samples', type=int, default=32)
+    parser.add_argument('--tolerance', type=float, default=1e-5)
+    args = parser.parse_args()
+
+    model = NumpyModel.load(args.model)
+    with open(args.scaler, 'rb') as f:
+        scaler = pickle.load(f)
+
+    folded = model.fold_scaler(scaler.mean_, scaler.scale_)
+    folded.save_dir(args.output)
+    folded = NumpyModel.load(args.output)
+
+    X = synthetic_features(args.samples)
+    expected = model.predict(scaler.transform(X))
+    actual = folded.predict(X)
+    max_diff = float(np.abs(expected - actual).max())
+
+    size_kb = sum(
+        os.path.getsize(os.path.join(args.output, name)) for name in os.listdir(args.output)
+    ) / 1024
+    print(f"Artifact: {args.output}/ ({size_kb:.1f} KB)")
+    print(f"Selisih maksimum vs scaler.transform + model: {max_diff:.3e} "
+          f"(tolerance {args.tolerance:.0e}, {len(X)} sample)")
+    if max_diff > args.tolerance:
+        print("❌ Output model hasil lipatan di luar tolerance")
+        sys.exit(1)
+    print("✅ Scaler berhasil dilipat ke layer pertama")
+
+
+if __name__ == '__main__':
+    main()
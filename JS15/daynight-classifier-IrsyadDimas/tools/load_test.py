@@ -0,0 +1,116 @@
+"""
+Load test endpoint /predict: throughput dan latency (p50/p99) pada beberapa level concurrency
+
+Jalankan server terlebih dahulu, misalnya:
+    gunicorn -c gunicorn.conf.py app:app
+lalu dari folder aplikasi:
+    python tools/load_test.py --url http://localhost:7860 --concurrency 1 4 16 32 --requests 200
+
+Gambar JPEG sintetis dibuat di memori. Secara default setiap request diberi byte
+unik setelah marker EOI JPEG (gambar ter-decode sama persis, tapi hash isinya
+berbeda) sehingga result cache tidak ikut terukur; pakai --allow-cache untuk
+mengirim byte yang sama berulang kali.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import urllib.request
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+
+
+def synthetic_jpegs(n, seed=0):
+    rng = np.random.default_rng(seed)
+    images = []
+    for _ in range(n):
+        small = cv2.GaussianBlur(rng.integers(0, 256, (60, 80, 3), dtype=np.uint8), (5, 5), 2)
+        img = cv2.resize(small, (1280, 960), interpolation=cv2.INTER_CUBIC)
+        images.append(cv2.imencode('.jpg', img, [cv2.IMWRITE_JPEG_QUALITY, 90])[1].tobytes())
+    return images
+
+
+def multipart(field, filename, data):
+    boundary = uuid.uuid4().hex
+    body = (
+        f'--{boundary}\r\n'
+        f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+        'Content-Type: image/jpeg\r\n\r\n'
+    ).encode() + data + f'\r\n--{boundary}--\r\n'.encode()
+    return body, f'multipart/form-data; boundary={boundary}'
+
+
+def send(url, image_bytes):
+    body, content_type = multipart('file', 'load_test.jpg', image_bytes)
+    req = urllib.request.Request(f'{url}/predict', data=body, headers={'Content-Type': content_type})
+    start = time.perf_counter()
+    with urllib.request.urlopen(req, timeout=60) as resp:
+        ok = resp.status == 200 and not resp.read().startswith(b'Error')
+    return time.perf_counter() - start, ok
+
+
+def run_level(url, images, concurrency, n_requests, allow_cache):
+    payloads = []
+    for i in range(n_requests):
+        data = images[i % len(images)]
+        # Byte setelah EOI diabaikan decoder tapi mengubah hash isi file
+        payloads.append(data if allow_cache else data + f'load-test-{uuid.uuid4().hex}'.encode())
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(lambda payload: send(url, payload), payloads))
+    elapsed = time.perf_counter() - start
+
+    latencies = np.array([latency for latency, _ in results]) * 1000
+    return {
+        "concurrency": concurrency,
+        "requests": n_requests,
+        "errors": sum(not ok for _, ok in results),
+        "throughput_rps": n_requests / elapsed,
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p99_ms": float(np.percentile(latencies, 99)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test endpoint /predict")
+    parser.add_argument('--url', default=os.environ.get('LOAD_TEST_URL', 'http://localhost:7860'))
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16, 32])
+    parser.add_argument('--requests', type=int, default=200, help="Jumlah request per level")
+    parser.add_argument('--images', type=int, default=16, help="Jumlah gambar sintetis berbeda")
+    parser.add_argument('--allow-cache', action='store_true')
+    parser.add_argument('--output', help="Simpan hasil ke file JSON (optional)")
+    args = parser.parse_args()
+
+    url = args.url.rstrip('/')
+    images = synthetic_jpegs(args.images)
+    send(url, images[0])  # warm-up
+
+    summary = []
+    print(f"{'concurrency':>11} {'rps':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for concurrency in args.concurrency:
+        stats = run_level(url, images, concurrency, args.requests, args.allow_cache)
+        summary.append(stats)
+        print(f"{concurrency:>11} {stats['throughput_rps']:>8.1f} {stats['p50_ms']:>8.1f} "
+              f"{stats['p99_ms']:>8.1f} {stats['errors']:>7}")
+
+    try:
+        with urllib.request.urlopen(f'{url}/batcher/stats', timeout=10) as resp:
+            batcher = json.load(resp)['data']
+        # Statistik dari satu worker saja (worker yang kebetulan melayani request ini)
+        print(f"Micro-batcher (1 worker): {batcher['batches']} batch, "
+              f"rata-rata {batcher['avg_batch_size']} gambar/batch")
+    except Exception as e:
+        print(f"Statistik micro-batcher tidak tersedia: {e}", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,32 +1,96 @@
-"""
-Configuration file for FastAPI EWS application
-"""
-from pydantic_settings import BaseSettings
-from pathlib import Path
-
-
-class Settings(BaseSettings):
-    """Application settings"""
-    
-    # API Settings
-    APP_NAME: str = "Early Warning System API"
-    APP_VERSION: str = "1.0.0"
-    APP_DESCRIPTION: str = "API untuk prediksi risiko keterlambatan pembayaran"
-    
-    # Model Settings
-    MODEL_DIR: Path = Path("models_ews")
-    
-    # CORS Settings
-    CORS_ORIGINS: list = ["*"]
-    
-    # Risk Thresholds
-    RISK_THRESHOLD_LOW: float = 20.0
-    RISK_THRESHOLD_MEDIUM: float = 50.0
-    RISK_THRESHOLD_HIGH: float = 75.0
-    
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
-
-
+"""
+Configuration file for FastAPI EWS application
+"""
+from pydantic_settings import BaseSettings
+from pathlib import Path
+
+
+class Settings(BaseSettings):
+    """Application settings"""
+    
+    # API Settings
+    APP_NAME: str = "Early Warning System API"
+    APP_VERSION: str = "1.0.0"
+    APP_DESCRIPTION: str = "API untuk prediksi risiko keterlambatan pembayaran"
+    
+    # Model Settings
+    MODEL_DIR: Path = Path("models_ews")
+    MODEL_FORMAT: str = "sklearn"  # "sklearn" (pickle) atau "compact" (hasil export_compact_models)
+    
+    # CORS Settings
+    CORS_ORIGINS: list = ["*"]
+    
+    # Risk Thresholds
+    RISK_THRESHOLD_LOW: float = 20.0
+    RISK_THRESHOLD_MEDIUM: float = 50.0
+    RISK_THRESHOLD_HIGH: float = 75.0
+    
+    # Feature Store Settings
+    FEATURE_STORE_DIR: Path = Path("feature_store")
+    FEATURE_STORE_SNAPSHOT_INTERVAL: int = 60  # detik
+    FEATURE_STORE_REORDER_WINDOW: int = 64  # timestamp terakhir per entity untuk event yang datang terlambat
+    FEATURE_TIMEZONE_OFFSET_HOURS: int = 7  # WIB; zona waktu tanggal transaksi di data training
+    ACTIVITY_MAX_ENTITIES: int = 5_000_000
+    ACTIVITY_MAX_FUTURE_MONTHS: int = 1  # event lebih jauh di depan jam dinding ditolak
+    
+    # Drift Monitor Settings
+    DRIFT_MONITOR_ENABLED: bool = True
+    DRIFT_BATCH_SIZE: int = 256
+    DRIFT_SKETCH_BINS: int = 64
+    DRIFT_Z_THRESHOLD: float = 3.0
+    DRIFT_OUT_OF_RANGE_THRESHOLD: float = 0.05
+    
+    # Logging Settings
+    LOG_LEVEL: str = "INFO"
+    LOG_JSON: bool = True
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_SAMPLE_RATES: dict = {
+        "/predict": 0.1,
+        "/predict/verbose": 0.1,
+        "/features/events": 0.1,
+    }
+    
+    # Admission Control Settings
+    ADMISSION_ENABLED: bool = True
+    ADMISSION_MAX_CONCURRENCY: int = 32
+    ADMISSION_LOW_PRIORITY_SHARE: float = 0.5
+    ADMISSION_LATENCY_TARGET_MS: float = 250.0
+    ADMISSION_HIGH_LATENCY_FACTOR: float = 2.0
+    ADMISSION_LATENCY_HALF_LIFE: float = 2.0  # detik tanpa sample sampai EWMA tinggal separuh
+    ADMISSION_PROBE_INTERVAL: float = 1.0  # detik antar probe saat kelas sedang di-shed
+    ADMISSION_ROUTE_PRIORITIES: dict = {
+        "/predict": "high",
+        "/predict/verbose": "low",
+        "/features/events": "low",
+        "/jobs": "low",
+        "/jobs/upload": "low",
+    }
+    
+    # Background Job Settings
+    JOB_DIR: Path = Path("jobs")
+    JOB_MAX_CONCURRENT: int = 2
+    JOB_MAX_ITEMS: int = 1_000_000  # upload CSV (divalidasi di worker process)
+    JOB_MAX_JSON_ITEMS: int = 10_000  # body JSON (divalidasi di proses server)
+    JOB_MAX_UPLOAD_MB: int = 200
+    JOB_HEARTBEAT_INTERVAL: float = 10.0  # detik
+    JOB_STALE_AFTER: float = 60.0  # detik tanpa heartbeat sebelum job pemiliknya dianggap terputus
+    JOB_TTL_HOURS: float = 24.0  # job completed/failed dihapus setelah ini
+    JOB_CHUNK_SIZE: int = 1000
+    JOB_WORKER_NICE: int = 10
+    JOB_WORKER_THREADS: int = 1
+    
+    # Audit Log Settings (keputusan risiko, di-flush batch ke SQLite)
+    AUDIT_ENABLED: bool = True
+    AUDIT_DB_PATH: Path = Path("audit/audit_log.db")
+    AUDIT_FLUSH_INTERVAL: float = 2.0  # detik
+    AUDIT_BATCH_SIZE: int = 500
+    AUDIT_MAX_BUFFER: int = 50_000
+    AUDIT_RETRY_BASE_DELAY: float = 0.5  # detik, digandakan setiap write gagal
+    AUDIT_RETRY_MAX_DELAY: float = 30.0
+    
+    class Config:
+        env_file = ".env"
+        case_sensitive = True
+
+
 settings = Settings()
\ No newline at end of file
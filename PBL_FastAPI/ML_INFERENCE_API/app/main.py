@@ -1,274 +1,653 @@
-"""
-FastAPI Main Application
-Early Warning System untuk Prediksi Risiko Keterlambatan Pembayaran
-"""
-from fastapi import FastAPI, HTTPException, status
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from datetime import datetime
-import logging
-
-from app.config import settings
-from app.models.schemas import (
-    PredictionRequest,
-    PredictionResponse,
-    ErrorResponse,
-    HealthResponse
-)
-from app.services.model_loader import model_loader
-from app.services.predictor import predictor
-from app.utils.risk_analyzer import risk_analyzer
-
-# Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
-logger = logging.getLogger(__name__)
-
-# Initialize FastAPI app
-app = FastAPI(
-    title=settings.APP_NAME,
-    version=settings.APP_VERSION,
-    description=settings.APP_DESCRIPTION,
-    docs_url="/docs",
-    redoc_url="/redoc"
-)
-
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.CORS_ORIGINS,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-
-# ==================== STARTUP & SHUTDOWN EVENTS ====================
-
-@app.on_event("startup")
-async def startup_event():
-    """Load models saat aplikasi startup"""
-    try:
-        logger.info("🚀 Starting application...")
-        logger.info("📦 Loading ML models...")
-        model_loader.load_models()
-        logger.info("✅ Models loaded successfully!")
-    except Exception as e:
-        logger.error(f"❌ Failed to load models: {e}")
-        raise
-
-
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Cleanup saat aplikasi shutdown"""
-    logger.info("👋 Shutting down application...")
-
-
-# ==================== EXCEPTION HANDLERS ====================
-
-@app.exception_handler(HTTPException)
-async def http_exception_handler(request, exc):
-    """Handler untuk HTTP exceptions"""
-    return JSONResponse(
-        status_code=exc.status_code,
-        content={
-            "success": False,
-            "error": exc.detail
-        }
-    )
-
-
-@app.exception_handler(Exception)
-async def general_exception_handler(request, exc):
-    """Handler untuk general exceptions"""
-    logger.error(f"Unhandled exception: {exc}")
-    return JSONResponse(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        content={
-            "success": False,
-            "error": "Internal server error",
-            "detail": str(exc)
-        }
-    )
-
-
-# ==================== ROUTES ====================
-
-@app.get("/", tags=["Root"])
-async def root():
-    """Root endpoint"""
-    return {
-        "message": "Welcome to Early Warning System API",
-        "version": settings.APP_VERSION,
-        "docs": "/docs"
-    }
-
-
-@app.get("/health", response_model=HealthResponse, tags=["Health"])
-async def health_check():
-    """Health check endpoint"""
-    return {
-        "status": "healthy",
-        "timestamp": datetime.now().isoformat(),
-        "models_loaded": model_loader.is_loaded()
-    }
-
-
-@app.post(
-    "/predict",
-    response_model=PredictionResponse,
-    responses={
-        400: {"model": ErrorResponse},
-        500: {"model": ErrorResponse}
-    },
-    tags=["Prediction"]
-)
-async def predict_risk(request: PredictionRequest):
-    """
-    Endpoint untuk prediksi risiko keterlambatan pembayaran.
-    
-    ### Parameters:
-    - **tanggal**: Tanggal transaksi (format: YYYY-MM-DD)
-    - **nominal**: Nominal transaksi dalam Rupiah (harus > 0)
-    - **target_type**: Tipe target pengiriman (broadcast/rt_tertentu)
-    - **rt_number**: Nomor RT (wajib jika target_type = rt_tertentu)
-    
-    ### Returns:
-    - **risk_score**: Score risiko (0-100)
-    - **risk_category**: Kategori risiko dan rekomendasi
-    """
-    try:
-        # Check if models are loaded
-        if not model_loader.is_loaded():
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail="Models belum siap. Silakan coba lagi."
-            )
-        
-        # Perform prediction
-        prediction_result = predictor.predict(
-            tanggal=request.tanggal,
-            nominal=request.nominal,
-            verbose=False  # Set True jika ingin detail per level
-        )
-        
-        # Format result
-        formatted_result = risk_analyzer.format_result(
-            tanggal=request.tanggal,
-            nominal=request.nominal,
-            target_type=request.target_type,
-            rt_number=request.rt_number or "",
-            risk_score=prediction_result["risk_score"],
-            details=prediction_result.get("details")
-        )
-        
-        logger.info(
-            f"Prediction successful - Date: {request.tanggal}, "
-            f"Nominal: {request.nominal}, Risk: {formatted_result['risk_score']}%"
-        )
-        
-        return {
-            "success": True,
-            "data": formatted_result
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Prediction error: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Gagal melakukan prediksi: {str(e)}"
-        )
-
-
-@app.post(
-    "/predict/verbose",
-    response_model=PredictionResponse,
-    tags=["Prediction"]
-)
-async def predict_risk_verbose(request: PredictionRequest):
-    """
-    Endpoint untuk prediksi dengan detail per level model.
-    Sama seperti /predict tetapi mengembalikan detail prediksi per level.
-    """
-    try:
-        if not model_loader.is_loaded():
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail="Models belum siap. Silakan coba lagi."
-            )
-        
-        # Perform prediction with verbose=True
-        prediction_result = predictor.predict(
-            tanggal=request.tanggal,
-            nominal=request.nominal,
-            verbose=True
-        )
-        
-        # Format result
-        formatted_result = risk_analyzer.format_result(
-            tanggal=request.tanggal,
-            nominal=request.nominal,
-            target_type=request.target_type,
-            rt_number=request.rt_number or "",
-            risk_score=prediction_result["risk_score"],
-            details=prediction_result.get("details")
-        )
-        
-        return {
-            "success": True,
-            "data": formatted_result
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Prediction error: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Gagal melakukan prediksi: {str(e)}"
-        )
-
-
-@app.get("/models/info", tags=["Models"])
-async def get_models_info():
-    """Get informasi tentang models yang di-load"""
-    try:
-        if not model_loader.is_loaded():
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail="Models belum di-load"
-            )
-        
-        return {
-            "success": True,
-            "data": {
-                "level0_models": list(model_loader.get_level0_models().keys()),
-                "level1_models": list(model_loader.get_level1_models().keys()),
-                "total_features": len(model_loader.get_feature_columns()),
-                "feature_columns": model_loader.get_feature_columns()
-            }
-        }
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(e)
-        )
-
-
-# ==================== RUN APPLICATION ====================
-
-if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(
-        "app.main:app",
-        host="0.0.0.0",
-        port=8080,
-        reload=True,
-        log_level="info"
+"""
+FastAPI Main Application
+Early Warning System untuk Prediksi Risiko Keterlambatan Pembayaran
+"""
+from fastapi import FastAPI, HTTPException, Query, Request, UploadFile, File, status
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, FileResponse
+from datetime import datetime
+from pydantic import ValidationError
+import asyncio
+import logging
+
+from app.config import settings
+from app.models.schemas import (
+    PredictionRequest,
+    PredictionResponse,
+    ErrorResponse,
+    HealthResponse,
+    TransactionEventBatch,
+    JobRequest
+)
+from app.services.model_loader import model_loader
+from app.services.feature_store import feature_store
+from app.services.activity_counter import activity_counter
+from app.services.drift_monitor import drift_monitor
+from app.services.predictor import predictor
+from app.services.job_manager import job_manager, STATUS_COMPLETED, UploadTooLargeError
+from app.services.audit_log import audit_log
+from app.utils.risk_analyzer import risk_analyzer
+from app.utils.logging_config import (
+    setup_logging,
+    shutdown_logging,
+    RouteContextMiddleware
+)
+from app.utils.admission_control import (
+    admission_controller,
+    AdmissionControlMiddleware
+)
+
+# Setup logging (queue-based, ditulis oleh background thread)
+setup_logging()
+logger = logging.getLogger(__name__)
+
+# Initialize FastAPI app
+app = FastAPI(
+    title=settings.APP_NAME,
+    version=settings.APP_VERSION,
+    description=settings.APP_DESCRIPTION,
+    docs_url="/docs",
+    redoc_url="/redoc"
+)
+
+# Add CORS middleware
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=settings.CORS_ORIGINS,
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+# Simpan route aktif untuk sampling log per route
+app.add_middleware(RouteContextMiddleware)
+
+# Load shedding untuk route prediksi (middleware terluar, ditolak sebelum diproses)
+app.add_middleware(AdmissionControlMiddleware, controller=admission_controller)
+
+
+# ==================== STARTUP & SHUTDOWN EVENTS ====================
+
+async def feature_store_snapshot_loop():
+    """Simpan snapshot feature store & activity counter secara periodik di background"""
+    while True:
+        await asyncio.sleep(settings.FEATURE_STORE_SNAPSHOT_INTERVAL)
+        try:
+            await asyncio.to_thread(feature_store.save_snapshot)
+            await asyncio.to_thread(activity_counter.purge_expired)
+            await asyncio.to_thread(activity_counter.save_snapshot)
+        except Exception as e:
+            logger.error(f"❌ Failed to save feature store snapshot: {e}")
+
+
+@app.on_event("startup")
+async def startup_event():
+    """Load models saat aplikasi startup"""
+    try:
+        logger.info("🚀 Starting application...")
+        logger.info("📦 Loading ML models...")
+        model_loader.load_models()
+        drift_monitor.configure(
+            model_loader.get_feature_columns(),
+            model_loader.get_feature_stats()
+        )
+        logger.info("✅ Models loaded successfully!")
+    except Exception as e:
+        logger.error(f"❌ Failed to load models: {e}")
+        raise
+    
+    try:
+        feature_store.load_snapshot()
+        activity_counter.load_snapshot()
+    except Exception as e:
+        logger.error(f"❌ Failed to load feature store snapshot: {e}")
+    app.state.snapshot_task = asyncio.create_task(feature_store_snapshot_loop())
+    
+    if audit_log.enabled:
+        audit_log.open()
+        app.state.audit_task = asyncio.create_task(audit_log.run())
+    
+    job_manager.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Cleanup saat aplikasi shutdown"""
+    logger.info("👋 Shutting down application...")
+    
+    job_manager.shutdown()
+    
+    snapshot_task = getattr(app.state, "snapshot_task", None)
+    if snapshot_task is not None:
+        snapshot_task.cancel()
+    try:
+        feature_store.save_snapshot()
+        activity_counter.save_snapshot()
+    except Exception as e:
+        logger.error(f"❌ Failed to save feature store snapshot: {e}")
+    
+    # Hentikan loop flush (write yang sedang berjalan diselesaikan), lalu
+    # flush sisa keputusan di buffer sebelum database ditutup
+    audit_task = getattr(app.state, "audit_task", None)
+    if audit_task is not None:
+        audit_log.stop()
+        try:
+            await audit_task
+        except Exception as e:
+            logger.error(f"❌ Audit log loop stopped with error: {e}")
+    try:
+        await audit_log.close()
+    except Exception as e:
+        logger.error(f"❌ Failed to flush audit log: {e}")
+    
+    shutdown_logging()
+
+
+# ==================== EXCEPTION HANDLERS ====================
+
+@app.exception_handler(HTTPException)
+async def http_exception_handler(request, exc):
+    """Handler untuk HTTP exceptions"""
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={
+            "success": False,
+            "error": exc.detail
+        }
+    )
+
+
+@app.exception_handler(Exception)
+async def general_exception_handler(request, exc):
+    """Handler untuk general exceptions"""
+    logger.error(f"Unhandled exception: {exc}")
+    return JSONResponse(
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        content={
+            "success": False,
+            "error": "Internal server error",
+            "detail": str(exc)
+        }
+    )
+
+
+# ==================== ROUTES ====================
+
+@app.get("/", tags=["Root"])
+async def root():
+    """Root endpoint"""
+    return {
+        "message": "Welcome to Early Warning System API",
+        "version": settings.APP_VERSION,
+        "docs": "/docs"
+    }
+
+
+@app.get("/health", response_model=HealthResponse, tags=["Health"])
+async def health_check():
+    """Health check endpoint"""
+    return {
+        "status": "healthy",
+        "timestamp": datetime.now().isoformat(),
+        "models_loaded": model_loader.is_loaded()
+    }
+
+
+@app.post(
+    "/predict",
+    response_model=PredictionResponse,
+    responses={
+        400: {"model": ErrorResponse},
+        500: {"model": ErrorResponse}
+    },
+    tags=["Prediction"]
+)
+async def predict_risk(request: PredictionRequest):
+    """
+    Endpoint untuk prediksi risiko keterlambatan pembayaran.
+    
+    ### Parameters:
+    - **tanggal**: Tanggal transaksi (format: YYYY-MM-DD)
+    - **nominal**: Nominal transaksi dalam Rupiah (harus > 0)
+    - **target_type**: Tipe target pengiriman (broadcast/rt_tertentu)
+    - **rt_number**: Nomor RT (wajib jika target_type = rt_tertentu)
+    - **customer_id**: ID customer untuk behavior features (optional)
+    
+    ### Returns:
+    - **risk_score**: Score risiko (0-100)
+    - **risk_category**: Kategori risiko dan rekomendasi
+    """
+    try:
+        # Check if models are loaded
+        if not model_loader.is_loaded():
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Models belum siap. Silakan coba lagi."
+            )
+        
+        # Perform prediction (di thread pool agar event loop tetap melayani /health)
+        prediction_result = await asyncio.to_thread(
+            predictor.predict,
+            tanggal=request.tanggal,
+            nominal=request.nominal,
+            verbose=False,  # Set True jika ingin detail per level
+            entity_id=feature_store.resolve_entity_id(
+                request.customer_id, request.rt_number
+            )
+        )
+        
+        # Format result
+        formatted_result = risk_analyzer.format_result(
+            tanggal=request.tanggal,
+            nominal=request.nominal,
+            target_type=request.target_type,
+            rt_number=request.rt_number or "",
+            risk_score=prediction_result["risk_score"],
+            details=prediction_result.get("details")
+        )
+        audit_log.record(
+            route="/predict",
+            request=request.model_dump(),
+            risk_score=formatted_result["risk_score"],
+            risk_status=formatted_result["risk_category"]["status"],
+            details=prediction_result.get("details")
+        )
+        
+        logger.info(
+            "Prediction successful - Date: %s, Nominal: %s, Risk: %s%%",
+            request.tanggal, request.nominal, formatted_result["risk_score"],
+            extra={"fields": {
+                "tanggal": request.tanggal,
+                "nominal": request.nominal,
+                "risk_score": formatted_result["risk_score"]
+            }}
+        )
+        
+        return {
+            "success": True,
+            "data": formatted_result
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Prediction error: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Gagal melakukan prediksi: {str(e)}"
+        )
+
+
+@app.post(
+    "/predict/verbose",
+    response_model=PredictionResponse,
+    tags=["Prediction"]
+)
+async def predict_risk_verbose(request: PredictionRequest):
+    """
+    Endpoint untuk prediksi dengan detail per level model.
+    Sama seperti /predict tetapi mengembalikan detail prediksi per level.
+    """
+    try:
+        if not model_loader.is_loaded():
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Models belum siap. Silakan coba lagi."
+            )
+        
+        # Perform prediction with verbose=True
+        prediction_result = await asyncio.to_thread(
+            predictor.predict,
+            tanggal=request.tanggal,
+            nominal=request.nominal,
+            verbose=True,
+            entity_id=feature_store.resolve_entity_id(
+                request.customer_id, request.rt_number
+            )
+        )
+        
+        # Format result
+        formatted_result = risk_analyzer.format_result(
+            tanggal=request.tanggal,
+            nominal=request.nominal,
+            target_type=request.target_type,
+            rt_number=request.rt_number or "",
+            risk_score=prediction_result["risk_score"],
+            details=prediction_result.get("details")
+        )
+        audit_log.record(
+            route="/predict/verbose",
+            request=request.model_dump(),
+            risk_score=formatted_result["risk_score"],
+            risk_status=formatted_result["risk_category"]["status"],
+            details=prediction_result.get("details")
+        )
+        
+        return {
+            "success": True,
+            "data": formatted_result
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Prediction error: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Gagal melakukan prediksi: {str(e)}"
+        )
+
+
+@app.get("/models/info", tags=["Models"])
+async def get_models_info():
+    """Get informasi tentang models yang di-load"""
+    try:
+        if not model_loader.is_loaded():
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Models belum di-load"
+            )
+        
+        return {
+            "success": True,
+            "data": {
+                "level0_models": list(model_loader.get_level0_models().keys()),
+                "level1_models": list(model_loader.get_level1_models().keys()),
+                "total_features": len(model_loader.get_feature_columns()),
+                "feature_columns": model_loader.get_feature_columns(),
+                "memory": model_loader.get_memory_report()
+            }
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+
+@app.post("/features/events", tags=["Features"])
+async def ingest_events(batch: TransactionEventBatch):
+    """
+    Ingest event transaksi ke feature store.
+    
+    Agregat per customer / RT dan counter aktivitas bulan / quarter di-update
+    secara incremental (O(1) per event), sehingga prediksi berikutnya langsung
+    memakai behavior features terbaru.
+    """
+    try:
+        for event in batch.events:
+            entity_id = feature_store.resolve_entity_id(
+                event.customer_id, event.rt_number
+            )
+            feature_store.ingest(
+                entity_id=entity_id,
+                timestamp=event.timestamp,
+                nominal=event.nominal,
+                jenis_transaksi=event.jenis_transaksi,
+                terlambat=event.terlambat
+            )
+            activity_counter.record(entity_id, event.timestamp)
+        
+        return {
+            "success": True,
+            "data": {
+                "ingested": len(batch.events)
+            }
+        }
+    except Exception as e:
+        logger.error(f"Feature ingest error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Gagal ingest event: {str(e)}"
+        )
+
+
+@app.get("/features/stats", tags=["Features"])
+async def get_feature_store_stats():
+    """Get ringkasan kondisi feature store dan footprint memori activity counter"""
+    return {
+        "success": True,
+        "data": {
+            **feature_store.stats(),
+            "activity": activity_counter.memory_report()
+        }
+    }
+
+
+@app.get("/features/{entity_id}", tags=["Features"])
+async def get_entity_features(entity_id: str):
+    """Get behavior features untuk satu entity (contoh: customer:CUST-0001, rt:001)"""
+    features = feature_store.get_features(entity_id)
+    if features is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Entity tidak ditemukan: {entity_id}"
+        )
+    return {
+        "success": True,
+        "data": features
+    }
+
+
+def _job_response(job_status: dict) -> dict:
+    """Format response submit job"""
+    return {
+        "success": True,
+        "data": {
+            **job_status,
+            "status_url": f"/jobs/{job_status['job_id']}",
+            "result_url": f"/jobs/{job_status['job_id']}/result"
+        }
+    }
+
+
+def _parse_and_submit_job(body: bytes) -> dict:
+    """Parse + validasi body JSON dan submit job (dijalankan di thread pool)"""
+    job_request = JobRequest.model_validate_json(body)
+    if len(job_request.items) > settings.JOB_MAX_JSON_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=(
+                f"Maksimal {settings.JOB_MAX_JSON_ITEMS} item per job JSON, "
+                f"gunakan POST /jobs/upload (CSV) untuk batch lebih besar"
+            )
+        )
+    return job_manager.submit(job_request.items)
+
+
+@app.post(
+    "/jobs",
+    status_code=status.HTTP_202_ACCEPTED,
+    tags=["Jobs"],
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": JobRequest.model_json_schema(
+                ref_template="#/components/schemas/{model}"
+            )}}
+        }
+    }
+)
+async def submit_job(request: Request):
+    """
+    Submit background job untuk scoring batch (body JSON, maksimal JOB_MAX_JSON_ITEMS item).
+    
+    Job dijalankan oleh worker process pool terpisah sehingga tidak
+    menambah latency /predict. Body di-parse dan divalidasi di thread pool
+    agar event loop tidak tertahan. Gunakan `GET /jobs/{job_id}` untuk polling
+    progress dan `GET /jobs/{job_id}/result` untuk download hasil (CSV).
+    """
+    body = await request.body()
+    try:
+        job_status = await asyncio.to_thread(_parse_and_submit_job, body)
+        return _job_response(job_status)
+    except HTTPException:
+        raise
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=e.errors(include_url=False, include_context=False)
+        )
+    except Exception as e:
+        logger.error(f"Job submit error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Gagal submit job: {str(e)}"
+        )
+
+
+@app.post("/jobs/upload", status_code=status.HTTP_202_ACCEPTED, tags=["Jobs"])
+async def submit_job_file(file: UploadFile = File(...)):
+    """
+    Submit background job dari file CSV untuk batch besar (maksimal JOB_MAX_ITEMS baris).
+    
+    Header CSV: `tanggal,nominal,target_type,rt_number,customer_id`. File
+    hanya di-copy ke folder job; parsing dan validasi per baris dilakukan
+    oleh worker process. Baris yang tidak valid membuat job berstatus
+    `failed` dengan nomor baris di field `error`.
+    """
+    max_bytes = settings.JOB_MAX_UPLOAD_MB * 1024 * 1024
+    if file.size is not None and file.size > max_bytes:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Ukuran file maksimal {settings.JOB_MAX_UPLOAD_MB} MB"
+        )
+    
+    try:
+        # Batas juga dicek saat copy, untuk upload tanpa ukuran yang diketahui
+        job_status = await asyncio.to_thread(job_manager.submit_file, file.file, max_bytes)
+        return _job_response(job_status)
+    except UploadTooLargeError as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Job upload error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Gagal submit job: {str(e)}"
+        )
+    finally:
+        await file.close()
+
+
+@app.get("/jobs/{job_id}", tags=["Jobs"])
+async def get_job_status(job_id: str):
+    """Get status dan progress background job"""
+    job_status = job_manager.get_status(job_id)
+    if job_status is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job tidak ditemukan: {job_id}"
+        )
+    return {
+        "success": True,
+        "data": job_status
+    }
+
+
+@app.get("/jobs/{job_id}/result", tags=["Jobs"])
+async def download_job_result(job_id: str):
+    """Download hasil background job dalam format CSV"""
+    job_status = job_manager.get_status(job_id)
+    if job_status is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job tidak ditemukan: {job_id}"
+        )
+    
+    result_path = job_manager.get_result_path(job_id)
+    if job_status["state"] != STATUS_COMPLETED or result_path is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Hasil job belum tersedia (status: {job_status['state']})"
+        )
+    
+    return FileResponse(
+        result_path,
+        media_type="text/csv",
+        filename=f"ews_job_{job_id}.csv"
+    )
+
+
+@app.get("/monitoring/admission", tags=["Monitoring"])
+async def get_admission_stats():
+    """Get kondisi admission control (in-flight, latency, jumlah request ditolak)"""
+    return {
+        "success": True,
+        "data": admission_controller.stats()
+    }
+
+
+@app.get("/monitoring/drift", tags=["Monitoring"])
+async def get_feature_drift():
+    """
+    Get drift score fitur live terhadap feature_stats di model_info.json.
+    
+    Per fitur dikembalikan statistik live (mean/std/min/max/quantile),
+    pergeseran mean & median dalam satuan std training, rasio std,
+    dan proporsi nilai di luar rentang training.
+    """
+    try:
+        return {
+            "success": True,
+            "data": await asyncio.to_thread(drift_monitor.report)
+        }
+    except Exception as e:
+        logger.error(f"Drift report error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+
+@app.get("/audit/recent", tags=["Audit"])
+async def get_recent_decisions(
+    limit: int = Query(50, ge=1, le=1000),
+    customer_id: str = None,
+    rt_number: str = None
+):
+    """
+    Get keputusan risiko terbaru dari audit log.
+    
+    ### Parameters:
+    - **limit**: Jumlah maksimum record (1-1000)
+    - **customer_id**: Filter berdasarkan customer (optional)
+    - **rt_number**: Filter berdasarkan RT (optional)
+    """
+    if not audit_log.enabled:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Audit log tidak aktif"
+        )
+    try:
+        records = await audit_log.recent(limit, customer_id, rt_number)
+        return {
+            "success": True,
+            "data": {
+                "records": records,
+                "stats": audit_log.stats()
+            }
+        }
+    except Exception as e:
+        logger.error(f"Audit query error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=str(e)
+        )
+
+
+# ==================== RUN APPLICATION ====================
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run(
+        "app.main:app",
+        host="0.0.0.0",
+        port=8080,
+        reload=True,
+        log_level="info"
     )
\ No newline at end of file
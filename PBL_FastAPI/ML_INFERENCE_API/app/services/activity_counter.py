@@ -0,0 +1,286 @@
+"""
+Service untuk streaming counter aktivitas bulanan & quarterly per entity
+"""
+import os
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+import logging
+
+import numpy as np
+
+from app.config import settings
+from app.services.feature_store import feature_timezone
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FILE = "activity_counter.npz"
+
+# Satu quarter = 3 bulan kalender. Dengan month_id = year * 12 + (month - 1),
+# bucket month_id % 3 selalu berisi bulan ke-1/2/3 dari quarter yang sama,
+# sehingga 3 bucket per entity cukup untuk menghitung bulan dan quarter berjalan.
+BUCKETS_PER_ENTITY = 3
+
+
+def month_id_of(dt: datetime) -> int:
+    """Konversi tanggal ke index bulan absolut"""
+    return dt.year * 12 + (dt.month - 1)
+
+
+def current_month_id() -> int:
+    """Index bulan saat ini (jam dinding, zona waktu fitur)"""
+    return month_id_of(datetime.now(feature_timezone()))
+
+
+class ActivityCounter:
+    """
+    Class untuk menghitung Aktivitas_Bulan_Ini dan Aktivitas_Quarter_Ini per entity.
+
+    Counter disimpan di array NumPy berbentuk (capacity, 3): satu bucket per
+    bulan dalam quarter. Bucket yang berisi bulan lebih lama otomatis di-reset
+    (expired) saat bulan baru masuk, jadi memori per entity tetap konstan.
+    """
+
+    def __init__(self, initial_capacity: int = 1024, max_entities: Optional[int] = None):
+        self.max_entities = max_entities or settings.ACTIVITY_MAX_ENTITIES
+        self._lock = threading.Lock()
+        self._index: Dict[str, int] = {}
+        self._keys: list = []
+        self._free_slots: list = []
+        self._month_ids = np.full((initial_capacity, BUCKETS_PER_ENTITY), -1, dtype=np.int32)
+        self._counts = np.zeros((initial_capacity, BUCKETS_PER_ENTITY), dtype=np.uint32)
+        self._size = 0
+        self._key_bytes = 0
+        self._latest_month_id = -1
+        self._events_recorded = 0
+        self._events_expired = 0
+        self._events_future = 0
+        self._entities_rejected = 0
+
+    # ==================== SLOT MANAGEMENT ====================
+
+    def _grow(self) -> None:
+        """Gandakan kapasitas array counter"""
+        capacity = self._month_ids.shape[0]
+        new_capacity = min(capacity * 2, self.max_entities)
+        month_ids = np.full((new_capacity, BUCKETS_PER_ENTITY), -1, dtype=np.int32)
+        counts = np.zeros((new_capacity, BUCKETS_PER_ENTITY), dtype=np.uint32)
+        month_ids[:capacity] = self._month_ids
+        counts[:capacity] = self._counts
+        self._month_ids = month_ids
+        self._counts = counts
+
+    def _allocate_slot(self, entity_id: str) -> Optional[int]:
+        """Ambil slot untuk entity baru, atau None jika kapasitas penuh"""
+        if self._free_slots:
+            slot = self._free_slots.pop()
+            self._keys[slot] = entity_id
+        else:
+            if self._size >= self.max_entities:
+                self._purge_expired_locked()
+                if not self._free_slots:
+                    return None
+                return self._allocate_slot(entity_id)
+            if self._size >= self._month_ids.shape[0]:
+                self._grow()
+            slot = self._size
+            self._size += 1
+            self._keys.append(entity_id)
+
+        self._index[entity_id] = slot
+        self._key_bytes += sys.getsizeof(entity_id)
+        return slot
+
+    # ==================== UPDATE & LOOKUP ====================
+
+    def record(self, entity_id: str, timestamp: datetime, count: int = 1) -> bool:
+        """
+        Catat aktivitas entity pada tanggal tertentu (O(1)).
+
+        Args:
+            entity_id: Key entity
+            timestamp: Waktu aktivitas
+            count: Jumlah aktivitas yang ditambahkan
+
+        Returns:
+            bool: False jika event sudah expired, terlalu jauh di masa depan,
+            atau entity ditolak karena kapasitas penuh
+        """
+        month_id = month_id_of(timestamp)
+        bucket = month_id % BUCKETS_PER_ENTITY
+        # Satu event bertanggal jauh di depan akan memajukan _latest_month_id dan
+        # membuat purge berikutnya menghapus counter semua entity
+        future = month_id > current_month_id() + settings.ACTIVITY_MAX_FUTURE_MONTHS
+
+        with self._lock:
+            if future:
+                self._events_future += 1
+                return False
+            slot = self._index.get(entity_id)
+            if slot is None:
+                slot = self._allocate_slot(entity_id)
+                if slot is None:
+                    self._entities_rejected += 1
+                    return False
+
+            current = self._month_ids[slot, bucket]
+            if current == month_id:
+                self._counts[slot, bucket] += count
+            elif current < month_id:
+                # Bucket berisi window lama -> expire dan mulai window baru
+                self._month_ids[slot, bucket] = month_id
+                self._counts[slot, bucket] = count
+            else:
+                # Event lebih lama dari window yang masih disimpan
+                self._events_expired += 1
+                return False
+
+            if month_id > self._latest_month_id:
+                self._latest_month_id = month_id
+            self._events_recorded += 1
+            return True
+
+    def get_activity(self, entity_id: Optional[str], dt: datetime) -> Optional[Tuple[int, int]]:
+        """
+        Lookup aktivitas bulan & quarter untuk tanggal tertentu (O(1)).
+
+        Args:
+            entity_id: Key entity
+            dt: Tanggal acuan
+
+        Returns:
+            Tuple (aktivitas_bulan, aktivitas_quarter), atau None jika entity tidak dikenal
+        """
+        if not entity_id:
+            return None
+        month_id = month_id_of(dt)
+        quarter_id = month_id // BUCKETS_PER_ENTITY
+        with self._lock:
+            # Lookup di dalam lock: purge bisa membebaskan slot dan memberikannya ke entity lain
+            slot = self._index.get(entity_id)
+            if slot is None:
+                return None
+            month_ids = self._month_ids[slot]
+            counts = self._counts[slot]
+            month_count = int(counts[month_id % BUCKETS_PER_ENTITY]) \
+                if month_ids[month_id % BUCKETS_PER_ENTITY] == month_id else 0
+            quarter_count = int(counts[month_ids // BUCKETS_PER_ENTITY == quarter_id].sum())
+        return month_count, quarter_count
+
+    # ==================== EXPIRY ====================
+
+    def _purge_expired_locked(self) -> int:
+        """Bebaskan slot entity yang tidak punya aktivitas di quarter terbaru"""
+        if self._size == 0 or self._latest_month_id < 0:
+            return 0
+
+        latest_quarter = self._latest_month_id // BUCKETS_PER_ENTITY
+        newest = self._month_ids[:self._size].max(axis=1)
+        stale_slots = np.flatnonzero((newest >= 0) & (newest // BUCKETS_PER_ENTITY < latest_quarter))
+
+        for slot in stale_slots.tolist():
+            key = self._keys[slot]
+            del self._index[key]
+            self._key_bytes -= sys.getsizeof(key)
+            self._keys[slot] = None
+            self._free_slots.append(slot)
+        self._month_ids[stale_slots] = -1
+        self._counts[stale_slots] = 0
+        return len(stale_slots)
+
+    def purge_expired(self) -> int:
+        """
+        Hapus entity yang seluruh window-nya sudah expired.
+
+        Returns:
+            int: Jumlah entity yang dihapus
+        """
+        with self._lock:
+            purged = self._purge_expired_locked()
+        if purged:
+            logger.info(f"🧹 Purged {purged} expired activity counters")
+        return purged
+
+    # ==================== REPORTING ====================
+
+    def memory_report(self) -> Dict[str, Any]:
+        """Laporan jumlah entity dan estimasi footprint memori (bytes)"""
+        array_bytes = self._month_ids.nbytes + self._counts.nbytes
+        index_bytes = sys.getsizeof(self._index) + sys.getsizeof(self._keys) + self._key_bytes
+        return {
+            "entities": len(self._index),
+            "capacity": int(self._month_ids.shape[0]),
+            "max_entities": self.max_entities,
+            "events_recorded": self._events_recorded,
+            "events_expired": self._events_expired,
+            "events_future": self._events_future,
+            "entities_rejected": self._entities_rejected,
+            "bytes_counters": int(array_bytes),
+            "bytes_index": int(index_bytes),
+            "bytes_total": int(array_bytes + index_bytes),
+        }
+
+    # ==================== SNAPSHOT ====================
+
+    def save_snapshot(self) -> None:
+        """Simpan counter ke disk lokal secara atomik"""
+        with self._lock:
+            active = np.array([key is not None for key in self._keys], dtype=bool)
+            keys = np.array([key for key in self._keys if key is not None], dtype=str)
+            month_ids = self._month_ids[:self._size][active]
+            counts = self._counts[:self._size][active]
+            latest_month_id = self._latest_month_id
+
+        snapshot_dir = Path(settings.FEATURE_STORE_DIR)
+        snapshot_dir.mkdir(parents=True, exist_ok=True)
+        target = snapshot_dir / SNAPSHOT_FILE
+        tmp = snapshot_dir / (SNAPSHOT_FILE + ".tmp")
+        with open(tmp, "wb") as f:
+            np.savez(
+                f,
+                keys=keys,
+                month_ids=month_ids,
+                counts=counts,
+                latest_month_id=np.int32(latest_month_id),
+            )
+        os.replace(tmp, target)
+
+    def load_snapshot(self) -> bool:
+        """
+        Load counter dari disk lokal (jika ada).
+
+        Returns:
+            bool: True jika snapshot berhasil di-load
+        """
+        target = Path(settings.FEATURE_STORE_DIR) / SNAPSHOT_FILE
+        if not target.exists():
+            return False
+
+        with np.load(target) as data:
+            keys = data["keys"].tolist()
+            month_ids = data["month_ids"]
+            counts = data["counts"]
+            latest_month_id = int(data["latest_month_id"])
+
+        size = len(keys)
+        capacity = max(1024, size)
+        with self._lock:
+            self._month_ids = np.full((capacity, BUCKETS_PER_ENTITY), -1, dtype=np.int32)
+            self._counts = np.zeros((capacity, BUCKETS_PER_ENTITY), dtype=np.uint32)
+            self._month_ids[:size] = month_ids
+            self._counts[:size] = counts
+            self._keys = keys
+            self._index = {key: slot for slot, key in enumerate(keys)}
+            self._free_slots = []
+            self._size = size
+            self._key_bytes = sum(sys.getsizeof(key) for key in keys)
+            self._latest_month_id = latest_month_id
+
+        logger.info(f"✓ Loaded activity counter snapshot with {size} entities")
+        return True
+
+
+# Global instance
+activity_counter = ActivityCounter()
@@ -0,0 +1,305 @@
+"""
+Service untuk audit log keputusan risiko (buffer di memori + flush batch ke SQLite)
+"""
+import asyncio
+import json
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+import logging
+
+from app.config import settings
+from app.services.model_loader import model_loader
+
+logger = logging.getLogger(__name__)
+
+AUDIT_COLUMNS = (
+    "created_at",
+    "route",
+    "tanggal",
+    "nominal",
+    "target_type",
+    "rt_number",
+    "customer_id",
+    "risk_score",
+    "risk_status",
+    "model_version",
+    "details",
+)
+
+CREATE_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS audit_log (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at TEXT NOT NULL,
+    route TEXT NOT NULL,
+    tanggal TEXT NOT NULL,
+    nominal REAL NOT NULL,
+    target_type TEXT,
+    rt_number TEXT,
+    customer_id TEXT,
+    risk_score REAL NOT NULL,
+    risk_status TEXT,
+    model_version TEXT,
+    details TEXT
+)
+"""
+
+# Index untuk filter /audit/recent: WHERE customer_id = ? ORDER BY id DESC
+CREATE_INDEX_SQL = (
+    "CREATE INDEX IF NOT EXISTS idx_audit_customer ON audit_log (customer_id, id)",
+    "CREATE INDEX IF NOT EXISTS idx_audit_rt ON audit_log (rt_number, id)",
+)
+
+INSERT_SQL = (
+    f"INSERT INTO audit_log ({', '.join(AUDIT_COLUMNS)}) "
+    f"VALUES ({', '.join('?' for _ in AUDIT_COLUMNS)})"
+)
+
+
+class AuditLog:
+    """
+    Class untuk mencatat setiap keputusan risiko tanpa menambah latency request.
+
+    record() hanya menambahkan tuple ke buffer di memori (dipanggil dari event
+    loop thread). Background task mem-flush buffer per batch ke SQLite (mode WAL)
+    di thread pool. Batch yang gagal ditulis dikembalikan ke depan buffer dan
+    dicoba lagi dengan backoff eksponensial. Buffer dibatasi AUDIT_MAX_BUFFER;
+    record yang tidak muat dibuang dan dihitung.
+    """
+
+    def __init__(self):
+        self._buffer: List[tuple] = []
+        self._conn: Optional[sqlite3.Connection] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._batch_ready: Optional[asyncio.Event] = None
+        self._stopping: Optional[asyncio.Event] = None
+        self._retry_delay = 0.0
+        self.written = 0
+        self.dropped = 0
+        self.failed_writes = 0
+
+    @property
+    def enabled(self) -> bool:
+        return settings.AUDIT_ENABLED
+
+    # ==================== LIFECYCLE ====================
+
+    def open(self) -> None:
+        """Buka database audit dan siapkan tabel"""
+        db_path = Path(settings.AUDIT_DB_PATH)
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Akses connection selalu diserialisasi oleh _flush_lock
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(CREATE_TABLE_SQL)
+        for sql in CREATE_INDEX_SQL:
+            self._conn.execute(sql)
+        self._conn.commit()
+
+        self._flush_lock = asyncio.Lock()
+        self._batch_ready = asyncio.Event()
+        self._stopping = asyncio.Event()
+        self._retry_delay = 0.0
+        logger.info(f"✓ Audit log opened: {db_path}")
+
+    @staticmethod
+    async def _wait(event: asyncio.Event, timeout: float) -> None:
+        try:
+            await asyncio.wait_for(event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def run(self) -> None:
+        """
+        Loop background: flush setiap AUDIT_FLUSH_INTERVAL atau saat batch penuh.
+
+        Setelah write gagal, flush berikutnya menunggu retry delay (backoff)
+        tanpa dipicu batch penuh. Loop berhenti setelah stop() dipanggil;
+        flush yang sedang berjalan diselesaikan dulu, tidak di-cancel.
+        """
+        while not self._stopping.is_set():
+            if self._retry_delay:
+                await self._wait(self._stopping, self._retry_delay)
+            else:
+                await self._wait(self._batch_ready, settings.AUDIT_FLUSH_INTERVAL)
+            if self._stopping.is_set():
+                break
+            self._batch_ready.clear()
+            await self.flush()
+
+    def stop(self) -> None:
+        """Minta loop run() berhenti (tunggu task-nya, lalu panggil close())"""
+        if self._stopping is not None:
+            self._stopping.set()
+
+    async def close(self) -> None:
+        """Flush terakhir sisa buffer lalu tutup database"""
+        if self._conn is None:
+            return
+        await self.flush()
+        if self._buffer:
+            logger.error(f"❌ {len(self._buffer)} audit records not written before shutdown")
+        self._conn.close()
+        self._conn = None
+
+    # ==================== WRITE PATH ====================
+
+    def record(
+        self,
+        route: str,
+        request: Dict[str, Any],
+        risk_score: float,
+        risk_status: str,
+        details: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Tambahkan satu keputusan risiko ke buffer (non-blocking).
+
+        Args:
+            route: Route yang menghasilkan keputusan
+            request: Input prediksi (tanggal, nominal, target_type, rt_number, customer_id)
+            risk_score: Score risiko final
+            risk_status: Kategori risiko
+            details: Detail prediksi per level model (optional)
+        """
+        if not self.enabled or self._conn is None:
+            return
+        if len(self._buffer) >= settings.AUDIT_MAX_BUFFER:
+            self.dropped += 1
+            return
+
+        self._buffer.append((
+            datetime.now().isoformat(),
+            route,
+            request["tanggal"],
+            request["nominal"],
+            request.get("target_type"),
+            request.get("rt_number"),
+            request.get("customer_id"),
+            risk_score,
+            risk_status,
+            model_loader.model_info.get("model_version"),
+            json.dumps(details) if details else None,
+        ))
+        if len(self._buffer) >= settings.AUDIT_BATCH_SIZE:
+            self._batch_ready.set()
+
+    async def flush(self) -> int:
+        """
+        Tulis seluruh isi buffer ke database.
+
+        Jika write gagal, batch dikembalikan ke depan buffer (urutan tetap) dan
+        retry delay digandakan sampai AUDIT_RETRY_MAX_DELAY.
+
+        Returns:
+            Jumlah record yang ditulis
+        """
+        if self._conn is None:
+            return 0
+        async with self._flush_lock:
+            batch, self._buffer = self._buffer, []
+            if not batch:
+                return 0
+            try:
+                await asyncio.to_thread(self._write_batch, batch)
+            except Exception as e:
+                self._requeue(batch)
+                self.failed_writes += 1
+                self._retry_delay = min(
+                    max(self._retry_delay * 2, settings.AUDIT_RETRY_BASE_DELAY),
+                    settings.AUDIT_RETRY_MAX_DELAY
+                )
+                logger.error(
+                    f"❌ Failed to write {len(batch)} audit records, "
+                    f"retry in {self._retry_delay:.1f}s: {e}"
+                )
+                return 0
+            self._retry_delay = 0.0
+            self.written += len(batch)
+            return len(batch)
+
+    def _requeue(self, batch: List[tuple]) -> None:
+        """Kembalikan batch gagal ke depan buffer; kelebihan AUDIT_MAX_BUFFER dibuang"""
+        self._buffer[:0] = batch
+        overflow = len(self._buffer) - settings.AUDIT_MAX_BUFFER
+        if overflow > 0:
+            # Buang record terbaru, sama seperti record() saat buffer penuh
+            del self._buffer[-overflow:]
+            self.dropped += overflow
+
+    def _write_batch(self, batch: List[tuple]) -> None:
+        with self._conn:
+            self._conn.executemany(INSERT_SQL, batch)
+
+    # ==================== READ PATH ====================
+
+    async def recent(
+        self,
+        limit: int = 50,
+        customer_id: Optional[str] = None,
+        rt_number: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Ambil keputusan terbaru (buffer di-flush dulu agar hasil lengkap).
+
+        Args:
+            limit: Jumlah maksimum record
+            customer_id: Filter berdasarkan customer (optional)
+            rt_number: Filter berdasarkan RT (optional)
+
+        Returns:
+            List record, terbaru lebih dulu
+        """
+        if self._conn is None:
+            return []
+        await self.flush()
+        async with self._flush_lock:
+            return await asyncio.to_thread(self._query_recent, limit, customer_id, rt_number)
+
+    def _query_recent(
+        self,
+        limit: int,
+        customer_id: Optional[str],
+        rt_number: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        conditions, params = [], []
+        if customer_id is not None:
+            conditions.append("customer_id = ?")
+            params.append(customer_id)
+        if rt_number is not None:
+            conditions.append("rt_number = ?")
+            params.append(rt_number)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        cursor = self._conn.execute(
+            f"SELECT id, {', '.join(AUDIT_COLUMNS)} FROM audit_log {where} "
+            f"ORDER BY id DESC LIMIT ?",
+            (*params, limit)
+        )
+        columns = [c[0] for c in cursor.description]
+        rows = []
+        for row in cursor.fetchall():
+            item = dict(zip(columns, row))
+            if item["details"]:
+                item["details"] = json.loads(item["details"])
+            rows.append(item)
+        return rows
+
+    def stats(self) -> Dict[str, Any]:
+        """Ringkasan kondisi audit log"""
+        return {
+            "enabled": self.enabled,
+            "db_path": str(settings.AUDIT_DB_PATH),
+            "buffered": len(self._buffer),
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed_writes": self.failed_writes,
+            "retry_delay": self._retry_delay,
+        }
+
+
+# Global instance
+audit_log = AuditLog()
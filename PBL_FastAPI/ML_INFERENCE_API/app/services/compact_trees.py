@@ -0,0 +1,274 @@
+"""
+Service untuk representasi tree ensemble yang ringkas (inference-only)
+"""
+import pickle
+from pathlib import Path
+from typing import Dict, Any, Union
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+COMPACT_SUFFIX = ".compact.npz"
+COMPACT_FORMAT_VERSION = 1
+
+# Penanda child pada sklearn Tree untuk leaf node
+TREE_LEAF = -1
+
+
+def _float32_floor(values: np.ndarray) -> np.ndarray:
+    """
+    Bulatkan threshold float64 ke float32 terbesar yang <= nilai aslinya.
+
+    sklearn meng-cast X ke float32 lalu membandingkan x <= threshold (float64).
+    Untuk setiap x float32 berlaku x <= t  <=>  x <= floor32(t), sehingga
+    split dengan threshold float32 ini identik dengan model aslinya.
+    """
+    rounded = values.astype(np.float32)
+    too_big = rounded.astype(np.float64) > values
+    rounded[too_big] = np.nextafter(rounded[too_big], np.float32(-np.inf))
+    return rounded
+
+
+class CompactTreeEnsemble:
+    """
+    Tree ensemble dalam bentuk array datar yang hanya berisi data inference.
+
+    Tiap node menyimpan index fitur (uint8/uint16), threshold float32, offset
+    ke child kiri (child kanan selalu tepat setelahnya), dan nilai leaf float32
+    yang sudah dikalikan bobot ensemble (learning_rate atau 1 / n_estimators).
+    Leaf menunjuk ke dirinya sendiri dengan threshold +inf, sehingga semua
+    sample bisa ditelusuri bersamaan sebanyak max_depth langkah.
+    """
+
+    def __init__(
+        self,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        child_offset: np.ndarray,
+        value: np.ndarray,
+        roots: np.ndarray,
+        base: float,
+        max_depth: int,
+        n_features: int,
+        source: str = ""
+    ):
+        self.feature = feature
+        self.threshold = threshold
+        self.child_offset = child_offset
+        self.value = value
+        self.roots = roots
+        self.base = float(base)
+        self.max_depth = int(max_depth)
+        self.n_features_in_ = int(n_features)
+        self.source = source
+
+    # ==================== EXPORT ====================
+
+    @classmethod
+    def from_sklearn(cls, model) -> "CompactTreeEnsemble":
+        """
+        Konversi GradientBoostingRegressor / RandomForestRegressor sklearn.
+
+        Args:
+            model: Model sklearn yang sudah di-fit
+
+        Returns:
+            CompactTreeEnsemble dengan prediksi setara model asli
+        """
+        name = type(model).__name__
+        if name == "GradientBoostingRegressor":
+            trees = [est.tree_ for est in model.estimators_[:, 0]]
+            weight = model.learning_rate
+            init = model.init_
+            if init == "zero":
+                base = 0.0
+            elif hasattr(init, "constant_"):
+                base = float(np.ravel(init.constant_)[0])
+            else:
+                raise ValueError(f"init estimator tidak didukung: {type(init).__name__}")
+        elif name == "RandomForestRegressor":
+            trees = [est.tree_ for est in model.estimators_]
+            weight = 1.0 / len(trees)
+            base = 0.0
+        else:
+            raise ValueError(f"Model tidak didukung untuk export compact: {name}")
+
+        features, thresholds, offsets, values, roots = [], [], [], [], []
+        max_depth = 0
+        n_nodes_total = 0
+
+        for tree in trees:
+            left = tree.children_left
+            right = tree.children_right
+
+            # Susun ulang node secara BFS agar child kiri & kanan bersebelahan
+            order = [0]
+            i = 0
+            while i < len(order):
+                node = order[i]
+                if left[node] != TREE_LEAF:
+                    order.append(left[node])
+                    order.append(right[node])
+                i += 1
+
+            order = np.array(order)
+            position = np.empty(tree.node_count, dtype=np.int64)
+            position[order] = np.arange(len(order))
+            is_leaf = left[order] == TREE_LEAF
+
+            offset = np.zeros(len(order), dtype=np.int64)
+            internal = ~is_leaf
+            offset[internal] = position[left[order[internal]]] - np.flatnonzero(internal)
+
+            thr = np.full(len(order), np.inf, dtype=np.float32)
+            thr[internal] = _float32_floor(tree.threshold[order[internal]])
+
+            feat = np.where(is_leaf, 0, tree.feature[order])
+            val = np.where(is_leaf, tree.value[order, 0, 0] * weight, 0.0)
+
+            roots.append(n_nodes_total)
+            features.append(feat)
+            thresholds.append(thr)
+            offsets.append(offset)
+            values.append(val)
+            n_nodes_total += len(order)
+            max_depth = max(max_depth, tree.max_depth)
+
+        n_features = model.n_features_in_
+        offset_all = np.concatenate(offsets)
+        offset_dtype = np.uint16 if offset_all.max(initial=0) <= np.iinfo(np.uint16).max else np.uint32
+        feature_dtype = np.uint8 if n_features <= np.iinfo(np.uint8).max else np.uint16
+
+        return cls(
+            feature=np.concatenate(features).astype(feature_dtype),
+            threshold=np.concatenate(thresholds),
+            child_offset=offset_all.astype(offset_dtype),
+            value=np.concatenate(values).astype(np.float32),
+            roots=np.array(roots, dtype=np.int32),
+            base=base,
+            max_depth=max_depth,
+            n_features=n_features,
+            source=name
+        )
+
+    # ==================== INFERENCE ====================
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """
+        Prediksi untuk feature matrix (n_samples, n_features).
+
+        Semua tree dan sample ditelusuri sekaligus: tiap langkah hanya berupa
+        gather + perbandingan pada array (n_trees, n_samples).
+        """
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(
+                f"X harus berbentuk (n_samples, {self.n_features_in_}), dapat {X.shape}"
+            )
+
+        n_samples = X.shape[0]
+        X_flat = X.ravel()
+        row_start = (np.arange(n_samples, dtype=np.int64) * self.n_features_in_)[None, :]
+
+        nodes = np.repeat(self.roots.astype(np.int64)[:, None], n_samples, axis=1)
+        for _ in range(self.max_depth):
+            x = X_flat[row_start + self.feature[nodes]]
+            nodes = nodes + self.child_offset[nodes] + (x > self.threshold[nodes])
+
+        return self.value[nodes].sum(axis=0, dtype=np.float64) + self.base
+
+    # ==================== PERSISTENCE ====================
+
+    @property
+    def nbytes(self) -> int:
+        """Total ukuran array inference (bytes)"""
+        return int(
+            self.feature.nbytes + self.threshold.nbytes + self.child_offset.nbytes
+            + self.value.nbytes + self.roots.nbytes
+        )
+
+    @property
+    def n_trees(self) -> int:
+        return len(self.roots)
+
+    @property
+    def n_nodes(self) -> int:
+        return len(self.feature)
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Simpan ke file .npz (tanpa kompresi agar load cepat)"""
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                version=np.int32(COMPACT_FORMAT_VERSION),
+                feature=self.feature,
+                threshold=self.threshold,
+                child_offset=self.child_offset,
+                value=self.value,
+                roots=self.roots,
+                base=np.float64(self.base),
+                max_depth=np.int32(self.max_depth),
+                n_features=np.int32(self.n_features_in_),
+                source=np.array(self.source),
+            )
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "CompactTreeEnsemble":
+        """Load dari file .npz hasil save()"""
+        with np.load(path) as data:
+            version = int(data["version"])
+            if version != COMPACT_FORMAT_VERSION:
+                raise ValueError(f"Versi format compact tidak didukung: {version}")
+            return cls(
+                feature=data["feature"],
+                threshold=data["threshold"],
+                child_offset=data["child_offset"],
+                value=data["value"],
+                roots=data["roots"],
+                base=float(data["base"]),
+                max_depth=int(data["max_depth"]),
+                n_features=int(data["n_features"]),
+                source=str(data["source"]),
+            )
+
+
+def estimate_model_bytes(model: Any) -> Dict[str, Any]:
+    """
+    Estimasi memori yang dipakai model di RAM.
+
+    Args:
+        model: CompactTreeEnsemble, ensemble sklearn, atau model lain
+
+    Returns:
+        Dict berisi tipe model dan estimasi bytes
+    """
+    if isinstance(model, CompactTreeEnsemble):
+        return {
+            "type": f"compact({model.source})",
+            "n_trees": model.n_trees,
+            "n_nodes": model.n_nodes,
+            "bytes": model.nbytes,
+        }
+
+    estimators = getattr(model, "estimators_", None)
+    if estimators is not None:
+        trees = [est.tree_ for est in np.ravel(estimators)]
+        total = 0
+        n_nodes = 0
+        for tree in trees:
+            state = tree.__getstate__()
+            total += state["nodes"].nbytes + state["values"].nbytes
+            n_nodes += tree.node_count
+        return {
+            "type": type(model).__name__,
+            "n_trees": len(trees),
+            "n_nodes": n_nodes,
+            "bytes": int(total),
+        }
+
+    return {
+        "type": type(model).__name__,
+        "bytes": len(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)),
+    }
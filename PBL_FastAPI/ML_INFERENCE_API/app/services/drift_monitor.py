@@ -0,0 +1,203 @@
+"""
+Service untuk monitoring drift fitur terhadap statistik training
+"""
+import threading
+from typing import Dict, Any, List
+import logging
+
+import numpy as np
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+QUANTILES = {"p05": 0.05, "p50": 0.50, "p95": 0.95}
+
+
+class DriftMonitor:
+    """
+    Class untuk menghitung statistik streaming fitur live dan membandingkannya
+    dengan feature_stats dari model_info.json.
+
+    Baris fitur ditampung di buffer berukuran tetap dan baru digabung ke
+    statistik saat buffer penuh (Welford/Chan untuk mean & variance, histogram
+    dengan jumlah bin tetap sebagai quantile sketch). Memori tidak bergantung
+    pada jumlah request.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._configured = False
+        self.enabled = settings.DRIFT_MONITOR_ENABLED
+
+    def configure(self, feature_columns: List[str], feature_stats: Dict[str, Any]) -> None:
+        """
+        Siapkan buffer dan statistik berdasarkan fitur model.
+
+        Args:
+            feature_columns: Urutan kolom fitur model
+            feature_stats: Statistik training per fitur (mean/std/min/max/median)
+        """
+        n_features = len(feature_columns)
+        n_bins = settings.DRIFT_SKETCH_BINS
+
+        self.feature_columns = list(feature_columns)
+        self.train_mean = np.array([feature_stats[c]["mean"] for c in feature_columns])
+        self.train_std = np.array([feature_stats[c]["std"] for c in feature_columns])
+        self.train_median = np.array([feature_stats[c]["median"] for c in feature_columns])
+
+        lo = np.array([feature_stats[c]["min"] for c in feature_columns], dtype=float)
+        hi = np.array([feature_stats[c]["max"] for c in feature_columns], dtype=float)
+        # Fitur konstan di training (contoh: Quarter) tetap butuh lebar bin > 0
+        hi = np.where(hi > lo, hi, lo + 1.0)
+        self._lo = lo
+        self._hi = hi
+        self._bin_width = (hi - lo) / n_bins
+        self._n_bins = n_bins
+
+        with self._lock:
+            self._buffer = np.empty((settings.DRIFT_BATCH_SIZE, n_features), dtype=float)
+            self._pending = 0
+            self._count = 0
+            self._mean = np.zeros(n_features)
+            self._m2 = np.zeros(n_features)
+            self._min = np.full(n_features, np.inf)
+            self._max = np.full(n_features, -np.inf)
+            # Bin 0 = underflow, bin n_bins + 1 = overflow
+            self._hist = np.zeros((n_features, n_bins + 2), dtype=np.int64)
+            self._configured = True
+
+        logger.info(f"✓ Drift monitor configured for {n_features} features")
+
+    def observe(self, X: np.ndarray) -> None:
+        """
+        Tampung feature matrix yang baru di-score (hot path, hanya copy ke buffer).
+
+        Args:
+            X: Feature matrix (n_samples, n_features)
+        """
+        if not self.enabled or not self._configured:
+            return
+
+        with self._lock:
+            capacity = self._buffer.shape[0]
+            start = 0
+            while start < len(X):
+                take = min(capacity - self._pending, len(X) - start)
+                self._buffer[self._pending:self._pending + take] = X[start:start + take]
+                self._pending += take
+                start += take
+                if self._pending == capacity:
+                    self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        """Gabungkan isi buffer ke statistik streaming"""
+        n_b = self._pending
+        if n_b == 0:
+            return
+        batch = self._buffer[:n_b]
+
+        # Chan et al. parallel update untuk mean dan M2
+        batch_mean = batch.mean(axis=0)
+        batch_m2 = ((batch - batch_mean) ** 2).sum(axis=0)
+        n_a = self._count
+        total = n_a + n_b
+        delta = batch_mean - self._mean
+        self._mean += delta * (n_b / total)
+        self._m2 += batch_m2 + delta ** 2 * (n_a * n_b / total)
+        self._count = total
+
+        np.minimum(self._min, batch.min(axis=0), out=self._min)
+        np.maximum(self._max, batch.max(axis=0), out=self._max)
+
+        # Histogram sketch: semua fitur sekaligus lewat satu bincount
+        n_features = batch.shape[1]
+        bins = np.floor((batch - self._lo) / self._bin_width).astype(np.int64)
+        bins = np.clip(bins, -1, self._n_bins) + 1
+        bins[batch == self._hi] = self._n_bins  # nilai max training masuk bin terakhir
+        flat = bins + np.arange(n_features) * (self._n_bins + 2)
+        self._hist += np.bincount(
+            flat.ravel(), minlength=n_features * (self._n_bins + 2)
+        ).reshape(n_features, self._n_bins + 2)
+
+        self._pending = 0
+
+    def _quantiles(self, hist: np.ndarray, q: float) -> np.ndarray:
+        """Estimasi quantile per fitur dari histogram (interpolasi linear di dalam bin)"""
+        totals = hist.sum(axis=1)
+        cum = np.cumsum(hist, axis=1)
+        target = q * totals
+        idx = np.argmax(cum >= target[:, None], axis=1)
+
+        rows = np.arange(hist.shape[0])
+        prev = np.where(idx > 0, cum[rows, np.maximum(idx - 1, 0)], 0)
+        in_bin = hist[rows, idx]
+        frac = np.where(in_bin > 0, (target - prev) / np.maximum(in_bin, 1), 0.0)
+
+        # Underflow/overflow dipetakan ke min/max live
+        inner = self._lo + (idx - 1 + frac) * self._bin_width
+        estimate = np.where(idx == 0, self._min, np.where(idx == self._n_bins + 1, self._max, inner))
+        return np.clip(estimate, self._min, self._max)
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Hitung drift score tiap fitur terhadap feature_stats training.
+
+        Returns:
+            Dict berisi ringkasan dan detail drift per fitur
+        """
+        if not self._configured:
+            return {"enabled": self.enabled, "samples": 0, "features": {}}
+
+        with self._lock:
+            self._flush_locked()
+            count = self._count
+            mean = self._mean.copy()
+            m2 = self._m2.copy()
+            live_min = self._min.copy()
+            live_max = self._max.copy()
+            hist = self._hist.copy()
+
+        if count == 0:
+            return {"enabled": self.enabled, "samples": 0, "features": {}}
+
+        std = np.sqrt(m2 / (count - 1)) if count > 1 else np.zeros_like(mean)
+        quantiles = {name: self._quantiles(hist, q) for name, q in QUANTILES.items()}
+        scale = np.where(self.train_std > 0, self.train_std, 1.0)
+
+        mean_shift = np.abs(mean - self.train_mean) / scale
+        median_shift = np.abs(quantiles["p50"] - self.train_median) / scale
+        std_ratio = std / scale
+        out_of_range = (hist[:, 0] + hist[:, -1]) / count
+        drift_score = np.maximum(mean_shift, median_shift)
+        drifted = (drift_score > settings.DRIFT_Z_THRESHOLD) | \
+            (out_of_range > settings.DRIFT_OUT_OF_RANGE_THRESHOLD)
+
+        features = {}
+        for i, col in enumerate(self.feature_columns):
+            features[col] = {
+                "live": {
+                    "mean": float(mean[i]),
+                    "std": float(std[i]),
+                    "min": float(live_min[i]),
+                    "max": float(live_max[i]),
+                    **{name: float(values[i]) for name, values in quantiles.items()},
+                },
+                "mean_shift": float(mean_shift[i]),
+                "median_shift": float(median_shift[i]),
+                "std_ratio": float(std_ratio[i]),
+                "out_of_range_rate": float(out_of_range[i]),
+                "drift_score": float(drift_score[i]),
+                "drifted": bool(drifted[i]),
+            }
+
+        return {
+            "enabled": self.enabled,
+            "samples": int(count),
+            "drifted_features": [col for col, f in features.items() if f["drifted"]],
+            "features": features,
+        }
+
+
+# Global instance
+drift_monitor = DriftMonitor()
@@ -1,109 +1,149 @@
-"""
-Service untuk feature engineering
-"""
-import pandas as pd
-import numpy as np
-from datetime import datetime
-from typing import Dict, Any
-import logging
-
-from app.services.model_loader import model_loader
-
-logger = logging.getLogger(__name__)
-
-
-class FeatureBuilder:
-    """Class untuk build features dari input"""
-    
-    def __init__(self):
-        pass
-    
-    def build_base_features(self, tanggal: str, nominal: int) -> Dict[str, Any]:
-        """
-        Membentuk fitur dari input admin.
-        
-        Args:
-            tanggal: Tanggal transaksi (format: YYYY-MM-DD)
-            nominal: Nominal transaksi
-            
-        Returns:
-            Dict berisi semua features
-        """
-        try:
-            dt = datetime.strptime(tanggal, "%Y-%m-%d")
-            feature_stats = model_loader.get_feature_stats()
-            
-            features = {
-                # === TEMPORAL FEATURES ===
-                "Bulan": dt.month,
-                "Hari": dt.day,
-                "Hari_Minggu": dt.weekday(),
-                "Quarter": (dt.month - 1) // 3 + 1,
-                "Is_Weekend": 1 if dt.weekday() >= 5 else 0,
-                "Is_Akhir_Bulan": 1 if dt.day >= 28 else 0,
-                "Is_Awal_Bulan": 1 if dt.day <= 3 else 0,
-                "Hari_Dari_Awal_Bulan": dt.day,
-                
-                # === NOMINAL ===
-                "Nominal_Transaksi": nominal,
-                
-                # === BEHAVIOR FEATURES (mean dari training) ===
-                "Total_Transaksi": feature_stats["Total_Transaksi"]["mean"],
-                "Rata_Nominal": feature_stats["Rata_Nominal"]["mean"],
-                "Frekuensi_Per_Hari": feature_stats["Frekuensi_Per_Hari"]["mean"],
-                "Durasi_Aktif_Hari": feature_stats["Durasi_Aktif_Hari"]["mean"],
-                "Rata_Interval_Hari": feature_stats["Rata_Interval_Hari"]["mean"],
-                "Jumlah_Terlambat": feature_stats["Jumlah_Terlambat"]["mean"],
-                "Persentase_Terlambat": feature_stats["Persentase_Terlambat"]["mean"],
-                
-                # === TRANSACTION TYPE ===
-                "Is_TopUp": feature_stats["Is_TopUp"]["mean"],
-                "Is_QRIS": feature_stats["Is_QRIS"]["mean"],
-                "Is_Transfer": feature_stats["Is_Transfer"]["mean"],
-                
-                # === PROPORSI TRANSAKSI ===
-                "Prop_TopUp": feature_stats["Prop_TopUp"]["mean"],
-                "Prop_QRIS": feature_stats["Prop_QRIS"]["mean"],
-                "Prop_Transfer": feature_stats["Prop_Transfer"]["mean"],
-                
-                # === AKTIVITAS ===
-                "Aktivitas_Bulan_Ini": feature_stats["Aktivitas_Bulan_Ini"]["mean"],
-                "Aktivitas_Quarter_Ini": feature_stats["Aktivitas_Quarter_Ini"]["mean"],
-            }
-            
-            logger.debug(f"Built features for date={tanggal}, nominal={nominal}")
-            return features
-            
-        except Exception as e:
-            logger.error(f"Error building features: {e}")
-            raise
-    
-    def prepare_features(self, input_dict: Dict[str, Any]) -> np.ndarray:
-        """
-        Pastikan urutan fitur sama dengan training.
-        
-        Args:
-            input_dict: Dictionary berisi features
-            
-        Returns:
-            numpy array dengan urutan kolom yang benar
-        """
-        try:
-            feature_columns = model_loader.get_feature_columns()
-            
-            # Buat DataFrame dengan urutan kolom yang benar
-            df = pd.DataFrame(
-                [[input_dict.get(col, 0) for col in feature_columns]],
-                columns=feature_columns
-            )
-            
-            logger.debug(f"Prepared features with shape: {df.shape}")
-            return df.values
-            
-        except Exception as e:
-            logger.error(f"Error preparing features: {e}")
-            raise
-
-
-# Global instance
+"""
+Service untuk feature engineering
+"""
+import pandas as pd
+import numpy as np
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+import logging
+
+from app.services.model_loader import model_loader
+from app.services.feature_store import feature_store
+from app.services.activity_counter import activity_counter
+
+logger = logging.getLogger(__name__)
+
+
+class FeatureBuilder:
+    """Class untuk build features dari input"""
+    
+    def __init__(self):
+        pass
+    
+    def build_base_features(
+        self,
+        tanggal: str,
+        nominal: int,
+        entity_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Membentuk fitur dari input admin.
+        
+        Behavior dan aktivitas features diambil dari feature store / activity
+        counter jika entity sudah pernah terlihat, selain itu fallback ke mean
+        dari training.
+        
+        Args:
+            tanggal: Tanggal transaksi (format: YYYY-MM-DD)
+            nominal: Nominal transaksi
+            entity_id: Key entity di feature store (optional)
+            
+        Returns:
+            Dict berisi semua features
+        """
+        try:
+            dt = datetime.strptime(tanggal, "%Y-%m-%d")
+            feature_stats = model_loader.get_feature_stats()
+            behavior = dict(feature_store.get_features(entity_id) or {})
+            activity = activity_counter.get_activity(entity_id, dt)
+            if activity is not None:
+                behavior["Aktivitas_Bulan_Ini"], behavior["Aktivitas_Quarter_Ini"] = activity
+            
+            def behavior_or_mean(name: str) -> float:
+                if name in behavior:
+                    return behavior[name]
+                return feature_stats[name]["mean"]
+            
+            features = {
+                # === TEMPORAL FEATURES ===
+                "Bulan": dt.month,
+                "Hari": dt.day,
+                "Hari_Minggu": dt.weekday(),
+                "Quarter": (dt.month - 1) // 3 + 1,
+                "Is_Weekend": 1 if dt.weekday() >= 5 else 0,
+                "Is_Akhir_Bulan": 1 if dt.day >= 28 else 0,
+                "Is_Awal_Bulan": 1 if dt.day <= 3 else 0,
+                "Hari_Dari_Awal_Bulan": dt.day,
+                
+                # === NOMINAL ===
+                "Nominal_Transaksi": nominal,
+                
+                # === BEHAVIOR FEATURES (feature store / mean dari training) ===
+                "Total_Transaksi": behavior_or_mean("Total_Transaksi"),
+                "Rata_Nominal": behavior_or_mean("Rata_Nominal"),
+                "Frekuensi_Per_Hari": behavior_or_mean("Frekuensi_Per_Hari"),
+                "Durasi_Aktif_Hari": behavior_or_mean("Durasi_Aktif_Hari"),
+                "Rata_Interval_Hari": behavior_or_mean("Rata_Interval_Hari"),
+                "Jumlah_Terlambat": behavior_or_mean("Jumlah_Terlambat"),
+                "Persentase_Terlambat": behavior_or_mean("Persentase_Terlambat"),
+                
+                # === TRANSACTION TYPE ===
+                "Is_TopUp": feature_stats["Is_TopUp"]["mean"],
+                "Is_QRIS": feature_stats["Is_QRIS"]["mean"],
+                "Is_Transfer": feature_stats["Is_Transfer"]["mean"],
+                
+                # === PROPORSI TRANSAKSI ===
+                "Prop_TopUp": behavior_or_mean("Prop_TopUp"),
+                "Prop_QRIS": behavior_or_mean("Prop_QRIS"),
+                "Prop_Transfer": behavior_or_mean("Prop_Transfer"),
+                
+                # === AKTIVITAS ===
+                "Aktivitas_Bulan_Ini": behavior_or_mean("Aktivitas_Bulan_Ini"),
+                "Aktivitas_Quarter_Ini": behavior_or_mean("Aktivitas_Quarter_Ini"),
+            }
+            
+            logger.debug(
+                "Built features for date=%s, nominal=%s, entity=%s (store_hit=%s)",
+                tanggal, nominal, entity_id or "-", bool(behavior)
+            )
+            return features
+            
+        except Exception as e:
+            logger.error("Error building features: %s", e)
+            raise
+    
+    def prepare_features(self, input_dict: Dict[str, Any]) -> np.ndarray:
+        """
+        Pastikan urutan fitur sama dengan training.
+        
+        Args:
+            input_dict: Dictionary berisi features
+            
+        Returns:
+            numpy array dengan urutan kolom yang benar
+        """
+        try:
+            feature_columns = model_loader.get_feature_columns()
+            
+            # Buat DataFrame dengan urutan kolom yang benar
+            df = pd.DataFrame(
+                [[input_dict.get(col, 0) for col in feature_columns]],
+                columns=feature_columns
+            )
+            
+            logger.debug("Prepared features with shape: %s", df.shape)
+            return df.values
+            
+        except Exception as e:
+            logger.error("Error preparing features: %s", e)
+            raise
+    
+    def prepare_features_batch(self, input_dicts: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Susun banyak dict fitur menjadi satu matrix dengan urutan kolom training.
+        
+        Args:
+            input_dicts: List dictionary berisi features
+            
+        Returns:
+            numpy array (n_samples, n_features)
+        """
+        feature_columns = model_loader.get_feature_columns()
+        return np.array(
+            [[d.get(col, 0) for col in feature_columns] for d in input_dicts],
+            dtype=float
+        ).reshape(len(input_dicts), len(feature_columns))
+
+
+# Global instance
 feature_builder = FeatureBuilder()
\ No newline at end of file
@@ -0,0 +1,330 @@
+"""
+Service untuk feature store perilaku per customer / RT
+"""
+import os
+import pickle
+import threading
+from array import array
+from bisect import bisect_right
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, Any, Optional
+import logging
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FILE = "feature_store.pkl"
+SNAPSHOT_VERSION = 3
+
+SECONDS_PER_DAY = 86400
+
+
+def _gap_days(earlier: float, later: float) -> int:
+    """Selisih dua timestamp dalam hari penuh (floor), sama dengan Timedelta.days"""
+    return int((later - earlier) // SECONDS_PER_DAY)
+
+
+def feature_timezone() -> timezone:
+    """Zona waktu tanggal transaksi (sama dengan data training), bukan timezone server"""
+    return timezone(timedelta(hours=settings.FEATURE_TIMEZONE_OFFSET_HOURS))
+
+
+def to_epoch(dt: datetime) -> float:
+    """Timestamp POSIX; datetime tanpa tzinfo dianggap berada di feature_timezone()"""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=feature_timezone())
+    return dt.timestamp()
+
+
+class EntityAggregate:
+    """
+    Agregat running untuk satu entity (customer atau RT).
+
+    Counter di-update O(1) per event. Rata_Interval_Hari di training adalah
+    rata-rata selisih hari penuh (floor) antar transaksi berurutan, sehingga
+    jumlah selisih di-update dari tetangga event baru. Hanya timestamp pertama
+    dan `window` timestamp terakhir (terurut) yang disimpan: event yang datang
+    tidak berurutan di dalam window hasilnya persis sama dengan urutan asli.
+
+    Event yang lebih lama dari window (dan bukan yang paling awal) tidak
+    diketahui tetangganya. Jumlah selisih dibiarkan: floor(a) + floor(b)
+    berbeda paling banyak 1 dari floor(a + b), jadi error-nya paling banyak
+    1 hari per event seperti itu (dihitung di late_events).
+    """
+
+    __slots__ = (
+        "count",
+        "sum_nominal",
+        "late_count",
+        "topup_count",
+        "qris_count",
+        "transfer_count",
+        "first_ts",
+        "committed_ts",
+        "recent",
+        "gap_days_sum",
+        "late_events",
+    )
+
+    def __init__(self):
+        self.count = 0
+        self.sum_nominal = 0.0
+        self.late_count = 0
+        self.topup_count = 0
+        self.qris_count = 0
+        self.transfer_count = 0
+        self.first_ts: Optional[float] = None
+        # Timestamp terbesar yang sudah keluar dari window (None = semua masih di window)
+        self.committed_ts: Optional[float] = None
+        self.recent = array("d")
+        self.gap_days_sum = 0
+        self.late_events = 0
+
+    def _insert_timestamp(self, ts: float, window: int) -> bool:
+        """Sisipkan timestamp; False jika event lebih lama dari reorder window"""
+        if self.committed_ts is not None and ts < self.committed_ts:
+            if ts < self.first_ts:
+                # Event paling awal: tetangganya pasti first_ts
+                self.gap_days_sum += _gap_days(ts, self.first_ts)
+                self.first_ts = ts
+            self.late_events += 1
+            return False
+
+        recent = self.recent
+        idx = bisect_right(recent, ts)
+        prev_ts = recent[idx - 1] if idx > 0 else self.committed_ts
+        next_ts = recent[idx] if idx < len(recent) else None
+        if prev_ts is not None:
+            self.gap_days_sum += _gap_days(prev_ts, ts)
+        if next_ts is not None:
+            self.gap_days_sum += _gap_days(ts, next_ts)
+            if prev_ts is not None:
+                self.gap_days_sum -= _gap_days(prev_ts, next_ts)
+        if next_ts is None:
+            recent.append(ts)
+        else:
+            recent.insert(idx, ts)
+        while len(recent) > window:
+            self.committed_ts = recent.pop(0)
+        if self.first_ts is None or ts < self.first_ts:
+            self.first_ts = ts
+        return True
+
+    def update(self, ts: float, nominal: float, jenis: str, terlambat: bool, window: int) -> bool:
+        """Tambahkan satu event transaksi ke agregat; False jika event di luar reorder window"""
+        self.count += 1
+        self.sum_nominal += nominal
+        in_window = self._insert_timestamp(ts, max(window, 1))
+        if terlambat:
+            self.late_count += 1
+        if jenis == "topup":
+            self.topup_count += 1
+        elif jenis == "qris":
+            self.qris_count += 1
+        elif jenis == "transfer":
+            self.transfer_count += 1
+        return in_window
+
+    def to_features(self) -> Dict[str, float]:
+        """
+        Turunkan behavior features dengan definisi yang sama seperti training:
+
+        - Durasi_Aktif_Hari: selisih tanggal (kalender, di feature_timezone())
+          transaksi pertama dan terakhir
+        - Frekuensi_Per_Hari: Total_Transaksi / (Durasi_Aktif_Hari + 1)
+        - Rata_Interval_Hari: rata-rata Timestamp.diff().dt.days (selisih hari
+          penuh antar transaksi berurutan), 0 jika baru satu transaksi
+        """
+        count = self.count
+        tz = feature_timezone()
+        first_date = datetime.fromtimestamp(self.first_ts, tz=tz).date()
+        last_date = datetime.fromtimestamp(self.recent[-1], tz=tz).date()
+        durasi = float((last_date - first_date).days)
+        return {
+            "Total_Transaksi": float(count),
+            "Rata_Nominal": self.sum_nominal / count,
+            "Frekuensi_Per_Hari": count / (durasi + 1.0),
+            "Durasi_Aktif_Hari": durasi,
+            "Rata_Interval_Hari": self.gap_days_sum / (count - 1) if count > 1 else 0.0,
+            "Jumlah_Terlambat": float(self.late_count),
+            "Persentase_Terlambat": self.late_count / count * 100.0,
+            "Prop_TopUp": self.topup_count / count,
+            "Prop_QRIS": self.qris_count / count,
+            "Prop_Transfer": self.transfer_count / count,
+        }
+
+    def to_tuple(self) -> tuple:
+        """Serialisasi ringkas untuk snapshot (window di-copy, aman di-pickle di luar lock)"""
+        values = (getattr(self, name) for name in self.__slots__)
+        return tuple(array("d", value) if isinstance(value, array) else value for value in values)
+
+    @classmethod
+    def from_tuple(cls, values: tuple) -> "EntityAggregate":
+        """Bangun kembali agregat dari snapshot"""
+        agg = cls()
+        for name, value in zip(cls.__slots__, values):
+            setattr(agg, name, value)
+        return agg
+
+
+class FeatureStore:
+    """Class untuk menyimpan dan meng-update behavior features secara incremental"""
+
+    def __init__(self):
+        self._entities: Dict[str, EntityAggregate] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._events_ingested = 0
+        self._late_events = 0
+        self._last_snapshot: Optional[str] = None
+
+    @staticmethod
+    def resolve_entity_id(
+        customer_id: Optional[str] = None,
+        rt_number: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Tentukan key entity dari customer_id atau nomor RT.
+
+        Args:
+            customer_id: ID customer (prioritas utama)
+            rt_number: Nomor RT
+
+        Returns:
+            Key entity, atau None jika keduanya kosong
+        """
+        if customer_id:
+            return f"customer:{customer_id}"
+        if rt_number:
+            return f"rt:{rt_number}"
+        return None
+
+    def ingest(
+        self,
+        entity_id: str,
+        timestamp: datetime,
+        nominal: float,
+        jenis_transaksi: str,
+        terlambat: bool = False
+    ) -> None:
+        """
+        Update agregat entity dengan satu event transaksi (O(1)).
+
+        Args:
+            entity_id: Key entity (lihat resolve_entity_id)
+            timestamp: Waktu transaksi (tanpa tzinfo dianggap FEATURE_TIMEZONE_OFFSET_HOURS)
+            nominal: Nominal transaksi
+            jenis_transaksi: topup/qris/transfer
+            terlambat: Apakah pembayaran terlambat
+        """
+        ts = to_epoch(timestamp)
+        window = settings.FEATURE_STORE_REORDER_WINDOW
+        with self._lock:
+            agg = self._entities.get(entity_id)
+            if agg is None:
+                agg = EntityAggregate()
+                self._entities[entity_id] = agg
+            if not agg.update(ts, float(nominal), jenis_transaksi, terlambat, window):
+                self._late_events += 1
+            self._events_ingested += 1
+            self._dirty = True
+
+    def get_features(self, entity_id: Optional[str]) -> Optional[Dict[str, float]]:
+        """
+        Lookup behavior features untuk satu entity (O(1)).
+
+        Returns:
+            Dict features, atau None jika entity belum pernah terlihat
+        """
+        if not entity_id:
+            return None
+        with self._lock:
+            agg = self._entities.get(entity_id)
+            if agg is None or agg.count == 0:
+                return None
+            return agg.to_features()
+
+    def stats(self) -> Dict[str, Any]:
+        """Ringkasan kondisi feature store"""
+        return {
+            "entities": len(self._entities),
+            "events_ingested": self._events_ingested,
+            "late_events": self._late_events,
+            "dirty": self._dirty,
+            "last_snapshot": self._last_snapshot,
+        }
+
+    def save_snapshot(self, force: bool = False) -> bool:
+        """
+        Simpan snapshot agregat ke disk lokal secara atomik.
+
+        Args:
+            force: Simpan walaupun tidak ada perubahan sejak snapshot terakhir
+
+        Returns:
+            bool: True jika snapshot ditulis
+        """
+        with self._lock:
+            if not self._dirty and not force:
+                return False
+            payload = {
+                "version": SNAPSHOT_VERSION,
+                "events_ingested": self._events_ingested,
+                "late_events": self._late_events,
+                "entities": {key: agg.to_tuple() for key, agg in self._entities.items()},
+            }
+            self._dirty = False
+
+        snapshot_dir = Path(settings.FEATURE_STORE_DIR)
+        snapshot_dir.mkdir(parents=True, exist_ok=True)
+        target = snapshot_dir / SNAPSHOT_FILE
+        tmp = target.with_suffix(".tmp")
+        try:
+            with open(tmp, "wb") as f:
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, target)
+        except Exception:
+            with self._lock:
+                self._dirty = True
+            raise
+
+        self._last_snapshot = datetime.now().isoformat()
+        logger.info(f"💾 Feature store snapshot saved: {len(payload['entities'])} entities")
+        return True
+
+    def load_snapshot(self) -> bool:
+        """
+        Load snapshot terakhir dari disk lokal (jika ada).
+
+        Returns:
+            bool: True jika snapshot berhasil di-load
+        """
+        target = Path(settings.FEATURE_STORE_DIR) / SNAPSHOT_FILE
+        if not target.exists():
+            logger.info("Feature store snapshot belum ada, mulai dari kosong")
+            return False
+
+        with open(target, "rb") as f:
+            payload = pickle.load(f)
+
+        if payload.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"Versi snapshot feature store tidak didukung: {payload.get('version')}")
+
+        entities = {
+            key: EntityAggregate.from_tuple(values)
+            for key, values in payload["entities"].items()
+        }
+        with self._lock:
+            self._entities = entities
+            self._events_ingested = payload.get("events_ingested", 0)
+            self._late_events = payload.get("late_events", 0)
+            self._dirty = False
+
+        logger.info(f"✓ Loaded feature store snapshot with {len(entities)} entities")
+        return True
+
+
+# Global instance
+feature_store = FeatureStore()
@@ -0,0 +1,534 @@
+"""
+Service untuk background job scoring batch besar
+"""
+import csv
+import json
+import multiprocessing
+import os
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO, Dict, Any, Iterator, List, Optional
+import logging
+
+from pydantic import ValidationError
+
+from app.config import settings
+from app.models.schemas import PredictionRequest
+
+logger = logging.getLogger(__name__)
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_COMPLETED = "completed"
+STATUS_FAILED = "failed"
+
+INPUT_FILE = "input.json"
+INPUT_CSV_FILE = "input.csv"
+STATUS_FILE = "status.json"
+RESULT_FILE = "result.csv"
+OWNERS_DIR = ".owners"
+
+COPY_CHUNK_SIZE = 1024 * 1024
+
+# Kolom file CSV upload (rt_number & customer_id boleh kosong)
+INPUT_CSV_COLUMNS = ["tanggal", "nominal", "target_type", "rt_number", "customer_id"]
+
+RESULT_COLUMNS = [
+    "index",
+    "tanggal",
+    "nominal",
+    "target_type",
+    "rt_number",
+    "customer_id",
+    "risk_score",
+    "risk_status",
+]
+
+
+class UploadTooLargeError(ValueError):
+    """File upload melebihi JOB_MAX_UPLOAD_MB"""
+
+
+def _write_json_atomic(path: Path, payload: Dict[str, Any]) -> None:
+    """Tulis JSON ke file secara atomik (tmp + rename)"""
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump(payload, f)
+    os.replace(tmp, path)
+
+
+def _read_json(path: Path) -> Dict[str, Any]:
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def _count_csv_rows(path: Path) -> int:
+    """Jumlah baris data (tanpa header) di file CSV input"""
+    with open(path, "r", newline="", encoding="utf-8-sig") as f:
+        return max(0, sum(1 for _ in csv.reader(f)) - 1)
+
+
+def _iter_csv_items(path: Path) -> Iterator[Dict[str, Any]]:
+    """Baca dan validasi file CSV input baris per baris (streaming)"""
+    with open(path, "r", newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        missing = [c for c in ("tanggal", "nominal", "target_type") if c not in (reader.fieldnames or [])]
+        if missing:
+            raise ValueError(f"Kolom CSV wajib tidak ada: {', '.join(missing)}")
+
+        for row in reader:
+            values = {c: (row.get(c) or "").strip() or None for c in INPUT_CSV_COLUMNS}
+            try:
+                yield PredictionRequest(**values).model_dump()
+            except ValidationError as e:
+                raise ValueError(f"Baris {reader.line_num}: {e.errors()[0]['msg']}") from None
+
+
+def _iter_input_chunks(job_path: Path, chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Input job (JSON atau CSV upload) dalam chunk berukuran chunk_size"""
+    if (job_path / INPUT_CSV_FILE).exists():
+        chunk = []
+        for item in _iter_csv_items(job_path / INPUT_CSV_FILE):
+            chunk.append(item)
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+    else:
+        items = _read_json(job_path / INPUT_FILE)["items"]
+        for start in range(0, len(items), chunk_size):
+            yield items[start:start + chunk_size]
+
+
+# ==================== WORKER PROCESS ====================
+
+def _init_worker() -> None:
+    """
+    Inisialisasi worker process: turunkan prioritas CPU dan load models sekali.
+
+    Worker berjalan dengan prioritas lebih rendah dan jumlah thread terbatas
+    agar tidak mengambil CPU dari route /predict di proses utama.
+    """
+    try:
+        os.nice(settings.JOB_WORKER_NICE)
+    except (AttributeError, OSError):
+        pass
+
+    from app.services.model_loader import model_loader
+    from app.services.feature_store import feature_store
+    from app.services.activity_counter import activity_counter
+
+    model_loader.load_models()
+    for model in model_loader.get_level0_models().values():
+        if hasattr(model, "n_jobs"):
+            model.n_jobs = settings.JOB_WORKER_THREADS
+
+    try:
+        feature_store.load_snapshot()
+        activity_counter.load_snapshot()
+    except Exception as e:
+        logger.warning(f"Job worker berjalan tanpa snapshot feature store: {e}")
+
+
+def _run_job(job_dir: str) -> None:
+    """
+    Jalankan satu job scoring di worker process.
+
+    Input diproses per chunk; progress ditulis ke status.json setelah setiap
+    chunk dan hasil ditulis bertahap ke result.csv.
+    """
+    from app.services.predictor import predictor
+    from app.services.feature_store import FeatureStore
+    from app.utils.risk_analyzer import risk_analyzer
+
+    job_path = Path(job_dir)
+    status_path = job_path / STATUS_FILE
+    status = _read_json(status_path)
+    status.update(state=STATUS_RUNNING, started_at=datetime.now().isoformat())
+    _write_json_atomic(status_path, status)
+
+    partial_path = job_path / (RESULT_FILE + ".part")
+    try:
+        if status["total"] is None:
+            # Upload CSV: jumlah baris baru dihitung di worker, bukan di event loop
+            status["total"] = _count_csv_rows(job_path / INPUT_CSV_FILE)
+            if status["total"] > settings.JOB_MAX_ITEMS:
+                raise ValueError(f"Maksimal {settings.JOB_MAX_ITEMS} item per job")
+            _write_json_atomic(status_path, status)
+
+        start = 0
+        with open(partial_path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(RESULT_COLUMNS)
+
+            for chunk in _iter_input_chunks(job_path, settings.JOB_CHUNK_SIZE):
+                for item in chunk:
+                    item["entity_id"] = FeatureStore.resolve_entity_id(
+                        item.get("customer_id"), item.get("rt_number")
+                    )
+                results = predictor.predict_batch(chunk)
+                for offset, (item, result) in enumerate(zip(chunk, results)):
+                    risk_score = round(result["risk_score"], 2)
+                    writer.writerow([
+                        start + offset,
+                        item["tanggal"],
+                        item["nominal"],
+                        item.get("target_type", ""),
+                        item.get("rt_number") or "",
+                        item.get("customer_id") or "",
+                        risk_score,
+                        risk_analyzer.categorize_risk(risk_score)["status"],
+                    ])
+                f.flush()
+
+                start += len(chunk)
+                status["processed"] = start
+                status["progress"] = round(start / max(status["total"], 1) * 100, 2)
+                _write_json_atomic(status_path, status)
+
+        os.replace(partial_path, job_path / RESULT_FILE)
+        status.update(state=STATUS_COMPLETED, finished_at=datetime.now().isoformat())
+        _write_json_atomic(status_path, status)
+
+    except Exception as e:
+        status.update(
+            state=STATUS_FAILED,
+            error=str(e),
+            finished_at=datetime.now().isoformat()
+        )
+        _write_json_atomic(status_path, status)
+        raise
+
+
+# ==================== JOB MANAGER ====================
+
+class JobManager:
+    """
+    Class untuk submit, tracking, dan download hasil background job.
+
+    Beberapa proses server (contoh: uvicorn --workers N) bisa berbagi JOB_DIR.
+    Setiap proses punya owner_id dan memperbarui file heartbeat di
+    JOB_DIR/.owners secara berkala; job queued/running hanya dianggap terputus
+    jika heartbeat pemiliknya sudah basi (proses pemilik mati), sehingga job
+    milik proses lain yang masih hidup tidak ikut ditandai gagal.
+    """
+
+    def __init__(self):
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._futures: Dict[str, Future] = {}
+        self.owner_id = uuid.uuid4().hex
+        self._stop_heartbeat = threading.Event()
+        self._heartbeat_thread: Optional[threading.Thread] = None
+
+    @property
+    def job_dir(self) -> Path:
+        return Path(settings.JOB_DIR)
+
+    def start(self) -> None:
+        """Buat worker process pool dan mulai heartbeat + recovery job terputus"""
+        self.job_dir.mkdir(parents=True, exist_ok=True)
+        self._heartbeat()
+        self._recover_interrupted_jobs()
+        self._executor = self._create_executor()
+        self._stop_heartbeat.clear()
+        self._heartbeat_thread = threading.Thread(
+            target=self._heartbeat_loop, name="job-heartbeat", daemon=True
+        )
+        self._heartbeat_thread.start()
+        logger.info(f"✓ Job worker pool started with {settings.JOB_MAX_CONCURRENT} workers")
+
+    def shutdown(self) -> None:
+        """Hentikan worker pool; job yang belum mulai dibatalkan"""
+        self._stop_heartbeat.set()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    @staticmethod
+    def _create_executor() -> ProcessPoolExecutor:
+        """Worker process pool untuk menjalankan job"""
+        # spawn: worker tidak mewarisi thread (logging, event loop) dari proses utama
+        return ProcessPoolExecutor(
+            max_workers=settings.JOB_MAX_CONCURRENT,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker
+        )
+
+    def _submit_to_pool(self, job_path: Path) -> Future:
+        """
+        Antrekan job ke worker pool.
+
+        Jika satu worker pernah crash (OOM, segfault di native code), pool
+        berstatus broken dan setiap submit gagal; pool dibuat ulang sekali.
+        """
+        executor = self._executor
+        try:
+            return executor.submit(_run_job, str(job_path))
+        except BrokenProcessPool:
+            with self._executor_lock:
+                # Thread lain mungkin sudah membuat pool baru
+                if self._executor is executor:
+                    logger.warning("⚠️ Job worker pool broken, recreating")
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    self._executor = self._create_executor()
+                executor = self._executor
+            return executor.submit(_run_job, str(job_path))
+
+    # ==================== OWNERSHIP & RECOVERY ====================
+
+    def _heartbeat(self) -> None:
+        """Tandai proses ini masih hidup (mtime file owner)"""
+        owners_dir = self.job_dir / OWNERS_DIR
+        owners_dir.mkdir(parents=True, exist_ok=True)
+        (owners_dir / self.owner_id).touch()
+
+    def _heartbeat_loop(self) -> None:
+        """
+        Heartbeat berkala; sekaligus ambil alih recovery job milik proses yang
+        mati dan hapus job selesai yang sudah melewati JOB_TTL_HOURS
+        """
+        while not self._stop_heartbeat.wait(settings.JOB_HEARTBEAT_INTERVAL):
+            try:
+                self._heartbeat()
+                self._recover_interrupted_jobs()
+                self._cleanup_expired_jobs()
+            except Exception as e:
+                logger.warning(f"⚠️ Job heartbeat failed: {e}")
+
+    def _owner_alive(self, owner_id: Optional[str], now: float) -> bool:
+        """True jika heartbeat pemilik job masih dalam batas JOB_STALE_AFTER"""
+        if owner_id == self.owner_id:
+            return True
+        if not owner_id:
+            return False
+        try:
+            last_seen = (self.job_dir / OWNERS_DIR / owner_id).stat().st_mtime
+        except OSError:
+            return False
+        return now - last_seen <= settings.JOB_STALE_AFTER
+
+    def _recover_interrupted_jobs(self) -> int:
+        """
+        Tandai gagal job queued/running yang proses pemiliknya sudah mati.
+
+        Returns:
+            int: Jumlah job yang ditandai gagal
+        """
+        now = time.time()
+        recovered = 0
+        for status_path in self.job_dir.glob(f"*/{STATUS_FILE}"):
+            try:
+                status = _read_json(status_path)
+            except Exception:
+                continue
+            if status.get("state") not in (STATUS_QUEUED, STATUS_RUNNING):
+                continue
+            if self._owner_alive(status.get("owner"), now):
+                continue
+            status.update(
+                state=STATUS_FAILED,
+                error="Job terputus karena server restart",
+                finished_at=datetime.now().isoformat()
+            )
+            _write_json_atomic(status_path, status)
+            recovered += 1
+
+        if recovered:
+            logger.warning(f"⚠️ Marked {recovered} interrupted jobs as failed")
+        return recovered
+
+    def _cleanup_expired_jobs(self) -> int:
+        """
+        Hapus folder job completed/failed yang lebih lama dari JOB_TTL_HOURS
+        (dihitung dari update terakhir status.json), beserta file heartbeat
+        proses yang sudah mati selama itu.
+
+        Returns:
+            int: Jumlah job yang dihapus
+        """
+        cutoff = time.time() - settings.JOB_TTL_HOURS * 3600
+        removed = 0
+        for status_path in self.job_dir.glob(f"*/{STATUS_FILE}"):
+            try:
+                if status_path.stat().st_mtime > cutoff:
+                    continue
+                status = _read_json(status_path)
+            except Exception:
+                continue
+            if status.get("state") not in (STATUS_COMPLETED, STATUS_FAILED):
+                continue
+            shutil.rmtree(status_path.parent, ignore_errors=True)
+            removed += 1
+
+        for owner_path in (self.job_dir / OWNERS_DIR).glob("*"):
+            try:
+                if owner_path.name != self.owner_id and owner_path.stat().st_mtime <= cutoff:
+                    owner_path.unlink()
+            except OSError:
+                continue
+
+        if removed:
+            logger.info(f"🧹 Removed {removed} expired jobs")
+        return removed
+
+    # ==================== SUBMIT ====================
+
+    def _create_job(self, total: Optional[int], write_input) -> Dict[str, Any]:
+        """Buat folder job, tulis input, lalu antrekan ke worker pool"""
+        if self._executor is None:
+            raise RuntimeError("Job worker pool belum berjalan")
+
+        job_id = uuid.uuid4().hex
+        job_path = self.job_dir / job_id
+        job_path.mkdir(parents=True)
+        try:
+            write_input(job_path)
+        except BaseException:
+            shutil.rmtree(job_path, ignore_errors=True)
+            raise
+
+        status = {
+            "job_id": job_id,
+            "state": STATUS_QUEUED,
+            "owner": self.owner_id,
+            "total": total,
+            "processed": 0,
+            "progress": 0.0,
+            "created_at": datetime.now().isoformat(),
+            "started_at": None,
+            "finished_at": None,
+            "error": None,
+        }
+        _write_json_atomic(job_path / STATUS_FILE, status)
+
+        try:
+            future = self._submit_to_pool(job_path)
+        except Exception as e:
+            # Tanpa ini job tetap queued milik owner yang masih hidup, dan tidak pernah di-recover
+            status.update(
+                state=STATUS_FAILED,
+                error=f"Gagal mengantrekan job: {e}",
+                finished_at=datetime.now().isoformat()
+            )
+            _write_json_atomic(job_path / STATUS_FILE, status)
+            raise RuntimeError(f"Job worker pool tidak tersedia: {e}") from e
+        future.add_done_callback(lambda f, job_id=job_id: self._on_job_done(job_id, f))
+        self._futures[job_id] = future
+        return status
+
+    def submit(self, items: List[PredictionRequest]) -> Dict[str, Any]:
+        """
+        Submit job scoring dari list input (body JSON yang sudah divalidasi).
+
+        Args:
+            items: List input prediksi
+
+        Returns:
+            Status awal job
+        """
+        def write_input(job_path: Path) -> None:
+            with open(job_path / INPUT_FILE, "w") as f:
+                json.dump({"items": [item.model_dump() for item in items]}, f)
+
+        status = self._create_job(len(items), write_input)
+        logger.info(f"📥 Job {status['job_id']} submitted with {len(items)} items")
+        return status
+
+    def submit_file(self, source: BinaryIO, max_bytes: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Submit job scoring dari file CSV upload.
+
+        File hanya di-copy ke folder job; parsing, validasi per baris, dan
+        pengecekan JOB_MAX_ITEMS dilakukan oleh worker process.
+
+        Args:
+            source: File object CSV (header: tanggal, nominal, target_type,
+                rt_number, customer_id)
+            max_bytes: Batas ukuran file (default JOB_MAX_UPLOAD_MB)
+
+        Returns:
+            Status awal job (total masih None sampai worker mulai)
+
+        Raises:
+            UploadTooLargeError: File melebihi max_bytes (folder job dihapus)
+        """
+        if max_bytes is None:
+            max_bytes = settings.JOB_MAX_UPLOAD_MB * 1024 * 1024
+
+        def write_input(job_path: Path) -> None:
+            # Ukuran dihitung saat copy: file.size dari client tidak selalu ada
+            copied = 0
+            with open(job_path / INPUT_CSV_FILE, "wb") as f:
+                while True:
+                    chunk = source.read(COPY_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    copied += len(chunk)
+                    if copied > max_bytes:
+                        raise UploadTooLargeError(
+                            f"Ukuran file maksimal {max_bytes // (1024 * 1024)} MB"
+                        )
+                    f.write(chunk)
+
+        status = self._create_job(None, write_input)
+        logger.info(f"📥 Job {status['job_id']} submitted from CSV upload")
+        return status
+
+    def _on_job_done(self, job_id: str, future: Future) -> None:
+        """Catat job yang gagal, termasuk jika worker process crash"""
+        self._futures.pop(job_id, None)
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is None:
+            return
+
+        logger.error(f"❌ Job {job_id} failed: {error}")
+        status_path = self.job_dir / job_id / STATUS_FILE
+        try:
+            status = _read_json(status_path)
+            if status.get("state") != STATUS_FAILED:
+                status.update(
+                    state=STATUS_FAILED,
+                    error=str(error),
+                    finished_at=datetime.now().isoformat()
+                )
+                _write_json_atomic(status_path, status)
+        except Exception:
+            pass
+
+    def get_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get status dan progress job.
+
+        Returns:
+            Dict status, atau None jika job tidak ditemukan
+        """
+        status_path = self.job_dir / job_id / STATUS_FILE
+        if not self._is_valid_job_id(job_id) or not status_path.exists():
+            return None
+        return _read_json(status_path)
+
+    def get_result_path(self, job_id: str) -> Optional[Path]:
+        """Path file hasil job, atau None jika belum tersedia"""
+        result_path = self.job_dir / job_id / RESULT_FILE
+        if not self._is_valid_job_id(job_id) or not result_path.exists():
+            return None
+        return result_path
+
+    @staticmethod
+    def _is_valid_job_id(job_id: str) -> bool:
+        """Job ID adalah uuid4 hex; cegah path traversal"""
+        return len(job_id) == 32 and all(c in "0123456789abcdef" for c in job_id)
+
+
+# Global instance
+job_manager = JobManager()
@@ -1,117 +1,170 @@
-"""
-Service untuk melakukan prediksi
-"""
-import numpy as np
-from typing import Dict, Any
-import logging
-
-from app.services.model_loader import model_loader
-from app.services.feature_builder import feature_builder
-
-logger = logging.getLogger(__name__)
-
-
-class Predictor:
-    """Class untuk melakukan prediksi menggunakan stacking ensemble"""
-    
-    def __init__(self):
-        pass
-    
-    def predict(self, tanggal: str, nominal: int, verbose: bool = False) -> Dict[str, Any]:
-        """
-        Prediksi risiko terlambat menggunakan multi-level stacking ensemble.
-        
-        Args:
-            tanggal: Tanggal transaksi (YYYY-MM-DD)
-            nominal: Nominal transaksi (Rupiah)
-            verbose: Return detail prediksi per level
-            
-        Returns:
-            Dict berisi hasil prediksi dan detail (jika verbose=True)
-        """
-        try:
-            # Build features
-            base_dict = feature_builder.build_base_features(tanggal, nominal)
-            X = feature_builder.prepare_features(base_dict)
-            
-            result = {
-                "risk_score": 0.0,
-                "details": {} if verbose else None
-            }
-            
-            # Get models
-            level0_models = model_loader.get_level0_models()
-            level1_models = model_loader.get_level1_models()
-            
-            # === LEVEL 0: Base Models ===
-            level0_preds = []
-            level0_details = {}
-            
-            for name, model in level0_models.items():
-                pred = model.predict(X)[0]
-                level0_preds.append(pred)
-                level0_details[name] = float(pred)
-                logger.debug(f"Level 0 - {name}: {pred:.4f}")
-            
-            level0_array = np.array(level0_preds).reshape(1, -1)
-            level0_avg = float(np.mean(level0_preds))
-            
-            if verbose:
-                result["details"]["level0"] = level0_details
-                result["details"]["level0_average"] = level0_avg
-            
-            # === LEVEL 1: Meta Model ===
-            level1_preds = []
-            level1_details = {}
-            
-            for name, model in level1_models.items():
-                pred = model.predict(level0_array)[0]
-                level1_preds.append(pred)
-                level1_details[name] = float(pred)
-                logger.debug(f"Level 1 - {name}: {pred:.4f}")
-            
-            # Final prediction
-            final_pred = float(np.mean(level1_preds))
-            
-            if verbose:
-                result["details"]["level1"] = level1_details
-            
-            result["risk_score"] = final_pred
-            
-            logger.info(f"Prediction completed: risk_score={final_pred:.4f}")
-            return result
-            
-        except Exception as e:
-            logger.error(f"Error during prediction: {e}")
-            raise
-    
-    def predict_batch(self, requests: list) -> list:
-        """
-        Prediksi batch untuk multiple inputs.
-        
-        Args:
-            requests: List of dict dengan keys 'tanggal' dan 'nominal'
-            
-        Returns:
-            List of prediction results
-        """
-        try:
-            results = []
-            for req in requests:
-                result = self.predict(
-                    tanggal=req["tanggal"],
-                    nominal=req["nominal"],
-                    verbose=req.get("verbose", False)
-                )
-                results.append(result)
-            
-            logger.info(f"Batch prediction completed: {len(results)} items")
-            return results
-            
-        except Exception as e:
-            logger.error(f"Error during batch prediction: {e}")
-            raise
-
-
-# Global instance
+"""
+Service untuk melakukan prediksi
+"""
+import numpy as np
+from typing import Dict, Any, Optional
+import logging
+
+from app.services.model_loader import model_loader
+from app.services.feature_builder import feature_builder
+from app.services.drift_monitor import drift_monitor
+
+logger = logging.getLogger(__name__)
+
+
+class Predictor:
+    """Class untuk melakukan prediksi menggunakan stacking ensemble"""
+    
+    def __init__(self):
+        pass
+    
+    def predict(
+        self,
+        tanggal: str,
+        nominal: int,
+        verbose: bool = False,
+        entity_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Prediksi risiko terlambat menggunakan multi-level stacking ensemble.
+        
+        Args:
+            tanggal: Tanggal transaksi (YYYY-MM-DD)
+            nominal: Nominal transaksi (Rupiah)
+            verbose: Return detail prediksi per level
+            entity_id: Key entity di feature store (optional)
+            
+        Returns:
+            Dict berisi hasil prediksi dan detail (jika verbose=True)
+        """
+        try:
+            # Build features
+            base_dict = feature_builder.build_base_features(tanggal, nominal, entity_id)
+            X = feature_builder.prepare_features(base_dict)
+            drift_monitor.observe(X)
+            
+            result = {
+                "risk_score": 0.0,
+                "details": {} if verbose else None
+            }
+            
+            # Get models
+            level0_models = model_loader.get_level0_models()
+            level1_models = model_loader.get_level1_models()
+            
+            # === LEVEL 0: Base Models ===
+            level0_preds = []
+            level0_details = {}
+            
+            for name, model in level0_models.items():
+                pred = model.predict(X)[0]
+                level0_preds.append(pred)
+                level0_details[name] = float(pred)
+                logger.debug("Level 0 - %s: %.4f", name, pred)
+            
+            level0_array = np.array(level0_preds).reshape(1, -1)
+            level0_avg = float(np.mean(level0_preds))
+            
+            if verbose:
+                result["details"]["level0"] = level0_details
+                result["details"]["level0_average"] = level0_avg
+            
+            # === LEVEL 1: Meta Model ===
+            level1_preds = []
+            level1_details = {}
+            
+            for name, model in level1_models.items():
+                pred = model.predict(level0_array)[0]
+                level1_preds.append(pred)
+                level1_details[name] = float(pred)
+                logger.debug("Level 1 - %s: %.4f", name, pred)
+            
+            # Final prediction
+            final_pred = float(np.mean(level1_preds))
+            
+            if verbose:
+                result["details"]["level1"] = level1_details
+            
+            result["risk_score"] = final_pred
+            
+            logger.debug("Prediction completed: risk_score=%.4f", final_pred)
+            return result
+            
+        except Exception as e:
+            logger.error("Error during prediction: %s", e)
+            raise
+    
+    def predict_batch(self, requests: list) -> list:
+        """
+        Prediksi batch untuk multiple inputs.
+        
+        Semua input disusun menjadi satu feature matrix sehingga setiap model
+        hanya dipanggil sekali per batch.
+        
+        Args:
+            requests: List of dict dengan keys 'tanggal' dan 'nominal'
+                (optional: 'verbose', 'entity_id')
+            
+        Returns:
+            List of prediction results (format sama dengan predict())
+        """
+        try:
+            if not requests:
+                return []
+            
+            base_dicts = [
+                feature_builder.build_base_features(
+                    req["tanggal"], req["nominal"], req.get("entity_id")
+                )
+                for req in requests
+            ]
+            X = feature_builder.prepare_features_batch(base_dicts)
+            drift_monitor.observe(X)
+            
+            level0_models = model_loader.get_level0_models()
+            level1_models = model_loader.get_level1_models()
+            
+            # === LEVEL 0: satu panggilan per model untuk seluruh batch ===
+            level0_names = list(level0_models.keys())
+            level0_array = np.column_stack(
+                [level0_models[name].predict(X) for name in level0_names]
+            )
+            
+            # === LEVEL 1: Meta Model ===
+            level1_names = list(level1_models.keys())
+            level1_array = np.column_stack(
+                [level1_models[name].predict(level0_array) for name in level1_names]
+            )
+            final_preds = level1_array.mean(axis=1)
+            
+            results = []
+            for i, req in enumerate(requests):
+                verbose = req.get("verbose", False)
+                result = {
+                    "risk_score": float(final_preds[i]),
+                    "details": None
+                }
+                if verbose:
+                    result["details"] = {
+                        "level0": {
+                            name: float(level0_array[i, j])
+                            for j, name in enumerate(level0_names)
+                        },
+                        "level0_average": float(level0_array[i].mean()),
+                        "level1": {
+                            name: float(level1_array[i, j])
+                            for j, name in enumerate(level1_names)
+                        }
+                    }
+                results.append(result)
+            
+            logger.info("Batch prediction completed: %d items", len(results))
+            return results
+            
+        except Exception as e:
+            logger.error("Error during batch prediction: %s", e)
+            raise
+
+
+# Global instance
 predictor = Predictor()
\ No newline at end of file
@@ -0,0 +1,182 @@
+"""
+Utility untuk admission control dan load shedding pada route prediksi
+"""
+import math
+import time
+from typing import Dict, Any, Optional
+
+from fastapi import status
+from fastapi.responses import JSONResponse
+
+from app.config import settings
+
+PRIORITY_HIGH = "high"
+PRIORITY_LOW = "low"
+PRIORITIES = (PRIORITY_HIGH, PRIORITY_LOW)
+
+# Bobot sample latency terbaru pada EWMA
+LATENCY_EWMA_ALPHA = 0.2
+
+
+class AdmissionController:
+    """
+    Class untuk memutuskan apakah request boleh diproses.
+
+    Request ditolak lebih awal jika jumlah request in-flight melewati batas
+    kelas prioritasnya, atau jika latency terbaru (EWMA) kelas itu sendiri
+    melewati target. Kelas low (bulk / verbose) di-shed lebih dulu sehingga
+    kapasitas tersisa tetap tersedia untuk /predict, dan latency low yang
+    lambat tidak ikut menolak request high.
+
+    Saat satu kelas ditolak karena latency, tidak ada sample baru yang masuk.
+    Karena itu EWMA meluruh terhadap waktu sejak sample terakhir, dan secara
+    berkala satu request probe tetap diterima untuk mengukur latency terbaru.
+    """
+
+    def __init__(self):
+        self.enabled = settings.ADMISSION_ENABLED
+        self.max_concurrency = settings.ADMISSION_MAX_CONCURRENCY
+        self.limits = {
+            PRIORITY_HIGH: self.max_concurrency,
+            PRIORITY_LOW: max(1, int(self.max_concurrency * settings.ADMISSION_LOW_PRIORITY_SHARE)),
+        }
+        self.latency_targets = {
+            PRIORITY_HIGH: settings.ADMISSION_LATENCY_TARGET_MS / 1000 * settings.ADMISSION_HIGH_LATENCY_FACTOR,
+            PRIORITY_LOW: settings.ADMISSION_LATENCY_TARGET_MS / 1000,
+        }
+        self.route_priorities: Dict[str, str] = settings.ADMISSION_ROUTE_PRIORITIES
+
+        # Semua update terjadi di event loop thread, jadi tidak perlu lock
+        self.in_flight = 0
+        self.in_flight_by_priority = {p: 0 for p in PRIORITIES}
+        self.admitted = {p: 0 for p in PRIORITIES}
+        self.rejected = {p: 0 for p in PRIORITIES}
+        self.probes = {p: 0 for p in PRIORITIES}
+        self._latency_ewma = {p: 0.0 for p in PRIORITIES}
+        self._last_sample_at = {p: 0.0 for p in PRIORITIES}
+        self._last_probe_at = {p: 0.0 for p in PRIORITIES}
+
+    def priority_for(self, path: str) -> Optional[str]:
+        """Kelas prioritas untuk route, atau None jika route tidak dikontrol"""
+        return self.route_priorities.get(path)
+
+    def _recent_latency(self, priority: str, now: float) -> float:
+        """EWMA latency kelas prioritas, diluruhkan sesuai umur sample terakhir"""
+        age = max(0.0, now - self._last_sample_at[priority])
+        return self._latency_ewma[priority] * 0.5 ** (age / settings.ADMISSION_LATENCY_HALF_LIFE)
+
+    def _reject(self, priority: str, latency: float) -> int:
+        """Catat penolakan dan hitung nilai Retry-After (detik)"""
+        self.rejected[priority] += 1
+        # Estimasi waktu sampai antrean saat ini selesai diproses
+        drain_time = latency * self.in_flight / self.max_concurrency
+        return max(1, math.ceil(drain_time))
+
+    def try_acquire(self, priority: str) -> Optional[int]:
+        """
+        Coba admit satu request.
+
+        Args:
+            priority: Kelas prioritas request
+
+        Returns:
+            None jika request diterima, atau nilai Retry-After (detik) jika ditolak
+        """
+        now = time.monotonic()
+        latency = self._recent_latency(priority, now)
+        if self.in_flight >= self.limits[priority]:
+            return self._reject(priority, latency)
+
+        if latency > self.latency_targets[priority]:
+            # Probe: satu request jika kelas ini kosong dan sudah satu interval
+            # tanpa sample maupun probe baru
+            last_seen = max(self._last_sample_at[priority], self._last_probe_at[priority])
+            if self.in_flight_by_priority[priority] > 0 or \
+                    now - last_seen < settings.ADMISSION_PROBE_INTERVAL:
+                return self._reject(priority, latency)
+            self._last_probe_at[priority] = now
+            self.probes[priority] += 1
+
+        self.in_flight += 1
+        self.in_flight_by_priority[priority] += 1
+        self.admitted[priority] += 1
+        return None
+
+    def release(self, priority: str, latency: float) -> None:
+        """
+        Tandai request selesai dan update latency EWMA kelasnya.
+
+        Args:
+            priority: Kelas prioritas request
+            latency: Durasi request (detik)
+        """
+        self.in_flight -= 1
+        self.in_flight_by_priority[priority] -= 1
+        now = time.monotonic()
+        recent = self._recent_latency(priority, now)
+        if recent == 0.0:
+            self._latency_ewma[priority] = latency
+        else:
+            self._latency_ewma[priority] = recent + LATENCY_EWMA_ALPHA * (latency - recent)
+        self._last_sample_at[priority] = now
+
+    def stats(self) -> Dict[str, Any]:
+        """Ringkasan kondisi admission controller"""
+        now = time.monotonic()
+        return {
+            "enabled": self.enabled,
+            "in_flight": self.in_flight,
+            "limits": self.limits,
+            "latency_targets_ms": {p: round(t * 1000, 2) for p, t in self.latency_targets.items()},
+            "by_priority": {
+                p: {
+                    "in_flight": self.in_flight_by_priority[p],
+                    "latency_ewma_ms": round(self._recent_latency(p, now) * 1000, 2),
+                    "admitted": self.admitted[p],
+                    "rejected": self.rejected[p],
+                    "probes": self.probes[p],
+                }
+                for p in PRIORITIES
+            },
+        }
+
+
+class AdmissionControlMiddleware:
+    """ASGI middleware yang menolak request dengan 503 + Retry-After saat overload"""
+
+    def __init__(self, app, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] == "OPTIONS" or not self.controller.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        priority = self.controller.priority_for(scope["path"])
+        if priority is None:
+            await self.app(scope, receive, send)
+            return
+
+        retry_after = self.controller.try_acquire(priority)
+        if retry_after is not None:
+            response = JSONResponse(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                content={
+                    "success": False,
+                    "error": "Server sedang sibuk. Silakan coba lagi.",
+                },
+                headers={"Retry-After": str(retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(priority, time.perf_counter() - start)
+
+
+# Global instance
+admission_controller = AdmissionController()
@@ -0,0 +1,186 @@
+"""
+Utility untuk setup logging non-blocking (queue + background writer thread)
+"""
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from app.config import settings
+
+# Route HTTP yang sedang diproses, dipakai untuk sampling per route
+current_route: ContextVar[Optional[str]] = ContextVar("current_route", default=None)
+
+PLAIN_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
+class JsonFormatter(logging.Formatter):
+    """Formatter untuk structured log (satu JSON object per baris)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        route = getattr(record, "route", None)
+        if route:
+            payload["route"] = route
+        fields = getattr(record, "fields", None)
+        if fields:
+            payload.update(fields)
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class RouteSamplingFilter(logging.Filter):
+    """
+    Filter sampling berdasarkan route.
+
+    Record WARNING ke atas selalu diteruskan; record di bawahnya hanya
+    diteruskan dengan probabilitas sesuai sample rate route tersebut.
+    """
+
+    def __init__(self, sample_rates: Dict[str, float]):
+        super().__init__()
+        self.sample_rates = sample_rates
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        route = current_route.get()
+        record.route = route
+        if record.levelno >= logging.WARNING or route is None:
+            return True
+        rate = self.sample_rates.get(route, 1.0)
+        return rate >= 1.0 or random.random() < rate
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler yang tidak pernah mem-block caller.
+
+    Format pesan ditunda sampai record diproses writer thread, dan record
+    dibuang (dihitung) jika queue penuh.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Queue hanya dipakai antar thread, jadi record tidak perlu di-format di sini
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class DrainingQueueListener(logging.handlers.QueueListener):
+    """QueueListener yang menunggu slot kosong untuk sentinel stop (queue bisa penuh saat shutdown)"""
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+
+class RouteContextMiddleware:
+    """ASGI middleware untuk mengisi current_route pada setiap request HTTP"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = current_route.set(scope["path"])
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_route.reset(token)
+
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[NonBlockingQueueHandler] = None
+_stream_handler: Optional[logging.Handler] = None
+
+# Logger yang handler-nya diganti dengan queue handler
+QUEUED_LOGGERS = ("", "uvicorn", "uvicorn.access")
+
+
+def setup_logging() -> None:
+    """
+    Pasang queue-based logging untuk root logger dan logger uvicorn.
+
+    Semua I/O ke stdout dilakukan oleh QueueListener di background thread,
+    sehingga request handler hanya membayar biaya membuat LogRecord.
+    """
+    global _listener, _queue_handler, _stream_handler
+    if _listener is not None:
+        return
+
+    log_queue: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    if settings.LOG_JSON:
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(logging.Formatter(PLAIN_FORMAT))
+
+    _stream_handler = stream_handler
+    _queue_handler = NonBlockingQueueHandler(log_queue)
+    _queue_handler.addFilter(RouteSamplingFilter(settings.LOG_SAMPLE_RATES))
+
+    root = logging.getLogger()
+    root.handlers = [_queue_handler]
+    root.setLevel(settings.LOG_LEVEL)
+
+    # Access log uvicorn juga ditulis lewat queue
+    for name in ("uvicorn", "uvicorn.access"):
+        uvicorn_logger = logging.getLogger(name)
+        if uvicorn_logger.handlers:
+            uvicorn_logger.handlers = [_queue_handler]
+
+    _listener = DrainingQueueListener(
+        log_queue, stream_handler, respect_handler_level=True
+    )
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """
+    Flush sisa record di queue dan hentikan writer thread.
+
+    Setelah writer berhenti, queue handler diganti stream handler langsung,
+    sehingga log sesudahnya (teardown lifespan, flush audit log) tetap ditulis.
+    """
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    _listener = None
+
+    for name in QUEUED_LOGGERS:
+        target = logging.getLogger(name)
+        target.handlers = [
+            _stream_handler if handler is _queue_handler else handler
+            for handler in target.handlers
+        ]
+    # Ditulis langsung setelah queue dilepas, jadi tidak ikut terbuang saat queue penuh
+    if _queue_handler is not None and _queue_handler.dropped:
+        logging.getLogger(__name__).warning(
+            "%d log records dropped (queue penuh)", _queue_handler.dropped
+        )
+
+
+def get_dropped_count() -> int:
+    """Jumlah record yang dibuang karena queue penuh"""
+    return _queue_handler.dropped if _queue_handler is not None else 0
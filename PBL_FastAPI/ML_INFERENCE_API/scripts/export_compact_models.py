@@ -0,0 +1,132 @@
+"""
+Export model Level 0 (GB & RF) ke format compact dan validasi hasilnya
+
+Jalankan dari root project:
+    python -m scripts.export_compact_models --model-dir models_ews
+
+Untuk setiap model, script ini menulis <nama>.compact.npz di samping file .pkl,
+lalu membandingkan prediksi model compact dengan model sklearn asli pada data
+sintetis yang di-sample dari feature_stats di model_info.json. Laporan validasi
+(deviasi maksimum skor dan ukuran memori) disimpan ke compact_validation.json.
+"""
+import argparse
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+
+import joblib
+import numpy as np
+
+from app.services.compact_trees import (
+    COMPACT_SUFFIX,
+    CompactTreeEnsemble,
+    estimate_model_bytes,
+)
+from app.services.model_loader import LEVEL0_MODEL_FILES
+
+VALIDATION_FILE = "compact_validation.json"
+
+
+def sample_features(feature_columns, feature_stats, n_samples, seed):
+    """
+    Buat feature matrix sintetis dari statistik training.
+
+    Setengah sample diambil uniform pada [min, max], sisanya normal(mean, std)
+    yang di-clip ke range training. Fitur yang bernilai bulat dibulatkan.
+    """
+    rng = np.random.default_rng(seed)
+    X = np.empty((n_samples, len(feature_columns)), dtype=np.float64)
+    n_uniform = n_samples // 2
+
+    for j, col in enumerate(feature_columns):
+        stats = feature_stats[col]
+        lo, hi = stats["min"], stats["max"]
+        uniform = rng.uniform(lo, hi, size=n_uniform)
+        normal = rng.normal(stats["mean"], stats["std"] or 1.0, size=n_samples - n_uniform)
+        values = np.clip(np.concatenate([uniform, normal]), lo, hi)
+        if all(float(stats[k]).is_integer() for k in ("min", "max", "median")):
+            values = np.round(values)
+        X[:, j] = values
+
+    return X
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export model Level 0 ke format compact")
+    parser.add_argument("--model-dir", type=Path, default=Path("models_ews"))
+    parser.add_argument("--samples", type=int, default=20000, help="Jumlah sample validasi")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    model_dir = args.model_dir
+    with open(model_dir / "model_info.json", "r") as f:
+        model_info = json.load(f)
+
+    X = sample_features(
+        model_info["feature_columns"], model_info["feature_stats"], args.samples, args.seed
+    )
+
+    report = {
+        "exported_at": datetime.now().isoformat(),
+        "validation_samples": args.samples,
+        "models": {},
+    }
+    original_preds, compact_preds = [], []
+
+    for name, filename in LEVEL0_MODEL_FILES.items():
+        model = joblib.load(model_dir / f"{filename}.pkl")
+        compact = CompactTreeEnsemble.from_sklearn(model)
+        output_path = model_dir / f"{filename}{COMPACT_SUFFIX}"
+        compact.save(output_path)
+
+        start = time.perf_counter()
+        expected = model.predict(X)
+        sklearn_time = time.perf_counter() - start
+
+        # Validasi memakai file hasil export, bukan objek di memori
+        compact = CompactTreeEnsemble.load(output_path)
+        start = time.perf_counter()
+        actual = compact.predict(X)
+        compact_time = time.perf_counter() - start
+
+        deviation = np.abs(actual - expected)
+        original_preds.append(expected)
+        compact_preds.append(actual)
+
+        report["models"][name] = {
+            "file": output_path.name,
+            "n_trees": compact.n_trees,
+            "n_nodes": compact.n_nodes,
+            "max_abs_deviation": float(deviation.max()),
+            "mean_abs_deviation": float(deviation.mean()),
+            "sklearn_bytes": estimate_model_bytes(model)["bytes"],
+            "compact_bytes": compact.nbytes,
+            "pickle_file_bytes": (model_dir / f"{filename}.pkl").stat().st_size,
+            "compact_file_bytes": output_path.stat().st_size,
+            "sklearn_predict_ms": round(sklearn_time * 1000, 2),
+            "compact_predict_ms": round(compact_time * 1000, 2),
+        }
+
+    # Deviasi pada skor akhir (setelah meta model)
+    meta = joblib.load(model_dir / "meta_ridge.pkl")
+    final_expected = meta.predict(np.column_stack(original_preds))
+    final_actual = meta.predict(np.column_stack(compact_preds))
+    report["final_score_max_abs_deviation"] = float(np.abs(final_actual - final_expected).max())
+
+    with open(model_dir / VALIDATION_FILE, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"{'model':<6} {'trees':>6} {'nodes':>8} {'sklearn KB':>11} {'compact KB':>11} {'max dev':>10}")
+    for name, info in report["models"].items():
+        print(
+            f"{name:<6} {info['n_trees']:>6} {info['n_nodes']:>8} "
+            f"{info['sklearn_bytes'] / 1024:>11.1f} {info['compact_bytes'] / 1024:>11.1f} "
+            f"{info['max_abs_deviation']:>10.2e}"
+        )
+    print(f"final score max deviation: {report['final_score_max_abs_deviation']:.2e}")
+    print(f"report: {model_dir / VALIDATION_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,394 @@
+"""
+Training ulang model EWS (GB + RF -> Ridge meta) dari dataset_feature_engineered.csv
+
+Jalankan dari root project:
+    python -m scripts.train_ews --data dataset_feature_engineered.csv --output-dir models_ews
+
+Pipeline sama dengan notebook "Salinan PBL_ML Regression Risk_V1.ipynb" (drop kolom,
+24 fitur, split 80/20 random_state=42), tetapi:
+
+- Hasil feature engineering (matrix train/test) di-cache di --cache-dir, dengan key
+  hash isi CSV + konfigurasi fitur. Run berikutnya melewati parsing CSV.
+- Fit Level 0 pada seluruh data train dan fit setiap fold CV berjalan paralel di
+  satu process pool. Prediksi out-of-fold setiap fold menjadi meta-feature untuk
+  Ridge, sehingga meta model tidak dilatih dengan prediksi in-sample.
+- Artifact yang ditulis sama dengan yang dibaca ModelLoader: gb_regressor.pkl,
+  rf_regressor.pkl, meta_ridge.pkl, model_info.json (termasuk feature_stats),
+  model_comparison.csv, dan *_feature_importance.csv. Waktu setiap tahap disimpan
+  ke training_report.json.
+
+Setelah training, jalankan ulang scripts.export_compact_models jika MODEL_FORMAT=compact.
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
+from sklearn.linear_model import Ridge
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from sklearn.model_selection import KFold, train_test_split
+
+from app.services.model_loader import LEVEL0_MODEL_FILES
+
+# Kolom yang tidak dipakai model (sama dengan notebook)
+DROP_COLUMNS = [
+    "No_Reff",
+    "Timestamp",
+    "Tanggal",
+    "Nama_Penerima",
+    "Nama_Pengirim",
+    "Jenis_Transaksi",
+    "Quarter_Label",
+    "Warning_Level",
+    "Kategori_Pembayaran",
+    "Minggu_Ke",
+]
+
+FEATURE_COLUMNS = [
+    # Temporal Features
+    "Bulan",
+    "Hari",
+    "Hari_Minggu",
+    "Quarter",
+    "Is_Weekend",
+    "Is_Akhir_Bulan",
+    "Is_Awal_Bulan",
+    "Hari_Dari_Awal_Bulan",
+    # Behavior Features
+    "Total_Transaksi",
+    "Rata_Nominal",
+    "Frekuensi_Per_Hari",
+    "Durasi_Aktif_Hari",
+    "Rata_Interval_Hari",
+    "Jumlah_Terlambat",
+    "Persentase_Terlambat",
+    # Transaction Type
+    "Is_TopUp",
+    "Is_QRIS",
+    "Is_Transfer",
+    "Prop_TopUp",
+    "Prop_QRIS",
+    "Prop_Transfer",
+    # Activity
+    "Aktivitas_Bulan_Ini",
+    "Aktivitas_Quarter_Ini",
+    # Transaction Amount
+    "Nominal_Transaksi",
+]
+
+TARGET = "Risk_Score"
+TEST_SIZE = 0.2
+RANDOM_STATE = 42
+
+# Hyperparameter model (sama dengan artifact models_ews yang sedang dipakai)
+LEVEL0_PARAMS = {
+    "gb": {"n_estimators": 200, "max_depth": 5, "learning_rate": 0.05, "subsample": 0.8},
+    "rf": {"n_estimators": 200, "max_depth": 10, "min_samples_split": 10, "min_samples_leaf": 5},
+}
+META_PARAMS = {"alpha": 0.5}
+
+# Nama model di model_info.json / model_comparison.csv
+MODEL_KEYS = {"gb": "gradient_boosting", "rf": "random_forest", "meta": "meta_ridge"}
+MODEL_NAMES = {"gb": "Gradient Boosting", "rf": "Random Forest", "meta": "Ridge Meta"}
+
+REPORT_FILE = "training_report.json"
+
+# Data train untuk worker process, diisi sekali per worker oleh _init_worker
+_WORKER_DATA = {}
+
+
+def build_level0(name):
+    """Estimator Level 0 baru (belum di-fit)"""
+    if name == "gb":
+        return GradientBoostingRegressor(random_state=RANDOM_STATE, **LEVEL0_PARAMS["gb"])
+    if name == "rf":
+        # Paralelisme ada di level task (fold), bukan di dalam RandomForest
+        return RandomForestRegressor(random_state=RANDOM_STATE, n_jobs=1, **LEVEL0_PARAMS["rf"])
+    raise ValueError(f"Model Level 0 tidak dikenal: {name}")
+
+
+def _csv_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_features(data_path, cache_dir):
+    """
+    Load matrix fitur train/test, dari cache jika CSV dan konfigurasi fitur tidak berubah.
+
+    Returns:
+        (X_train, X_test, y_train, y_test, cache_hit)
+    """
+    config = json.dumps(
+        [FEATURE_COLUMNS, TARGET, DROP_COLUMNS, TEST_SIZE, RANDOM_STATE], sort_keys=True
+    )
+    key = hashlib.sha256((_csv_digest(data_path) + config).encode()).hexdigest()[:16]
+    cache_path = cache_dir / f"ews_features_{key}.npz"
+
+    if cache_path.exists():
+        with np.load(cache_path, allow_pickle=False) as cached:
+            X_train = pd.DataFrame(cached["X_train"], columns=FEATURE_COLUMNS)
+            X_test = pd.DataFrame(cached["X_test"], columns=FEATURE_COLUMNS)
+            return X_train, X_test, cached["y_train"], cached["y_test"], True
+
+    df = pd.read_csv(data_path)
+    df = df.drop(columns=[col for col in DROP_COLUMNS if col in df.columns])
+    missing = [col for col in FEATURE_COLUMNS + [TARGET] if col not in df.columns]
+    if missing:
+        raise ValueError(f"Kolom tidak ditemukan di dataset: {missing}")
+
+    X = df[FEATURE_COLUMNS].astype(np.float64)
+    y = df[TARGET].to_numpy(dtype=np.float64)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=TEST_SIZE, random_state=RANDOM_STATE
+    )
+    X_train = X_train.reset_index(drop=True)
+    X_test = X_test.reset_index(drop=True)
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_suffix(".tmp.npz")
+    np.savez(
+        tmp_path,
+        X_train=X_train.to_numpy(), X_test=X_test.to_numpy(), y_train=y_train, y_test=y_test,
+    )
+    os.replace(tmp_path, cache_path)
+    return X_train, X_test, y_train, y_test, False
+
+
+def _init_worker(X_train, y_train):
+    _WORKER_DATA["X"] = X_train
+    _WORKER_DATA["y"] = y_train
+
+
+def _run_task(task):
+    """
+    Satu task Level 0 di worker process.
+
+    ("oof", name, fold, train_idx, valid_idx): fit pada fold, prediksi bagian held-out.
+    ("full", name): fit pada seluruh data train, kembalikan model.
+    """
+    X, y = _WORKER_DATA["X"], _WORKER_DATA["y"]
+    kind, name = task[0], task[1]
+    start = time.perf_counter()
+    model = build_level0(name)
+    if kind == "oof":
+        _, _, fold, train_idx, valid_idx = task
+        model.fit(X.iloc[train_idx], y[train_idx])
+        result = (valid_idx, model.predict(X.iloc[valid_idx]))
+    else:
+        fold = None
+        model.fit(X, y)
+        result = model
+    return kind, name, fold, result, time.perf_counter() - start
+
+
+def train_level0(X_train, y_train, n_folds, n_jobs):
+    """
+    Fit Level 0 penuh + prediksi out-of-fold, semua task di satu process pool.
+
+    Returns:
+        (models, oof, task_seconds): model per nama, matrix OOF (n_train, n_model)
+        dengan urutan kolom LEVEL0_MODEL_FILES, dan durasi setiap task
+    """
+    names = list(LEVEL0_MODEL_FILES)
+    folds = list(KFold(n_splits=n_folds, shuffle=True, random_state=RANDOM_STATE).split(X_train))
+
+    # Task full-fit didahulukan karena paling lama (data train penuh)
+    tasks = [("full", name) for name in names]
+    tasks += [
+        ("oof", name, fold, train_idx, valid_idx)
+        for name in names
+        for fold, (train_idx, valid_idx) in enumerate(folds)
+    ]
+
+    models, task_seconds = {}, {}
+    oof = np.full((len(X_train), len(names)), np.nan)
+    with ProcessPoolExecutor(
+        max_workers=n_jobs, initializer=_init_worker, initargs=(X_train, y_train)
+    ) as executor:
+        for kind, name, fold, result, seconds in executor.map(_run_task, tasks):
+            task_seconds[f"{name}_{kind}" + ("" if fold is None else f"_{fold}")] = round(seconds, 3)
+            if kind == "full":
+                models[name] = result
+            else:
+                valid_idx, preds = result
+                oof[valid_idx, names.index(name)] = preds
+
+    return models, oof, task_seconds
+
+
+def regression_metrics(y_true, y_pred):
+    return {
+        "MAE": float(mean_absolute_error(y_true, y_pred)),
+        "RMSE": float(np.sqrt(mean_squared_error(y_true, y_pred))),
+        "R2": float(r2_score(y_true, y_pred)),
+    }
+
+
+def feature_stats(X_train):
+    """Statistik fitur train untuk fallback nilai di FeatureBuilder"""
+    return {
+        col: {
+            "mean": float(X_train[col].mean()),
+            "std": float(X_train[col].std()),
+            "min": float(X_train[col].min()),
+            "max": float(X_train[col].max()),
+            "median": float(X_train[col].median()),
+        }
+        for col in X_train.columns
+    }
+
+
+def save_artifacts(output_dir, models, meta, metrics, X_train, X_test, args):
+    """Tulis artifact dengan nama dan schema yang dibaca ModelLoader"""
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    for name, filename in LEVEL0_MODEL_FILES.items():
+        joblib.dump(models[name], output_dir / f"{filename}.pkl")
+        pd.DataFrame(
+            {"Feature": FEATURE_COLUMNS, "Importance": models[name].feature_importances_}
+        ).sort_values("Importance", ascending=False).to_csv(
+            output_dir / f"{name}_feature_importance.csv", index=False
+        )
+    joblib.dump(meta, output_dir / "meta_ridge.pkl")
+
+    comparison = pd.DataFrame([
+        {"Model": MODEL_NAMES[name], "Level": 1 if name == "meta" else 0, **metrics[name]}
+        for name in (*LEVEL0_MODEL_FILES, "meta")
+    ])
+    comparison.to_csv(output_dir / "model_comparison.csv", index=False)
+
+    best = min(metrics, key=lambda name: metrics[name]["MAE"])
+    models_info = {
+        MODEL_KEYS[name]: {
+            "file": f"{filename}.pkl",
+            "level": 0,
+            "hyperparameters": LEVEL0_PARAMS[name],
+            "metrics": metrics[name],
+        }
+        for name, filename in LEVEL0_MODEL_FILES.items()
+    }
+    models_info[MODEL_KEYS["meta"]] = {
+        "file": "meta_ridge.pkl",
+        "level": 1,
+        "hyperparameters": META_PARAMS,
+        "metrics": metrics["meta"],
+        "meta_features": f"out-of-fold ({args.folds}-fold) prediksi Level 0",
+    }
+
+    model_info = {
+        "model_version": args.model_version,
+        "training_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "description": "Stacking without final super model",
+        "target": TARGET,
+        "architecture": {
+            "level_0": "Gradient Boosting, Random Forest",
+            "level_1": "Ridge meta-learner",
+        },
+        "models": models_info,
+        "best_model": {
+            "name": MODEL_NAMES[best],
+            "mae": metrics[best]["MAE"],
+            "r2": metrics[best]["R2"],
+        },
+        "feature_columns": FEATURE_COLUMNS,
+        "num_features": len(FEATURE_COLUMNS),
+        "train_samples": len(X_train),
+        "test_samples": len(X_test),
+        "feature_stats": feature_stats(X_train),
+    }
+    with open(output_dir / "model_info.json", "w") as f:
+        json.dump(model_info, f, indent=4)
+    return comparison
+
+
+def available_cpus():
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Training model EWS (GB + RF -> Ridge)")
+    parser.add_argument("--data", type=Path, required=True, help="Path dataset_feature_engineered.csv")
+    parser.add_argument("--output-dir", type=Path, default=Path("models_ews"))
+    parser.add_argument("--cache-dir", type=Path, default=Path(".cache/train_ews"))
+    parser.add_argument("--folds", type=int, default=5, help="Jumlah fold untuk meta-feature OOF")
+    parser.add_argument(
+        "--n-jobs", type=int, default=available_cpus(),
+        help="Jumlah worker process (default: semua core yang tersedia)",
+    )
+    parser.add_argument("--model-version", default="2.1_script_oof_stacking")
+    args = parser.parse_args()
+
+    stages = {}
+
+    start = time.perf_counter()
+    X_train, X_test, y_train, y_test, cache_hit = load_features(args.data, args.cache_dir)
+    stages["feature_engineering"] = {
+        "seconds": round(time.perf_counter() - start, 3),
+        "cache_hit": cache_hit,
+    }
+    print(f"✓ Fitur: {len(X_train):,} train / {len(X_test):,} test "
+          f"({'cache' if cache_hit else 'dari CSV'}, {stages['feature_engineering']['seconds']:.2f}s)")
+
+    start = time.perf_counter()
+    models, oof, task_seconds = train_level0(X_train, y_train, args.folds, args.n_jobs)
+    stages["level0_and_oof"] = {
+        "seconds": round(time.perf_counter() - start, 3),
+        "task_seconds_total": round(sum(task_seconds.values()), 3),
+        "tasks": task_seconds,
+    }
+    print(f"✓ Level 0 + OOF: {len(task_seconds)} task di {args.n_jobs} worker "
+          f"({stages['level0_and_oof']['seconds']:.2f}s, "
+          f"total waktu task {stages['level0_and_oof']['task_seconds_total']:.2f}s)")
+
+    start = time.perf_counter()
+    meta = Ridge(random_state=RANDOM_STATE, **META_PARAMS).fit(oof, y_train)
+    stages["meta_model"] = {"seconds": round(time.perf_counter() - start, 3)}
+
+    start = time.perf_counter()
+    level0_test = np.column_stack([models[name].predict(X_test) for name in LEVEL0_MODEL_FILES])
+    metrics = {
+        name: regression_metrics(y_test, level0_test[:, j])
+        for j, name in enumerate(LEVEL0_MODEL_FILES)
+    }
+    metrics["meta"] = regression_metrics(y_test, meta.predict(level0_test))
+    stages["evaluation"] = {"seconds": round(time.perf_counter() - start, 3)}
+
+    start = time.perf_counter()
+    comparison = save_artifacts(args.output_dir, models, meta, metrics, X_train, X_test, args)
+    stages["save_artifacts"] = {"seconds": round(time.perf_counter() - start, 3)}
+
+    report = {
+        "trained_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "data": str(args.data),
+        "n_jobs": args.n_jobs,
+        "folds": args.folds,
+        "stages": stages,
+        "total_seconds": round(sum(info["seconds"] for info in stages.values()), 3),
+    }
+    with open(args.output_dir / REPORT_FILE, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print("\n" + comparison.to_string(index=False))
+    print(f"\n{'stage':<22} {'seconds':>8}")
+    for stage, info in stages.items():
+        print(f"{stage:<22} {info['seconds']:>8.2f}")
+    print(f"{'total':<22} {report['total_seconds']:>8.2f}")
+    print(f"\nArtifact: {args.output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Test activity counter: hitungan bulan/quarter berjalan, expiry window, dan kapasitas
+"""
+from collections import Counter
+from datetime import datetime
+
+import numpy as np
+
+from app.config import settings
+from app.services import activity_counter as activity
+from app.services.activity_counter import ActivityCounter, month_id_of
+
+
+def test_month_and_quarter_match_naive_count():
+    rng = np.random.default_rng(0)
+    counter = ActivityCounter(initial_capacity=4)
+    events = []
+    # Event berurutan waktu dari beberapa entity selama 2 tahun
+    for day in np.sort(rng.integers(0, 730, size=3000)):
+        dt = datetime.fromordinal(datetime(2024, 1, 1).toordinal() + int(day))
+        entity = f"rt:{int(rng.integers(0, 12)):03d}"
+        counter.record(entity, dt)
+        events.append((entity, dt))
+
+    reference = datetime(2025, 11, 20)
+    month = Counter(e for e, dt in events if month_id_of(dt) == month_id_of(reference))
+    quarter = Counter(
+        e for e, dt in events
+        if dt.year == reference.year and (dt.month - 1) // 3 == (reference.month - 1) // 3
+    )
+    for entity in {e for e, _ in events}:
+        assert counter.get_activity(entity, reference) == (month[entity], quarter[entity])
+
+
+def test_new_month_expires_bucket_and_old_event_rejected():
+    counter = ActivityCounter()
+    counter.record("rt:001", datetime(2025, 1, 10), count=5)
+    counter.record("rt:001", datetime(2025, 4, 2))
+
+    # Bucket Januari dipakai ulang untuk April, quarter lama hilang
+    assert counter.get_activity("rt:001", datetime(2025, 4, 30)) == (1, 1)
+    assert counter.get_activity("rt:001", datetime(2025, 1, 31)) == (0, 0)
+    assert counter.record("rt:001", datetime(2025, 1, 11)) is False
+    assert counter.memory_report()["events_expired"] == 1
+    assert counter.get_activity("rt:999", datetime(2025, 4, 30)) is None
+
+
+def test_full_capacity_purges_stale_entities_before_rejecting():
+    counter = ActivityCounter(initial_capacity=2, max_entities=2)
+    assert counter.record("rt:001", datetime(2025, 1, 5))
+    assert counter.record("rt:002", datetime(2025, 4, 5))
+
+    # rt:001 tidak aktif di quarter terbaru -> slot-nya dipakai entity baru
+    assert counter.record("rt:003", datetime(2025, 4, 6))
+    assert counter.get_activity("rt:001", datetime(2025, 4, 30)) is None
+    # Semua entity aktif di quarter terbaru -> entity baru ditolak
+    assert counter.record("rt:004", datetime(2025, 4, 7)) is False
+    report = counter.memory_report()
+    assert report["entities"] == 2
+    assert report["entities_rejected"] == 1
+
+
+def test_future_event_rejected_and_does_not_expire_others(monkeypatch):
+    monkeypatch.setattr(activity, "current_month_id", lambda: month_id_of(datetime(2025, 4, 15)))
+    counter = ActivityCounter()
+    assert counter.record("rt:001", datetime(2025, 4, 2), count=2)
+    # Bulan depan masih diterima (selisih jam / timezone di sekitar pergantian bulan)
+    assert counter.record("rt:002", datetime(2025, 5, 1))
+    # Tanggal salah jauh di depan ditolak, quarter terbaru tidak ikut maju
+    assert counter.record("rt:003", datetime(2030, 1, 1)) is False
+
+    assert counter.purge_expired() == 0
+    assert counter.get_activity("rt:001", datetime(2025, 4, 30)) == (2, 2)
+    report = counter.memory_report()
+    assert (report["events_future"], report["entities"]) == (1, 2)
+
+
+class LockCheckingIndex(dict):
+    """Index yang memastikan lookup hanya dilakukan saat lock dipegang"""
+
+    def __init__(self, lock, *args):
+        super().__init__(*args)
+        self.lock = lock
+
+    def get(self, key, default=None):
+        assert self.lock.locked(), "lookup index di luar lock"
+        return super().get(key, default)
+
+
+def test_lookup_happens_under_lock(monkeypatch):
+    monkeypatch.setattr(activity, "current_month_id", lambda: month_id_of(datetime(2025, 4, 15)))
+    counter = ActivityCounter()
+    counter.record("rt:001", datetime(2025, 4, 2))
+    counter._index = LockCheckingIndex(counter._lock, counter._index)
+    assert counter.get_activity("rt:001", datetime(2025, 4, 30)) == (1, 1)
+    assert counter.get_activity("rt:404", datetime(2025, 4, 30)) is None
+
+
+def test_snapshot_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "FEATURE_STORE_DIR", str(tmp_path))
+    counter = ActivityCounter()
+    counter.record("rt:001", datetime(2025, 5, 1), count=3)
+    counter.record("rt:002", datetime(2025, 6, 1))
+    counter.save_snapshot()
+
+    restored = ActivityCounter()
+    assert restored.load_snapshot()
+    assert restored.get_activity("rt:001", datetime(2025, 6, 15)) == (0, 3)
+    assert restored.get_activity("rt:002", datetime(2025, 6, 15)) == (1, 1)
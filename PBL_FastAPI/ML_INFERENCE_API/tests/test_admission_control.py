@@ -0,0 +1,120 @@
+"""
+Test admission control: batas concurrency, shedding per kelas, dan pemulihan setelah beban turun
+"""
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.utils import admission_control
+from app.utils.admission_control import (
+    AdmissionController,
+    AdmissionControlMiddleware,
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+)
+
+
+class FakeClock:
+    """Pengganti modul time agar umur sample latency bisa diatur dari test"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def perf_counter(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(admission_control, "time", clock)
+    monkeypatch.setattr(settings, "ADMISSION_LATENCY_HALF_LIFE", 2.0)
+    monkeypatch.setattr(settings, "ADMISSION_PROBE_INTERVAL", 1.0)
+    return clock
+
+
+@pytest.fixture
+def controller(clock):
+    controller = AdmissionController()
+    controller.max_concurrency = 4
+    controller.limits = {PRIORITY_HIGH: 4, PRIORITY_LOW: 2}
+    controller.latency_targets = {PRIORITY_HIGH: 0.5, PRIORITY_LOW: 0.25}
+    return controller
+
+
+def test_low_priority_limited_to_its_share(controller):
+    assert controller.try_acquire(PRIORITY_LOW) is None
+    assert controller.try_acquire(PRIORITY_LOW) is None
+    assert controller.try_acquire(PRIORITY_LOW) is not None
+    # Sisa kapasitas tetap tersedia untuk kelas high
+    assert controller.try_acquire(PRIORITY_HIGH) is None
+    assert controller.try_acquire(PRIORITY_HIGH) is None
+    assert controller.try_acquire(PRIORITY_HIGH) is not None
+    assert controller.rejected == {PRIORITY_HIGH: 1, PRIORITY_LOW: 1}
+
+
+def test_slow_low_priority_traffic_does_not_shed_high(controller, clock):
+    # Traffic low lambat (2 detik per request) terus selesai lewat probe
+    for _ in range(20):
+        assert controller.try_acquire(PRIORITY_LOW) is None
+        controller.release(PRIORITY_LOW, 2.0)
+        clock.now += 1.0
+
+    # Kelas low di-shed (hanya satu probe yang boleh berjalan) ...
+    assert controller.try_acquire(PRIORITY_LOW) is None
+    assert controller.try_acquire(PRIORITY_LOW) is not None
+    assert controller.probes[PRIORITY_LOW] == 20
+    # ... tapi kelas high tidak terpengaruh latency kelas low
+    assert controller.try_acquire(PRIORITY_HIGH) is None
+    controller.release(PRIORITY_HIGH, 0.05)
+    assert controller.rejected[PRIORITY_HIGH] == 0
+
+
+def test_rejection_does_not_stay_latched(controller, clock):
+    assert controller.try_acquire(PRIORITY_HIGH) is None
+    controller.release(PRIORITY_HIGH, 3.0)
+
+    # Request pertama setelah sample lambat: masih ditolak dalam interval probe
+    assert controller.try_acquire(PRIORITY_HIGH) is not None
+
+    # Setelah interval probe, satu request diterima sebagai probe ...
+    clock.now += 1.0
+    assert controller.try_acquire(PRIORITY_HIGH) is None
+    assert controller.probes[PRIORITY_HIGH] == 1
+    # ... dan request lain tetap ditolak selama probe masih berjalan
+    assert controller.try_acquire(PRIORITY_HIGH) is not None
+    controller.release(PRIORITY_HIGH, 0.05)
+
+    # Tanpa sample baru pun EWMA meluruh sampai di bawah target
+    clock.now += 10.0
+    for _ in range(4):
+        assert controller.try_acquire(PRIORITY_HIGH) is None
+
+
+def test_middleware_returns_503_with_retry_after(controller, monkeypatch):
+    monkeypatch.setattr(controller, "route_priorities", {"/predict": PRIORITY_HIGH})
+    controller.enabled = True
+    controller.limits = {PRIORITY_HIGH: 0, PRIORITY_LOW: 0}
+
+    app = FastAPI()
+
+    @app.get("/predict")
+    async def predict():
+        return {"success": True}
+
+    @app.get("/health")
+    async def health():
+        return {"success": True}
+
+    app.add_middleware(AdmissionControlMiddleware, controller=controller)
+    client = TestClient(app)
+
+    response = client.get("/predict")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert response.json()["success"] is False
+    assert client.get("/health").status_code == 200
@@ -0,0 +1,147 @@
+"""
+Test audit log: retry batch yang gagal, shutdown tanpa kehilangan record, dan index filter
+"""
+import asyncio
+import sqlite3
+import threading
+
+import pytest
+
+from app.config import settings
+from app.services.audit_log import AuditLog
+
+REQUEST = {"tanggal": "2025-01-15", "nominal": 500000, "target_type": "broadcast"}
+
+
+@pytest.fixture
+def audit_settings(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "AUDIT_ENABLED", True)
+    monkeypatch.setattr(settings, "AUDIT_DB_PATH", tmp_path / "audit.db")
+    monkeypatch.setattr(settings, "AUDIT_FLUSH_INTERVAL", 0.01)
+    monkeypatch.setattr(settings, "AUDIT_BATCH_SIZE", 1000)
+    monkeypatch.setattr(settings, "AUDIT_RETRY_BASE_DELAY", 0.01)
+    monkeypatch.setattr(settings, "AUDIT_RETRY_MAX_DELAY", 0.04)
+    return tmp_path / "audit.db"
+
+
+def record_many(audit, n, start=0):
+    for i in range(start, start + n):
+        audit.record("/predict", {**REQUEST, "customer_id": f"C-{i}"}, float(i), "RENDAH")
+
+
+def written_customers(db_path):
+    with sqlite3.connect(db_path) as conn:
+        return [row[0] for row in conn.execute("SELECT customer_id FROM audit_log ORDER BY id")]
+
+
+def test_failed_write_is_requeued_and_retried_with_backoff(audit_settings):
+    async def scenario():
+        audit = AuditLog()
+        audit.open()
+        write_batch = audit._write_batch
+        failures = {"left": 3}
+
+        def flaky_write(batch):
+            if failures["left"]:
+                failures["left"] -= 1
+                raise sqlite3.OperationalError("database is locked")
+            write_batch(batch)
+
+        audit._write_batch = flaky_write
+        record_many(audit, 5)
+
+        delays = []
+        for _ in range(3):
+            assert await audit.flush() == 0
+            delays.append(audit._retry_delay)
+            record_many(audit, 1, start=5 + len(delays) - 1)
+
+        assert delays == [0.01, 0.02, 0.04]
+        assert audit.stats()["buffered"] == 8
+        assert await audit.flush() == 8
+        assert audit._retry_delay == 0.0
+        await audit.close()
+        return audit
+
+    audit = asyncio.run(scenario())
+    assert audit.failed_writes == 3
+    # Batch yang gagal tetap di depan, urutan record tidak berubah
+    assert written_customers(audit_settings) == [f"C-{i}" for i in range(8)]
+
+
+def test_requeue_respects_max_buffer(audit_settings, monkeypatch):
+    monkeypatch.setattr(settings, "AUDIT_MAX_BUFFER", 4)
+
+    async def scenario():
+        audit = AuditLog()
+        audit.open()
+        record_many(audit, 3)
+
+        def failing_write(batch):
+            record_many(audit, 3, start=3)  # request baru masuk selama write berjalan
+            raise sqlite3.OperationalError("disk I/O error")
+
+        audit._write_batch = failing_write
+        await audit.flush()
+        return audit
+
+    audit = asyncio.run(scenario())
+    assert [row[6] for row in audit._buffer] == ["C-0", "C-1", "C-2", "C-3"]
+    assert audit.dropped == 2
+
+
+def test_shutdown_waits_for_running_write_then_flushes_rest(audit_settings):
+    async def scenario():
+        audit = AuditLog()
+        audit.open()
+        task = asyncio.create_task(audit.run())
+
+        write_batch = audit._write_batch
+        started = threading.Event()
+        release = threading.Event()
+
+        def slow_write(batch):
+            started.set()
+            release.wait(5)
+            write_batch(batch)
+
+        audit._write_batch = slow_write
+        record_many(audit, 10)
+        await asyncio.to_thread(started.wait, 5)
+        record_many(audit, 5, start=10)  # masuk setelah write pertama mulai
+
+        audit.stop()
+        release.set()
+        await asyncio.wait_for(task, timeout=5)
+        assert not task.cancelled()
+        await audit.close()
+
+    asyncio.run(scenario())
+    assert written_customers(audit_settings) == [f"C-{i}" for i in range(15)]
+
+
+def test_recent_filters_use_indexes(audit_settings):
+    async def scenario():
+        audit = AuditLog()
+        audit.open()
+        record_many(audit, 20)
+        audit.record("/predict", {**REQUEST, "rt_number": "007"}, 90.0, "TINGGI")
+        by_customer = await audit.recent(limit=5, customer_id="C-3")
+        by_rt = await audit.recent(limit=5, rt_number="007")
+        plans = [
+            audit._conn.execute(
+                f"EXPLAIN QUERY PLAN SELECT id FROM audit_log WHERE {column} = ? "
+                f"ORDER BY id DESC LIMIT 5", ("x",)
+            ).fetchall()
+            for column in ("customer_id", "rt_number")
+        ]
+        await audit.close()
+        return by_customer, by_rt, plans
+
+    by_customer, by_rt, plans = asyncio.run(scenario())
+    assert [r["risk_score"] for r in by_customer] == [3.0]
+    assert [r["risk_status"] for r in by_rt] == ["TINGGI"]
+    details = [" ".join(str(row[-1]) for row in plan) for plan in plans]
+    assert "idx_audit_customer" in details[0]
+    assert "idx_audit_rt" in details[1]
+    assert not any("TEMP B-TREE" in d for d in details)
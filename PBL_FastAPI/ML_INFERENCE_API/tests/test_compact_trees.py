@@ -0,0 +1,74 @@
+"""
+Test compact tree ensemble: prediksi harus setara model sklearn asli
+"""
+import numpy as np
+import pytest
+from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
+from sklearn.linear_model import Ridge
+
+from app.services.compact_trees import CompactTreeEnsemble, estimate_model_bytes
+
+
+@pytest.fixture(scope="module")
+def data():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(600, 12)) * rng.uniform(1, 1e5, size=12)
+    y = X[:, 0] / 1e4 + np.sin(X[:, 1]) * 10 + (X[:, 2] > 0) * 5 + rng.normal(size=600)
+    return X, y
+
+
+def split_points(model):
+    """Sample yang nilainya tepat di threshold split (kasus batas float32)"""
+    rows = []
+    for est in np.ravel(model.estimators_)[:5]:
+        tree = est.tree_
+        internal = np.flatnonzero(tree.children_left != -1)[:20]
+        for node in internal:
+            row = np.zeros(model.n_features_in_)
+            row[tree.feature[node]] = tree.threshold[node]
+            rows.append(row)
+    return np.array(rows)
+
+
+@pytest.mark.parametrize("model", [
+    GradientBoostingRegressor(n_estimators=60, max_depth=4, random_state=0),
+    RandomForestRegressor(n_estimators=25, max_depth=8, random_state=0),
+    RandomForestRegressor(n_estimators=10, random_state=0),  # tree tidak seimbang, depth besar
+])
+def test_predictions_match_sklearn(data, model):
+    X, y = data
+    model.fit(X, y)
+    compact = CompactTreeEnsemble.from_sklearn(model)
+
+    rng = np.random.default_rng(1)
+    X_test = np.vstack([X[:100], rng.normal(size=(200, 12)) * 1e5, split_points(model)])
+    expected = model.predict(X_test)
+    # Nilai leaf disimpan float32; routing sample harus identik
+    np.testing.assert_allclose(compact.predict(X_test), expected, rtol=1e-5, atol=1e-4)
+    assert compact.n_trees == len(np.ravel(model.estimators_))
+
+
+def test_save_load_round_trip(data, tmp_path):
+    X, y = data
+    model = GradientBoostingRegressor(n_estimators=20, random_state=0).fit(X, y)
+    compact = CompactTreeEnsemble.from_sklearn(model)
+    path = tmp_path / "gb.compact.npz"
+    compact.save(path)
+
+    restored = CompactTreeEnsemble.load(path)
+    np.testing.assert_array_equal(restored.predict(X), compact.predict(X))
+    assert restored.source == "GradientBoostingRegressor"
+    assert estimate_model_bytes(restored)["bytes"] == compact.nbytes
+    assert compact.nbytes < estimate_model_bytes(model)["bytes"]
+
+
+def test_rejects_unsupported_model_and_wrong_shape(data):
+    X, y = data
+    with pytest.raises(ValueError):
+        CompactTreeEnsemble.from_sklearn(Ridge().fit(X, y))
+
+    compact = CompactTreeEnsemble.from_sklearn(
+        RandomForestRegressor(n_estimators=2, random_state=0).fit(X, y)
+    )
+    with pytest.raises(ValueError):
+        compact.predict(X[:, :5])
@@ -0,0 +1,73 @@
+"""
+Test drift monitor: statistik streaming (Welford/Chan + histogram sketch) terhadap numpy
+"""
+import numpy as np
+import pytest
+
+from app.config import settings
+from app.services.drift_monitor import DriftMonitor
+
+COLUMNS = ["a", "b", "konstan"]
+TRAIN_STATS = {
+    "a": {"mean": 0.0, "std": 1.0, "median": 0.0, "min": -4.0, "max": 4.0},
+    "b": {"mean": 50.0, "std": 10.0, "median": 50.0, "min": 0.0, "max": 100.0},
+    "konstan": {"mean": 1.0, "std": 0.0, "median": 1.0, "min": 1.0, "max": 1.0},
+}
+
+
+@pytest.fixture
+def monitor(monkeypatch):
+    # Batch kecil dan tidak habis dibagi ukuran request, agar buffer terpakai parsial
+    monkeypatch.setattr(settings, "DRIFT_BATCH_SIZE", 37)
+    monkeypatch.setattr(settings, "DRIFT_SKETCH_BINS", 200)
+    monitor = DriftMonitor()
+    monitor.enabled = True
+    monitor.configure(COLUMNS, TRAIN_STATS)
+    return monitor
+
+
+def sample(rng, n, shift_b=0.0):
+    return np.column_stack([
+        rng.normal(0.0, 1.0, n),
+        rng.normal(50.0 + shift_b, 10.0, n),
+        np.ones(n),
+    ])
+
+
+def test_streaming_moments_match_numpy(monitor):
+    rng = np.random.default_rng(0)
+    chunks = [sample(rng, int(n)) for n in rng.integers(1, 60, size=80)]
+    for chunk in chunks:
+        monitor.observe(chunk)
+    X = np.vstack(chunks)
+
+    report = monitor.report()
+    assert report["samples"] == len(X)
+    for i, col in enumerate(COLUMNS):
+        live = report["features"][col]["live"]
+        assert live["mean"] == pytest.approx(X[:, i].mean(), rel=1e-12, abs=1e-12)
+        assert live["std"] == pytest.approx(X[:, i].std(ddof=1), rel=1e-9, abs=1e-12)
+        assert live["min"] == X[:, i].min()
+        assert live["max"] == X[:, i].max()
+
+
+def test_quantile_sketch_close_to_numpy(monitor):
+    rng = np.random.default_rng(1)
+    X = sample(rng, 5000)
+    monitor.observe(X)
+
+    live = monitor.report()["features"]["b"]["live"]
+    # Lebar bin = 0.5, interpolasi di dalam bin harus jauh lebih akurat dari itu
+    for name, q in (("p05", 5), ("p50", 50), ("p95", 95)):
+        assert live[name] == pytest.approx(np.percentile(X[:, 1], q), abs=0.5)
+
+
+def test_shifted_feature_is_flagged(monitor):
+    rng = np.random.default_rng(2)
+    monitor.observe(sample(rng, 2000, shift_b=40.0))
+
+    report = monitor.report()
+    assert report["drifted_features"] == ["b"]
+    assert report["features"]["b"]["mean_shift"] == pytest.approx(4.0, abs=0.1)
+    assert report["features"]["a"]["drifted"] is False
+    assert report["features"]["konstan"]["out_of_range_rate"] == 0.0
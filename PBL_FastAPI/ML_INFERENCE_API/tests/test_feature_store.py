@@ -0,0 +1,181 @@
+"""
+Test feature store: fitur online harus sama dengan feature engineering training
+"""
+import json
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.config import settings
+from app.services.feature_store import FeatureStore, to_epoch
+
+MODEL_INFO = Path(__file__).resolve().parent.parent / "models_ews" / "model_info.json"
+JENIS = ["topup", "qris", "transfer"]
+
+
+def training_behavior_features(events: pd.DataFrame) -> pd.DataFrame:
+    """
+    Referensi feature engineering training (per entity, dari history lengkap).
+
+    Durasi dari tanggal kalender, Frekuensi = Total / (Durasi + 1), dan
+    Rata_Interval_Hari = rata-rata Timestamp.diff().dt.days.
+    """
+    events = events.sort_values("Timestamp")
+    grouped = events.groupby("entity")
+    tanggal = events["Timestamp"].dt.normalize()
+    durasi = (tanggal.groupby(events["entity"]).max() - tanggal.groupby(events["entity"]).min()).dt.days
+    interval = grouped["Timestamp"].diff().dt.days.groupby(events["entity"]).mean().fillna(0.0)
+    total = grouped.size()
+    features = pd.DataFrame({
+        "Total_Transaksi": total,
+        "Rata_Nominal": grouped["Nominal"].mean(),
+        "Frekuensi_Per_Hari": total / (durasi + 1),
+        "Durasi_Aktif_Hari": durasi,
+        "Rata_Interval_Hari": interval,
+        "Jumlah_Terlambat": grouped["Terlambat"].sum(),
+        "Persentase_Terlambat": grouped["Terlambat"].mean() * 100,
+    })
+    for jenis, column in (("topup", "Prop_TopUp"), ("qris", "Prop_QRIS"), ("transfer", "Prop_Transfer")):
+        features[column] = (events["Jenis"] == jenis).groupby(events["entity"]).mean()
+    return features.astype(float)
+
+
+def random_events(n_entities=20, seed=0):
+    rng = np.random.default_rng(seed)
+    start = datetime(2025, 1, 15)
+    rows = []
+    for e in range(n_entities):
+        # Jumlah dan rate transaksi berbeda per entity, seperti dataset training
+        n = int(rng.integers(1, 90))
+        offsets = np.sort(rng.uniform(0, 31 * 86400, size=n))
+        for offset in offsets:
+            rows.append({
+                "entity": f"customer:C-{e:03d}",
+                "Timestamp": start + timedelta(seconds=float(offset)),
+                "Nominal": float(rng.integers(5000, 150000)),
+                "Jenis": JENIS[int(rng.integers(0, 3))],
+                "Terlambat": bool(rng.random() < 0.7),
+            })
+    return pd.DataFrame(rows)
+
+
+def ingest_all(store, events, shuffle_seed=None, block=None):
+    records = events.sort_values("Timestamp").to_dict("records")
+    if shuffle_seed is not None:
+        # Acak di dalam blok berurutan: event datang terlambat, tapi masih di reorder window
+        rng = random.Random(shuffle_seed)
+        block = block or len(records)
+        for start in range(0, len(records), block):
+            chunk = records[start:start + block]
+            rng.shuffle(chunk)
+            records[start:start + block] = chunk
+    for row in records:
+        store.ingest(row["entity"], row["Timestamp"].to_pydatetime(), row["Nominal"], row["Jenis"], row["Terlambat"])
+
+
+@pytest.mark.parametrize("shuffle_seed", [None, 1, 2])
+def test_online_features_match_training(shuffle_seed):
+    events = random_events()
+    expected = training_behavior_features(events)
+
+    store = FeatureStore()
+    ingest_all(store, events, shuffle_seed, block=settings.FEATURE_STORE_REORDER_WINDOW)
+    assert store.stats()["late_events"] == 0
+
+    for entity, row in expected.iterrows():
+        actual = store.get_features(entity)
+        for column, value in row.items():
+            assert actual[column] == pytest.approx(value, rel=1e-9, abs=1e-9), (entity, column)
+
+
+def test_extremes_match_training_feature_stats():
+    """Entity dengan history seperti baris ekstrem training menghasilkan min/max feature_stats"""
+    stats = json.loads(MODEL_INFO.read_text())["feature_stats"]
+    store = FeatureStore()
+    start = datetime(2025, 1, 1, 8)
+    # 81 transaksi dalam 31 tanggal (Durasi 30) -> Frekuensi maksimum training
+    for i in range(81):
+        store.ingest("rt:busy", start + timedelta(days=i % 31, minutes=i), 10000, "qris")
+    # 36 transaksi dalam 29 tanggal (Durasi 28) -> Frekuensi minimum training
+    for i in range(36):
+        store.ingest("rt:quiet", start + timedelta(days=i % 29, minutes=i), 10000, "qris")
+
+    busy = store.get_features("rt:busy")
+    quiet = store.get_features("rt:quiet")
+    assert busy["Durasi_Aktif_Hari"] == stats["Durasi_Aktif_Hari"]["max"]
+    assert busy["Frekuensi_Per_Hari"] == pytest.approx(stats["Frekuensi_Per_Hari"]["max"])
+    assert quiet["Frekuensi_Per_Hari"] == pytest.approx(stats["Frekuensi_Per_Hari"]["min"])
+    # Selisih hari penuh antar transaksi berurutan jauh di bawah Durasi / (n - 1)
+    assert busy["Rata_Interval_Hari"] <= stats["Rata_Interval_Hari"]["max"]
+
+
+def test_memory_bounded_and_late_events_bounded_error(monkeypatch):
+    monkeypatch.setattr(settings, "FEATURE_STORE_REORDER_WINDOW", 8)
+    events = random_events(n_entities=10, seed=4)
+    expected = training_behavior_features(events)
+
+    store = FeatureStore()
+    ingest_all(store, events, shuffle_seed=5)  # acak penuh, banyak event di luar window
+    late = store.stats()["late_events"]
+    assert late > 0
+
+    for entity, row in expected.iterrows():
+        agg = store._entities[entity]
+        assert len(agg.recent) <= 8
+        actual = store.get_features(entity)
+        # Counter, durasi, dan proporsi tetap persis; interval error <= 1 hari per event terlambat
+        for column in ("Total_Transaksi", "Rata_Nominal", "Durasi_Aktif_Hari", "Prop_QRIS"):
+            assert actual[column] == pytest.approx(row[column], rel=1e-9)
+        n = row["Total_Transaksi"]
+        if n > 1:
+            gap_error = abs(actual["Rata_Interval_Hari"] - row["Rata_Interval_Hari"]) * (n - 1)
+            assert gap_error <= agg.late_events + 1e-9
+
+
+def test_calendar_dates_use_feature_timezone_not_server(monkeypatch):
+    if not hasattr(time, "tzset"):
+        pytest.skip("tzset tidak tersedia")
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    try:
+        wib = timezone(timedelta(hours=7))
+        store = FeatureStore()
+        # 23:30 dan 00:30 WIB: beda tanggal di WIB, tanggal sama di UTC / New York
+        store.ingest("customer:tz", datetime(2025, 1, 1, 23, 30, tzinfo=wib), 10000, "qris")
+        store.ingest("customer:tz", datetime(2025, 1, 2, 0, 30, tzinfo=wib), 10000, "qris")
+        assert store.get_features("customer:tz")["Durasi_Aktif_Hari"] == 1.0
+        # Datetime tanpa tzinfo dianggap WIB
+        assert to_epoch(datetime(2025, 1, 2, 0, 30)) == datetime(2025, 1, 2, 0, 30, tzinfo=wib).timestamp()
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+
+
+def test_single_event_and_unknown_entity():
+    store = FeatureStore()
+    assert store.get_features("customer:none") is None
+    assert store.get_features(None) is None
+    store.ingest("customer:one", datetime(2025, 1, 5, 10), 50000, "transfer", True)
+    features = store.get_features("customer:one")
+    assert features["Durasi_Aktif_Hari"] == 0.0
+    assert features["Frekuensi_Per_Hari"] == 1.0
+    assert features["Rata_Interval_Hari"] == 0.0
+    assert features["Persentase_Terlambat"] == 100.0
+
+
+def test_snapshot_roundtrip(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "FEATURE_STORE_DIR", tmp_path)
+    events = random_events(n_entities=5, seed=3)
+    store = FeatureStore()
+    ingest_all(store, events)
+    assert store.save_snapshot()
+
+    restored = FeatureStore()
+    assert restored.load_snapshot()
+    for entity in events["entity"].unique():
+        assert restored.get_features(entity) == store.get_features(entity)
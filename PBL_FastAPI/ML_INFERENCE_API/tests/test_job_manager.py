@@ -0,0 +1,238 @@
+"""
+Test background job: input CSV di worker, recovery per owner, dan route submit
+"""
+import csv
+import io
+import json
+import os
+import time
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.datastructures import UploadFile
+
+from app.config import settings
+from app.main import app
+from app.models.schemas import PredictionRequest
+from app.services import job_manager as jobs
+from app.services.job_manager import JobManager, UploadTooLargeError, _run_job
+from app.services.predictor import predictor
+
+
+class PendingExecutor:
+    """Executor palsu: job tetap queued, tidak ada worker process"""
+
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, fn, *args):
+        self.submitted.append(args)
+        return Future()
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "JOB_DIR", tmp_path)
+    manager = JobManager()
+    manager._executor = PendingExecutor()
+    manager._heartbeat()
+    return manager
+
+
+@pytest.fixture
+def fake_predict(monkeypatch):
+    seen = []
+
+    def predict_batch(items):
+        seen.extend(items)
+        return [{"risk_score": float(item["nominal"]) / 10000} for item in items]
+
+    monkeypatch.setattr(predictor, "predict_batch", predict_batch)
+    return seen
+
+
+def write_status(job_dir, job_id, **fields):
+    path = job_dir / job_id
+    path.mkdir()
+    status = {"job_id": job_id, "state": jobs.STATUS_QUEUED, "total": 1, **fields}
+    (path / jobs.STATUS_FILE).write_text(json.dumps(status))
+    return path / jobs.STATUS_FILE
+
+
+def test_recovery_only_fails_jobs_of_dead_owners(manager, tmp_path):
+    owners = tmp_path / jobs.OWNERS_DIR
+    (owners / "hidup").touch()
+    (owners / "mati").touch()
+    stale = time.time() - settings.JOB_STALE_AFTER - 5
+    os.utime(owners / "mati", (stale, stale))
+
+    paths = {
+        "milik_sendiri": write_status(tmp_path, "a" * 32, owner=manager.owner_id),
+        "proses_lain": write_status(tmp_path, "b" * 32, owner="hidup", state=jobs.STATUS_RUNNING),
+        "proses_mati": write_status(tmp_path, "c" * 32, owner="mati", state=jobs.STATUS_RUNNING),
+        "tanpa_owner": write_status(tmp_path, "d" * 32),
+    }
+
+    assert manager._recover_interrupted_jobs() == 2
+    states = {name: json.loads(p.read_text())["state"] for name, p in paths.items()}
+    assert states == {
+        "milik_sendiri": jobs.STATUS_QUEUED,
+        "proses_lain": jobs.STATUS_RUNNING,
+        "proses_mati": jobs.STATUS_FAILED,
+        "tanpa_owner": jobs.STATUS_FAILED,
+    }
+
+
+def test_csv_upload_is_parsed_and_scored_in_worker(manager, tmp_path, fake_predict, monkeypatch):
+    monkeypatch.setattr(settings, "JOB_CHUNK_SIZE", 2)
+    csv_path = tmp_path / "upload.csv"
+    csv_path.write_text(
+        "tanggal,nominal,target_type,rt_number,customer_id\n"
+        "2025-01-15,500000,broadcast,,\n"
+        "2025-01-16,250000,rt_tertentu,001,\n"
+        "2025-01-17,100000,broadcast,,CUST-9\n"
+    )
+    with open(csv_path, "rb") as f:
+        status = manager.submit_file(f)
+    assert status["total"] is None
+    assert status["owner"] == manager.owner_id
+
+    job_path = tmp_path / status["job_id"]
+    _run_job(str(job_path))
+
+    final = manager.get_status(status["job_id"])
+    assert (final["state"], final["total"], final["processed"]) == (jobs.STATUS_COMPLETED, 3, 3)
+    assert [item["entity_id"] for item in fake_predict] == [None, "rt:001", "customer:CUST-9"]
+
+    with open(manager.get_result_path(status["job_id"]), newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert [row["risk_score"] for row in rows] == ["50.0", "25.0", "10.0"]
+    assert rows[1]["rt_number"] == "001"
+
+
+def test_invalid_csv_row_fails_job_with_line_number(manager, tmp_path, fake_predict):
+    csv_path = tmp_path / "upload.csv"
+    csv_path.write_text(
+        "tanggal,nominal,target_type\n"
+        "2025-01-15,500000,broadcast\n"
+        "15/01/2025,500000,broadcast\n"
+    )
+    with open(csv_path, "rb") as f:
+        status = manager.submit_file(f)
+
+    with pytest.raises(ValueError):
+        _run_job(str(tmp_path / status["job_id"]))
+    final = manager.get_status(status["job_id"])
+    assert final["state"] == jobs.STATUS_FAILED
+    assert final["error"].startswith("Baris 3")
+
+
+def test_json_submit_resolves_entity_in_worker(manager, tmp_path, fake_predict):
+    items = [PredictionRequest(tanggal="2025-01-15", nominal=500000,
+                               target_type="broadcast", customer_id="CUST-1")]
+    status = manager.submit(items)
+    assert status["total"] == 1
+    _run_job(str(tmp_path / status["job_id"]))
+    assert fake_predict[0]["entity_id"] == "customer:CUST-1"
+
+
+def test_submit_route_limits_and_validation(manager, monkeypatch):
+    monkeypatch.setattr("app.main.job_manager", manager)
+    monkeypatch.setattr(settings, "JOB_MAX_JSON_ITEMS", 2)
+    client = TestClient(app)
+    item = {"tanggal": "2025-01-15", "nominal": 500000, "target_type": "broadcast"}
+
+    response = client.post("/jobs", json={"items": [item] * 2})
+    assert response.status_code == 202
+    assert response.json()["data"]["status_url"].startswith("/jobs/")
+
+    assert client.post("/jobs", json={"items": [item] * 3}).status_code == 413
+    invalid = client.post("/jobs", json={"items": [{**item, "tanggal": "kemarin"}]})
+    assert invalid.status_code == 422
+
+    upload = client.post("/jobs/upload", files={"file": ("batch.csv", b"tanggal,nominal,target_type\n")})
+    assert upload.status_code == 202
+    assert upload.json()["data"]["total"] is None
+
+
+class BrokenExecutor:
+    """Executor palsu setelah worker process crash"""
+
+    def __init__(self):
+        self.shut_down = False
+
+    def submit(self, fn, *args):
+        raise BrokenProcessPool("A child process terminated abruptly")
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shut_down = True
+
+
+def test_broken_pool_is_recreated_on_submit(manager, monkeypatch):
+    broken = BrokenExecutor()
+    fresh = PendingExecutor()
+    manager._executor = broken
+    monkeypatch.setattr(manager, "_create_executor", lambda: fresh)
+
+    status = manager.submit([PredictionRequest(tanggal="2025-01-15", nominal=1, target_type="broadcast")])
+    assert broken.shut_down
+    assert manager._executor is fresh and len(fresh.submitted) == 1
+    assert manager.get_status(status["job_id"])["state"] == jobs.STATUS_QUEUED
+
+
+def test_job_failed_when_pool_cannot_be_recreated(manager, tmp_path, monkeypatch):
+    manager._executor = BrokenExecutor()
+    monkeypatch.setattr(manager, "_create_executor", BrokenExecutor)
+
+    with pytest.raises(RuntimeError):
+        manager.submit([PredictionRequest(tanggal="2025-01-15", nominal=1, target_type="broadcast")])
+    (job_dir,) = [p for p in tmp_path.iterdir() if p.name != jobs.OWNERS_DIR]
+    status = json.loads((job_dir / jobs.STATUS_FILE).read_text())
+    assert status["state"] == jobs.STATUS_FAILED
+    # Job gagal tidak lagi menunggu recovery
+    assert manager._recover_interrupted_jobs() == 0
+
+
+def test_expired_finished_jobs_are_removed(manager, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "JOB_TTL_HOURS", 1.0)
+    old = time.time() - 2 * 3600
+    paths = {
+        "selesai_lama": write_status(tmp_path, "a" * 32, state=jobs.STATUS_COMPLETED),
+        "gagal_lama": write_status(tmp_path, "b" * 32, state=jobs.STATUS_FAILED),
+        "berjalan_lama": write_status(tmp_path, "c" * 32, owner=manager.owner_id, state=jobs.STATUS_RUNNING),
+        "selesai_baru": write_status(tmp_path, "d" * 32, state=jobs.STATUS_COMPLETED),
+    }
+    for name in ("selesai_lama", "gagal_lama", "berjalan_lama"):
+        os.utime(paths[name], (old, old))
+    dead_owner = tmp_path / jobs.OWNERS_DIR / "mati"
+    dead_owner.touch()
+    os.utime(dead_owner, (old, old))
+
+    assert manager._cleanup_expired_jobs() == 2
+    assert {name for name, p in paths.items() if p.parent.exists()} == {"berjalan_lama", "selesai_baru"}
+    assert not dead_owner.exists()
+    assert (tmp_path / jobs.OWNERS_DIR / manager.owner_id).exists()
+
+
+def test_upload_byte_cap_enforced_while_copying(manager, tmp_path, monkeypatch):
+    content = b"tanggal,nominal,target_type\n" + b"2025-01-15,500000,broadcast\n" * 100
+    with pytest.raises(UploadTooLargeError):
+        manager.submit_file(io.BytesIO(content), max_bytes=len(content) - 1)
+    assert [p.name for p in tmp_path.iterdir()] == [jobs.OWNERS_DIR]
+    assert manager.submit_file(io.BytesIO(content), max_bytes=len(content))["state"] == jobs.STATUS_QUEUED
+
+    # Route: UploadFile tanpa ukuran yang diketahui tetap dibatasi saat copy
+    monkeypatch.setattr("app.main.job_manager", manager)
+    monkeypatch.setattr(settings, "JOB_MAX_UPLOAD_MB", 1)
+    init = UploadFile.__init__
+
+    def init_without_size(self, *args, **kwargs):
+        init(self, *args, **kwargs)
+        self.size = None
+
+    monkeypatch.setattr(UploadFile, "__init__", init_without_size)
+    client = TestClient(app)
+    big = content * 400  # > 1 MB
+    assert client.post("/jobs/upload", files={"file": ("batch.csv", big)}).status_code == 413
@@ -0,0 +1,85 @@
+"""
+Test logging non-blocking: queue penuh membuang record tanpa mem-block, dan log setelah shutdown tetap ditulis
+"""
+import io
+import logging
+import queue
+import threading
+import time
+
+import pytest
+
+from app.config import settings
+from app.utils import logging_config
+from app.utils.logging_config import NonBlockingQueueHandler, get_dropped_count, setup_logging, shutdown_logging
+
+
+class BlockingStream(io.StringIO):
+    """stdout palsu yang menahan writer thread sampai release di-set"""
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+
+    def write(self, text):
+        self.release.wait(5)
+        return super().write(text)
+
+
+@pytest.fixture
+def fresh_logging(monkeypatch):
+    """setup_logging dari awal, lalu kembalikan handler root / uvicorn seperti semula"""
+    saved = {name: (logging.getLogger(name).handlers[:], logging.getLogger(name).level)
+             for name in logging_config.QUEUED_LOGGERS}
+    monkeypatch.setattr(logging_config, "_listener", None)
+    monkeypatch.setattr(logging_config, "_queue_handler", None)
+    monkeypatch.setattr(logging_config, "_stream_handler", None)
+    monkeypatch.setattr(settings, "LOG_JSON", False)
+    stream = BlockingStream()
+    yield stream
+    stream.release.set()
+    if logging_config._listener is not None:
+        logging_config._listener.stop()
+    for name, (handlers, level) in saved.items():
+        logging.getLogger(name).handlers = handlers
+        logging.getLogger(name).setLevel(level)
+
+
+def test_handler_never_blocks_and_counts_drops():
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=2))
+    record = logging.LogRecord("test", logging.INFO, __file__, 1, "pesan %s", ("x",), None)
+
+    started = time.perf_counter()
+    for _ in range(5):
+        handler.emit(record)
+    assert time.perf_counter() - started < 0.5
+    assert handler.dropped == 3
+    # Format ditunda ke writer thread: argumen record tidak di-merge di caller
+    assert handler.queue.get_nowait().args == ("x",)
+
+
+def test_full_queue_drops_records_then_shutdown_keeps_logging(fresh_logging, monkeypatch):
+    monkeypatch.setattr(settings, "LOG_QUEUE_SIZE", 2)
+    # stdout di-patch di dalam test: capture pytest memasang ulang sys.stdout di setiap fase
+    monkeypatch.setattr("sys.stdout", fresh_logging)
+    setup_logging()
+    log = logging.getLogger("test.logging")
+
+    started = time.perf_counter()
+    for i in range(20):
+        log.info("record %d", i)
+    # Writer thread tertahan di stdout, tapi caller tidak ikut menunggu
+    assert time.perf_counter() - started < 1.0
+    dropped = get_dropped_count()
+    # Paling banyak 1 record sedang ditulis + 2 record di queue
+    assert 17 <= dropped <= 18
+
+    fresh_logging.release.set()
+    shutdown_logging()
+    log.warning("setelah shutdown")
+
+    lines = fresh_logging.getvalue().splitlines()
+    assert len([line for line in lines if "record" in line and "dropped" not in line]) == 20 - dropped
+    assert f"{dropped} log records dropped" in lines[-2]
+    assert "setelah shutdown" in lines[-1]
+    assert get_dropped_count() == dropped